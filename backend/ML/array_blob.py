@@ -0,0 +1,69 @@
+import os
+import struct
+import numpy as np
+
+MAGIC = b"NDA1"
+ALIGNMENT = 8
+PARAMS_DTYPE = os.environ.get("PARAMS_DTYPE", "<f8")
+
+def encode_array(array, dtype="<f8"):
+    """
+    Encode a numpy array as a self-describing binary blob.
+
+    Layout (all integers little-endian):
+
+        magic      4 bytes   b"NDA1"
+        dtype_len  uint8     length of the dtype string
+        dtype      ascii     numpy dtype string, e.g. "<f8" or "<f4"
+        ndim       uint8     number of dimensions
+        shape      uint32 x ndim
+        padding    zero bytes up to a multiple of 8
+        data       raw array data in C order
+
+    The padding keeps the data 8-byte aligned relative to the start of the
+    blob, so it can be viewed with `np.frombuffer` without copying.
+
+    Args:
+        array (array-like): The array to encode
+        dtype (str): Little-endian numpy dtype the values are stored as (default: float64)
+
+    Returns:
+        bytes: The encoded blob
+    """
+    dtype = np.dtype(dtype).newbyteorder("<")
+    array = np.ascontiguousarray(array, dtype=dtype)
+    dtype_str = dtype.str.encode("ascii")
+
+    header = MAGIC + struct.pack("<B", len(dtype_str)) + dtype_str + struct.pack(f"<B{array.ndim}I", array.ndim, *array.shape)
+    header += b"\0" * (-len(header) % ALIGNMENT)
+    return header + array.tobytes()
+
+def decode_array(blob):
+    """
+    Decode a blob created by `encode_array` without parsing the values.
+
+    The returned array is a read-only view of the blob.
+
+    Args:
+        blob (bytes): The encoded blob
+
+    Returns:
+        ndarray: The decoded array
+
+    Raises:
+        ValueError: If the blob isn't an encoded array
+    """
+    blob = memoryview(blob)
+    if blob[:4] != MAGIC:
+        raise ValueError("Not an encoded array")
+
+    offset = 4
+    dtype_len = blob[offset]
+    dtype = np.dtype(bytes(blob[offset + 1:offset + 1 + dtype_len]).decode("ascii"))
+    offset += 1 + dtype_len
+    ndim = blob[offset]
+    shape = struct.unpack_from(f"<{ndim}I", blob, offset + 1)
+    offset += 1 + 4 * ndim
+    offset += -offset % ALIGNMENT
+
+    return np.frombuffer(blob, dtype=dtype, offset=offset).reshape(shape)
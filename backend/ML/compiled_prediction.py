@@ -0,0 +1,121 @@
+import os
+from operator import mul
+import numpy as np
+
+THRESHOLD = 0.5
+THRESHOLD_LOGIT = float(np.log(THRESHOLD / (1 - THRESHOLD)))
+NUMPY_CROSSOVER = int(os.environ.get("PREDICTION_NUMPY_CROSSOVER", "12"))
+
+class CompiledLoanPrediction:
+    """
+    Inference-only form of a trained LoanPrediction model.
+
+    The feature standardization is folded into the weights and bias once,
+    when the model is compiled:
+
+        ((x - mean) / std) . w + b  ==  x . (w / std) + (b - (mean / std) . w)
+
+    Since the sigmoid is monotonic, comparing the raw logit against the logit of
+    the decision threshold gives the same decision as comparing the probability
+    against the threshold, so no exponent has to be computed.
+
+    Single rows and small batches are scored in plain Python with the
+    coefficients stored as a tuple, because building numpy arrays for a
+    handful of values costs more than the arithmetic itself. Batches larger
+    than `numpy_crossover` rows are scored with numpy
+    (see `benchmarks/scoring_crossover.py`).
+
+    Attributes:
+        weights (ndarray): Weights with the standardization folded in, shape (n_features, 1)
+        bias (float): Bias with the standardization folded in
+        coefficients (tuple[float]): The folded weights as Python floats
+        numpy_crossover (int): Largest batch size scored without numpy
+        version: Model registry version the model was loaded for, None if it wasn't loaded from the registry
+    """
+    def __init__(self, weights, bias, x_mean, x_std):
+        """
+        Compile the model from its trained parameters.
+
+        Args:
+            weights (ndarray): Trained model weights
+            bias (float): Trained model bias
+            x_mean (ndarray): Feature mean values used for normalization
+            x_std (ndarray): Feature standard deviation values used for normalization
+        """
+        weights = np.asarray(weights, dtype=float).ravel()
+        x_mean = np.asarray(x_mean, dtype=float)
+        x_std = np.asarray(x_std, dtype=float)
+
+        self.weights = (weights / x_std).reshape(-1, 1)
+        self.bias = float(bias) - float(np.dot(x_mean / x_std, weights))
+        self.coefficients = tuple(self.weights.ravel().tolist())
+        self.numpy_crossover = NUMPY_CROSSOVER
+        self.version = None
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Compile a trained LoanPrediction model.
+
+        Args:
+            model (LoanPrediction): Model with weights, bias and normalization parameters set
+
+        Returns:
+            CompiledLoanPrediction: The compiled model
+        """
+        return cls(model.get_weights(), model.get_bias(), model.X_mean, model.X_std)
+
+    def decision_function(self, X_input):
+        """
+        Calculate the raw logits for the input data.
+
+        Args:
+            X_input (ndarray): Input features (not normalized)
+
+        Returns:
+            ndarray: Logits of shape (n_samples, 1)
+        """
+        return np.dot(X_input, self.weights) + self.bias
+
+    def predict(self, X_input):
+        """
+        Make predictions on new input data.
+
+        Args:
+            X_input (ndarray): Input features for prediction (not normalized)
+
+        Returns:
+            ndarray: Binary predictions (0 for rejected, 1 for approved)
+        """
+        return (self.decision_function(X_input) >= THRESHOLD_LOGIT).astype(int)
+
+    def predict_one(self, features):
+        """
+        Make a prediction for a single row without numpy.
+
+        Args:
+            features (list): Feature values of the row (not normalized)
+
+        Returns:
+            int: Binary prediction (0 for rejected, 1 for approved)
+        """
+        z = sum(map(mul, self.coefficients, features)) + self.bias
+        return 1 if z >= THRESHOLD_LOGIT else 0
+
+    def predict_rows(self, rows):
+        """
+        Make predictions for a list of rows.
+
+        Uses the scalar path up to `numpy_crossover` rows and a single matrix
+        multiplication above it.
+
+        Args:
+            rows (list[list]): Feature values of every row (not normalized)
+
+        Returns:
+            list[int]: Binary predictions in the same order as the rows
+        """
+        if len(rows) <= self.numpy_crossover:
+            return [self.predict_one(features) for features in rows]
+
+        return self.predict(np.array(rows, dtype=float))[:, 0].tolist()
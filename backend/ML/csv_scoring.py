@@ -0,0 +1,132 @@
+import codecs
+import csv
+import os
+
+FEATURE_COLUMNS = [
+    "no_of_dependents",
+    "education",
+    "self_employed",
+    "income_annum",
+    "loan_amount",
+    "loan_term",
+    "cibil_score",
+    "residential_assets_value",
+    "commercial_assets_value",
+    "luxury_assets_value",
+    "bank_asset_value",
+]
+ID_COLUMN = "loan_id"
+CATEGORICAL_VALUES = {
+    "education": {"graduate": 1, "not graduate": 0},
+    "self_employed": {"yes": 1, "no": 0},
+}
+CHUNK_ROWS = int(os.environ.get("CSV_SCORING_CHUNK_ROWS", "5000"))
+MAX_RECORD_CHARS = 65536
+
+async def iter_records(byte_chunks):
+    """
+    Split an asynchronous stream of bytes into CSV records.
+
+    A record usually is one text line, but a quoted field may contain line
+    breaks, so lines are joined while a quote is still open (an odd number
+    of `"` characters, escaped quotes come in pairs). Only the current
+    incomplete record is kept in memory, so arbitrarily large uploads can
+    be processed while they are still being received. A record that grows
+    beyond MAX_RECORD_CHARS, e.g. because of an unterminated quote, is
+    passed on as it is and fails to parse as a row.
+
+    Args:
+        byte_chunks: Async iterable of bytes (e.g. `Request.stream()`)
+
+    Yields:
+        str: Non-empty records without the trailing newline, to be parsed with `parse_record`
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    remainder = ""
+    record = None
+    quotes = 0
+
+    async for chunk in byte_chunks:
+        remainder += decoder.decode(chunk)
+        *lines, remainder = remainder.split("\n")
+        for line in lines:
+            line = line.rstrip("\r")
+            record = line if record is None else record + "\n" + line
+            quotes += line.count('"')
+            if quotes % 2 and len(record) <= MAX_RECORD_CHARS:
+                continue
+            if record.strip():
+                yield record
+            record, quotes = None, 0
+
+    remainder += decoder.decode(b"", final=True)
+    if remainder:
+        record = remainder if record is None else record + "\n" + remainder
+    if record is not None and record.strip():
+        yield record.rstrip("\r")
+
+def parse_record(record):
+    """
+    Split a CSV record into its values.
+
+    Args:
+        record (str): A record as yielded by `iter_records`
+
+    Returns:
+        list[str]: Values of the record, with quotes removed
+    """
+    return next(csv.reader([record]), [])
+
+def parse_header(record):
+    """
+    Resolve the positions of the model columns from a CSV header record.
+
+    The header uses the same column names as the training dataset. Column
+    order doesn't matter and surrounding whitespace is ignored.
+
+    Args:
+        record (str): The CSV header record
+
+    Returns:
+        tuple: Index of the `loan_id` column (or None) and the indices of the feature columns
+
+    Raises:
+        ValueError: If a feature column is missing
+    """
+    names = [name.strip() for name in parse_record(record)]
+    missing = [column for column in FEATURE_COLUMNS if column not in names]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    id_index = names.index(ID_COLUMN) if ID_COLUMN in names else None
+    return id_index, [names.index(column) for column in FEATURE_COLUMNS]
+
+def encode_row(values, feature_indices):
+    """
+    Convert the raw values of a CSV row into the model's feature vector.
+
+    Args:
+        values (list[str]): Values of the CSV row
+        feature_indices (list[int]): Indices of the feature columns, as returned by `parse_header`
+
+    Returns:
+        list[float]: Feature values in the order the model was trained on
+
+    Raises:
+        ValueError: If a value is missing or can't be converted
+    """
+    features = []
+    for column, index in zip(FEATURE_COLUMNS, feature_indices):
+        value = values[index].strip() if index < len(values) else ""
+        if column in CATEGORICAL_VALUES:
+            mapping = CATEGORICAL_VALUES[column]
+            if value.lower() not in mapping:
+                raise ValueError(f"Invalid value for {column}: '{value}'")
+            features.append(mapping[value.lower()])
+        else:
+            try:
+                features.append(float(value))
+            except ValueError:
+                raise ValueError(f"Invalid value for {column}: '{value}'")
+
+    return features
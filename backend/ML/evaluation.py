@@ -0,0 +1,123 @@
+import os
+import numpy as np
+
+CURVE_POINTS = int(os.environ.get("EVALUATION_CURVE_POINTS", "100"))
+
+def _ratio(numerator, denominator):
+    """
+    Divide counts elementwise, with 0 where the denominator is 0.
+
+    Args:
+        numerator (ndarray|float): Numerators
+        denominator (ndarray|float): Denominators
+
+    Returns:
+        ndarray: The ratios as float64
+    """
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape), where=denominator != 0)
+
+def _downsample(max_points, *curves):
+    """
+    Keep at most `max_points` evenly spaced points of curves, including both ends.
+
+    Args:
+        max_points (int): Maximum number of points to keep, 0 or less keeps all of them
+        *curves (ndarray): Curve coordinates of the same length
+
+    Returns:
+        list[ndarray]: The downsampled coordinates
+    """
+    length = len(curves[0])
+    if max_points <= 0 or length <= max_points:
+        return list(curves)
+
+    keep = np.unique(np.linspace(0, length - 1, max_points).round().astype(int))
+    return [curve[keep] for curve in curves]
+
+def evaluate(y_true, probabilities, threshold=0.5, curve_points=CURVE_POINTS):
+    """
+    Compute all evaluation metrics of a binary classifier from one scoring pass.
+
+    The probabilities are sorted once, in descending order. The cumulative
+    counts of positives and negatives over the sorted labels give the true
+    and false positives for every distinct threshold, from which the ROC
+    and precision-recall curves and the areas under them follow directly.
+    The confusion matrix at `threshold` is read off the same counts.
+
+    Ratios with a zero denominator (e.g. precision without any positive
+    prediction) are reported as 0, and so is the ROC-AUC of a test set with
+    a single class. The ROC curve starts at (0, 0), which has no threshold
+    (None). An empty test set, e.g. when all rows are used for training,
+    gives zero metrics, an empty precision-recall curve and a ROC curve of
+    only that first point.
+
+    Args:
+        y_true (array-like): True labels, 0 or 1
+        probabilities (array-like): Predicted probabilities of the positive class
+        threshold (float): Probability at or above which a prediction is positive (default: 0.5)
+        curve_points (int): Maximum number of points stored per curve, 0 or less keeps all
+                            (default: EVALUATION_CURVE_POINTS or 100)
+
+    Returns:
+        dict: accuracy, precision, recall, f1_score, confusion_matrix ([[TN, FP], [FN, TP]]),
+              roc_auc, average_precision, roc_curve ({"fpr", "tpr", "thresholds"}) and
+              pr_curve ({"precision", "recall", "thresholds"})
+    """
+    y_true = np.asarray(y_true).ravel().astype(bool)
+    probabilities = np.asarray(probabilities, dtype=float).ravel()
+
+    order = np.argsort(-probabilities, kind="stable")
+    sorted_probabilities = probabilities[order]
+    true_positives = np.cumsum(y_true[order])
+
+    if len(sorted_probabilities):
+        last_of_threshold = np.r_[np.flatnonzero(np.diff(sorted_probabilities)), len(sorted_probabilities) - 1]
+    else:
+        last_of_threshold = np.array([], dtype=int)
+    thresholds = sorted_probabilities[last_of_threshold]
+    tps = true_positives[last_of_threshold].astype(float)
+    fps = last_of_threshold + 1 - tps
+    positives = float(true_positives[-1]) if len(true_positives) else 0.0
+    negatives = len(y_true) - positives
+
+    predicted_positive = int(np.count_nonzero(probabilities >= threshold))
+    tp = int(true_positives[predicted_positive - 1]) if predicted_positive else 0
+    fp = predicted_positive - tp
+    fn = int(positives) - tp
+    tn = int(negatives) - fp
+
+    precision = float(_ratio(tp, tp + fp))
+    recall = float(_ratio(tp, tp + fn))
+
+    tpr = np.r_[0.0, _ratio(tps, positives)]
+    fpr = np.r_[0.0, _ratio(fps, negatives)]
+    roc_auc = float(np.trapezoid(tpr, fpr)) if positives and negatives else 0.0
+
+    curve_precision = _ratio(tps, tps + fps)
+    curve_recall = _ratio(tps, positives)
+    average_precision = float(np.sum(np.diff(np.r_[0.0, curve_recall]) * curve_precision))
+
+    fpr, tpr, roc_thresholds = _downsample(curve_points, fpr, tpr, np.r_[np.nan, thresholds])
+    curve_precision, curve_recall, pr_thresholds = _downsample(curve_points, curve_precision, curve_recall, thresholds)
+
+    return {
+        "accuracy": float(_ratio(tp + tn, len(y_true))),
+        "precision": precision,
+        "recall": recall,
+        "f1_score": float(_ratio(2 * precision * recall, precision + recall)),
+        "confusion_matrix": np.array([[tn, fp], [fn, tp]]),
+        "roc_auc": roc_auc,
+        "average_precision": average_precision,
+        "roc_curve": {
+            "fpr": fpr.tolist(),
+            "tpr": tpr.tolist(),
+            "thresholds": [None if np.isnan(value) else float(value) for value in roc_thresholds],
+        },
+        "pr_curve": {
+            "precision": curve_precision.tolist(),
+            "recall": curve_recall.tolist(),
+            "thresholds": pr_thresholds.tolist(),
+        },
+    }
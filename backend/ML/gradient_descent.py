@@ -0,0 +1,88 @@
+import numpy as np
+
+class GradientDescentKernel:
+    """
+    Full-batch gradient descent for logistic regression without per-epoch allocations.
+
+    All intermediate arrays (logits, probabilities/errors and the weight
+    gradient) are allocated once, when the kernel is created, and every
+    epoch writes into them with `out=` ufuncs and in-place updates. The
+    sigmoid is evaluated as 0.5 * (1 + tanh(z / 2)), which equals
+    1 / (1 + exp(-z)) but never overflows. With `dtype=np.float32` the
+    features are kept in single precision, which halves the memory traffic
+    of the two matrix-vector products per epoch.
+
+    Attributes:
+        X (ndarray): Training features, C-contiguous, of shape (n_rows, n_features)
+        y (ndarray): Training labels of shape (n_rows,)
+        dtype (dtype): Precision of the computation
+    """
+    def __init__(self, X, y, dtype=np.float64):
+        """
+        Prepare the training data and allocate the work buffers.
+
+        The features are copied only if they don't already have the requested
+        dtype and memory layout.
+
+        Args:
+            X (ndarray): Training features of shape (n_rows, n_features)
+            y (ndarray): Training labels, 0 or 1
+            dtype: np.float64 or np.float32 (default: np.float64)
+        """
+        self.dtype = np.dtype(dtype)
+        self.X = np.ascontiguousarray(X, dtype=self.dtype)
+        self.y = np.ascontiguousarray(np.ravel(y), dtype=self.dtype)
+
+        rows, features = self.X.shape
+        self._z = np.empty(rows, dtype=self.dtype)
+        self._error = np.empty(rows, dtype=self.dtype)
+        self._gradient = np.empty(features, dtype=self.dtype)
+
+    def gradient_sums(self, weights, bias):
+        """
+        Compute the unnormalized gradient of the log-loss into the work buffers.
+
+        Args:
+            weights (ndarray): Weights of shape (n_features,) in the kernel's dtype
+            bias (float): Bias
+
+        Returns:
+            tuple[ndarray, float]: X^T (p - y), a view of the gradient buffer that the next
+                                   call overwrites, and the sum of p - y
+        """
+        z, error, gradient = self._z, self._error, self._gradient
+        np.dot(self.X, weights, out=z)
+        z += bias
+        np.multiply(z, 0.5, out=error)
+        np.tanh(error, out=error)
+        error += 1
+        error *= 0.5
+        error -= self.y
+
+        np.dot(error, self.X, out=gradient)
+        return gradient, float(error.sum())
+
+    def run(self, weights, bias, learning_rate, epochs):
+        """
+        Run gradient descent epochs.
+
+        Args:
+            weights (ndarray): Initial weights of shape (n_features,) or (n_features, 1)
+            bias (float): Initial bias
+            learning_rate (float): Learning rate
+            epochs (int): Number of epochs
+
+        Returns:
+            tuple[ndarray, float]: The trained weights of shape (n_features, 1) as float64 and the bias
+        """
+        w = np.array(np.ravel(weights), dtype=self.dtype)
+        bias = float(bias)
+        step = learning_rate / len(self.y)
+
+        for _ in range(epochs):
+            gradient, error_sum = self.gradient_sums(w, bias)
+            gradient *= step
+            w -= gradient
+            bias -= step * error_sum
+
+        return w.astype(np.float64).reshape(-1, 1), bias
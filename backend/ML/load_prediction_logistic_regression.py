@@ -1,5 +1,27 @@
 import pandas as pd
 import numpy as np
+from ML import evaluation, parallel_training, solvers
+from ML.gradient_descent import GradientDescentKernel
+
+def encode_dataset(df):
+    """
+    Encode a dataset in the training CSV layout as features and labels.
+    
+    Strips the column names and encodes the categorical columns as 0/1.
+    
+    Args:
+        df (DataFrame): Rows of the training CSV, modified in place
+        
+    Returns:
+        tuple[ndarray, ndarray]: Raw feature matrix and labels of shape (n_rows, 1)
+    """
+    df.columns = df.columns.str.strip()
+
+    df['education'] = df['education'].str.strip().str.lower().map({'graduate': 1, 'not graduate': 0})
+    df['self_employed'] = df['self_employed'].str.strip().str.lower().map({'yes': 1, 'no': 0})
+    df['loan_status'] = df['loan_status'].str.strip().str.lower().map({'approved': 1, 'rejected': 0})
+
+    return df.drop(columns=['loan_id', 'loan_status']).values, df['loan_status'].values.reshape(-1, 1)
 
 class LoanPrediction:
     """
@@ -22,8 +44,14 @@ class LoanPrediction:
         y_train, y_test (ndarray): Training and testing labels
         weights (ndarray): Model weights
         bias (float): Model bias term
+        solver (str): Training algorithm, "gd", "newton" or "lbfgs"
+        tolerance (float): Stopping tolerance of the "newton" and "lbfgs" solvers
+        dtype (str): Precision of gradient descent, "float64" or "float32"
+        workers (int): Number of processes gradient descent may split the rows across
+        iterations (int): Number of iterations of the last training
+        converged (bool): Whether the last training stopped on a tolerance
     """
-    def __init__(self, csv_path = '', train_size=0.8, learning_rate=0.01, epochs=1000):
+    def __init__(self, csv_path = '', train_size=0.8, learning_rate=0.01, epochs=1000, solver="gd", tolerance=1e-6, dtype="float64", workers=1):
         """
         Initialize the LoanPrediction model.
         
@@ -32,24 +60,34 @@ class LoanPrediction:
                            If empty, creates an empty model for loading existing parameters.
             train_size (float): Proportion of data to use for training (default: 0.8)
             learning_rate (float): Learning rate for gradient descent (default: 0.01)
-            epochs (int): Number of training iterations (default: 1000)
+            epochs (int): Number of training iterations, the iteration limit for
+                          the "newton" and "lbfgs" solvers (default: 1000)
+            solver (str): "gd" for gradient descent, "newton" or "lbfgs" (default: "gd")
+            tolerance (float): Stopping tolerance of the "newton" and "lbfgs" solvers (default: 1e-6)
+            dtype (str): Precision of gradient descent, "float64" or "float32" (default: "float64")
+            workers (int): Number of processes gradient descent may split the rows across (default: 1)
+            
+        Raises:
+            ValueError: If the solver is unknown
         """
         if csv_path == '':
             return
 
+        if solver != "gd" and solver not in solvers.SOLVERS:
+            raise ValueError(f"Unknown solver {solver!r}, expected one of gd, {', '.join(solvers.SOLVERS)}")
+
         self.train_size = train_size
         self.learning_rate = learning_rate
         self.epochs = epochs
+        self.solver = solver
+        self.tolerance = tolerance
+        self.dtype = dtype
+        self.workers = workers
+        self.iterations = 0
+        self.converged = False
 
         self.df = pd.read_csv(csv_path)
-        self.df.columns = self.df.columns.str.strip()
-
-        self.df['education'] = self.df['education'].str.strip().str.lower().map({'graduate': 1, 'not graduate': 0})
-        self.df['self_employed'] = self.df['self_employed'].str.strip().str.lower().map({'yes': 1, 'no': 0})
-        self.df['loan_status'] = self.df['loan_status'].str.strip().str.lower().map({'approved': 1, 'rejected': 0})
-
-        self.X = self.df.drop(columns=['loan_id', 'loan_status']).values
-        self.y = self.df['loan_status'].values.reshape(-1, 1)
+        self.X, self.y = encode_dataset(self.df)
 
         self.X = (self.X - np.mean(self.X, axis=0)) / np.std(self.X, axis=0)
         self.X_mean = np.mean(self.X, axis=0)
@@ -60,6 +98,31 @@ class LoanPrediction:
         self.weights = np.zeros((self.X_train.shape[1], 1))
         self.bias = 0
 
+    @classmethod
+    def from_params(cls, weights, bias, x_mean, x_std):
+        """
+        Build a ready-to-use model from stored parameters.
+        
+        Converts the stored parameters into float64 numpy arrays once, so
+        the returned model can be reused for any number of predictions.
+        Arrays that already are float64 are used without copying.
+        
+        Args:
+            weights (array-like): Model weights of shape (n_features, 1)
+            bias (float): Model bias term
+            x_mean (array-like): Feature mean values for normalization
+            x_std (array-like): Feature standard deviation values for normalization
+            
+        Returns:
+            LoanPrediction: Model instance ready for prediction
+        """
+        model = cls()
+        model.X_mean = np.asarray(x_mean, dtype=float)
+        model.X_std = np.asarray(x_std, dtype=float)
+        model.set_weights(np.asarray(weights, dtype=float).reshape(-1, 1))
+        model.set_bias(float(bias))
+        return model
+
     def _train_test_split(self):
         """
         Split the dataset into training and testing sets.
@@ -78,29 +141,62 @@ class LoanPrediction:
         """
         Sigmoid activation function.
         
+        Evaluated as 0.5 * (1 + tanh(z / 2)), which doesn't overflow for
+        large negative inputs.
+        
         Args:
             z (ndarray): Input values
             
         Returns:
             ndarray: Sigmoid output values between 0 and 1
         """
-        return 1 / (1 + np.exp(-z))
+        return 0.5 * (1 + np.tanh(0.5 * z))
 
     def train(self):
         """
-        Train the logistic regression model using gradient descent.
+        Train the logistic regression model.
         
-        Performs gradient descent optimization for the specified number of epochs,
-        updating weights and bias to minimize the logistic loss function.
+        With the "gd" solver, performs gradient descent optimization for the
+        specified number of epochs, updating weights and bias to minimize the
+        logistic loss function (see `ML.gradient_descent`). With more than one
+        worker and enough rows, the rows are split across processes that
+        compute partial gradients in parallel (see `ML.parallel_training`).
+        The "newton" and "lbfgs" solvers (see
+        `ML.solvers`) stop as soon as the gradient or the loss change is
+        within the tolerance, usually after a few to a few dozen iterations.
+        The number of iterations and whether the solver converged are kept
+        in `iterations` and `converged`.
         """
-        for _ in range(self.epochs):
-            z = np.dot(self.X_train, self.weights) + self.bias
-            predictions = self._sigmoid(z)
-            error = predictions - self.y_train
-            dw = np.dot(self.X_train.T, error) / len(self.y_train)
-            db = np.sum(error) / len(self.y_train)
-            self.weights -= self.learning_rate * dw
-            self.bias -= self.learning_rate * db
+        if self.solver != "gd":
+            result = solvers.SOLVERS[self.solver](self.X_train, self.y_train, self.epochs, self.tolerance)
+            self.weights = result.theta[:-1].reshape(-1, 1)
+            self.bias = float(result.theta[-1])
+            self.iterations = result.iterations
+            self.converged = result.converged
+            return
+
+        workers = parallel_training.shard_count(len(self.y_train), self.workers)
+        if workers > 1:
+            self.weights, self.bias = parallel_training.train_parallel(
+                self.X_train, self.y_train, self.weights, self.bias, self.learning_rate, self.epochs, workers, self.dtype)
+        else:
+            kernel = GradientDescentKernel(self.X_train, self.y_train, self.dtype)
+            self.weights, self.bias = kernel.run(self.weights, self.bias, self.learning_rate, self.epochs)
+        self.iterations = self.epochs
+
+    def predict_proba(self, X_input):
+        """
+        Calculate approval probabilities for new input data.
+        
+        Args:
+            X_input (ndarray): Input features for prediction
+            
+        Returns:
+            ndarray: Probabilities of approval between 0 and 1
+        """
+        X_input = (X_input - self.X_mean) / self.X_std
+        z = np.dot(X_input, self.weights) + self.bias
+        return self._sigmoid(z)
 
     def predict(self, X_input):
         """
@@ -112,9 +208,19 @@ class LoanPrediction:
         Returns:
             ndarray: Binary predictions (0 for rejected, 1 for approved)
         """
-        X_input = (X_input - self.X_mean) / self.X_std
-        z = np.dot(X_input, self.weights) + self.bias
-        return (self._sigmoid(z) >= 0.5).astype(int)
+        return (self.predict_proba(X_input) >= 0.5).astype(int)
+
+    def evaluate(self):
+        """
+        Evaluate the model on the test set.
+        
+        Scores the test set once and derives every metric, the ROC and
+        precision-recall curves from that single pass (see `ML.evaluation`).
+        
+        Returns:
+            dict: Test set metrics as returned by `ML.evaluation.evaluate`
+        """
+        return evaluation.evaluate(self.y_test, self.predict_proba(self.X_test))
 
     def get_accuracy(self):
         """
@@ -123,8 +229,7 @@ class LoanPrediction:
         Returns:
             float: Accuracy score between 0 and 1
         """
-        predictions = self.predict(self.X_test)
-        return np.mean(predictions == self.y_test)
+        return self.evaluate()["accuracy"]
 
     def get_precision(self):
         """
@@ -133,11 +238,7 @@ class LoanPrediction:
         Returns:
             float: Precision score (True Positives / (True Positives + False Positives))
         """
-        y_pred = self.predict(self.X_test).astype(int)
-        y_true = self.y_test.astype(int)
-        tp = np.sum((y_pred == 1) & (y_true == 1))
-        fp = np.sum((y_pred == 1) & (y_true == 0))
-        return tp / (tp + fp + 1e-8)
+        return self.evaluate()["precision"]
 
     def get_recall(self):
         """
@@ -146,11 +247,7 @@ class LoanPrediction:
         Returns:
             float: Recall score (True Positives / (True Positives + False Negatives))
         """
-        y_pred = self.predict(self.X_test).astype(int)
-        y_true = self.y_test.astype(int)
-        tp = np.sum((y_pred == 1) & (y_true == 1))
-        fn = np.sum((y_pred == 0) & (y_true == 1))
-        return tp / (tp + fn + 1e-8)
+        return self.evaluate()["recall"]
 
     def get_f1_score(self):
         """
@@ -159,9 +256,7 @@ class LoanPrediction:
         Returns:
             float: F1-score (harmonic mean of precision and recall)
         """
-        p = self.get_precision()
-        r = self.get_recall()
-        return 2 * p * r / (p + r + 1e-8)
+        return self.evaluate()["f1_score"]
 
     def get_confusion_matrix(self):
         """
@@ -172,13 +267,7 @@ class LoanPrediction:
                      [[TN, FP],
                       [FN, TP]]
         """
-        y_pred = self.predict(self.X_test).astype(int)
-        y_true = self.y_test.astype(int)
-        tp = np.sum((y_pred == 1) & (y_true == 1))
-        tn = np.sum((y_pred == 0) & (y_true == 0))
-        fp = np.sum((y_pred == 1) & (y_true == 0))
-        fn = np.sum((y_pred == 0) & (y_true == 1))
-        return np.array([[tn, fp], [fn, tp]])
+        return self.evaluate()["confusion_matrix"]
 
     def get_weights(self):
         """
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import time
+
+REFRESH_INTERVAL = float(os.environ.get("MODEL_CACHE_REFRESH_SECONDS", "5"))
+
+class ModelCache:
+    """
+    Process-wide holder for the loaded prediction model.
+
+    Keeps a ready-to-use compiled model together with the model registry
+    version it was built from, so requests don't have to fetch and decode
+    the parameters from the database on every call. The cached model is
+    considered fresh for `refresh_interval` seconds, after which the caller is
+    expected to compare the stored version with the one in the database.
+    Requests already holding the previous model finish with it.
+
+    Attributes:
+        refresh_interval (float): Seconds between version checks
+        model (CompiledLoanPrediction|None): The cached model
+        version: Model registry version the cached model was built from
+        checked_at (float): Monotonic time of the last version check
+        lock (asyncio.Lock): Lock serializing reloads of the model
+    """
+    def __init__(self, refresh_interval=REFRESH_INTERVAL):
+        """
+        Initialize an empty model cache.
+
+        Args:
+            refresh_interval (float): Seconds between version checks (default: MODEL_CACHE_REFRESH_SECONDS or 5)
+        """
+        self.refresh_interval = refresh_interval
+        self.model = None
+        self.version = None
+        self.checked_at = 0.0
+        self.lock = asyncio.Lock()
+
+    def is_fresh(self):
+        """
+        Check if the cached model can be used without a version check.
+
+        Returns:
+            bool: True if a model is cached and was checked recently
+        """
+        return self.model is not None and time.monotonic() - self.checked_at < self.refresh_interval
+
+    def store(self, model, version):
+        """
+        Store a newly loaded model in the cache.
+
+        Args:
+            model (CompiledLoanPrediction): The loaded model
+            version: Model registry version the model was built from
+        """
+        self.model = model
+        self.version = version
+        self.checked_at = time.monotonic()
+
+    def touch(self):
+        """
+        Mark the cached model as checked against the current version.
+        """
+        self.checked_at = time.monotonic()
+
+    def invalidate(self):
+        """
+        Drop the cached model so the next request reloads it.
+        """
+        self.model = None
+        self.version = None
+        self.checked_at = 0.0
+
+model_cache = ModelCache()
@@ -0,0 +1,229 @@
+import multiprocessing
+import os
+import threading
+from multiprocessing import shared_memory
+import numpy as np
+from ML.gradient_descent import GradientDescentKernel
+
+MIN_SHARD_ROWS = int(os.environ.get("TRAINING_MIN_SHARD_ROWS", "50000"))
+STEP_TIMEOUT = float(os.environ.get("TRAINING_STEP_TIMEOUT_SECONDS", "600"))
+BLAS_THREAD_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+def shard_count(rows, workers):
+    """
+    Choose how many processes to train with.
+
+    Every shard gets at least MIN_SHARD_ROWS rows, below that the cost of
+    synchronizing the processes every epoch outweighs the parallel work.
+
+    Args:
+        rows (int): Number of training rows
+        workers (int): Requested number of processes
+
+    Returns:
+        int: Number of processes, 1 to train in the current process
+    """
+    return max(1, min(workers, rows // max(1, MIN_SHARD_ROWS)))
+
+def _start_workers(context, workers, args):
+    """
+    Start the worker processes with single-threaded BLAS.
+
+    Every worker already has its own core, so a multithreaded BLAS would
+    oversubscribe the machine. Spawned processes read the thread count when
+    they import numpy, so the environment is set only while they start.
+
+    Args:
+        context: Multiprocessing context
+        workers (int): Number of processes
+        args (Callable[[int], tuple]): Arguments of `_worker` for a rank
+
+    Returns:
+        list[Process]: The started processes
+    """
+    saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+    processes = []
+    try:
+        os.environ.update({name: "1" for name in BLAS_THREAD_VARIABLES})
+        for rank in range(workers):
+            process = context.Process(target=_worker, args=args(rank), daemon=True)
+            process.start()
+            processes.append(process)
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return processes
+
+def _attach(name, shape, dtype):
+    """
+    Attach to a shared memory block and view it as an array.
+
+    Args:
+        name (str): Name of the shared memory block
+        shape (tuple): Shape of the array
+        dtype (str): Data type of the array
+
+    Returns:
+        tuple[SharedMemory, ndarray]: The block, which must outlive the array, and the array
+    """
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _shard_loop(rank, bounds, arrays, dtype, epochs, barrier):
+    """
+    Compute the partial gradients of one row shard every epoch.
+
+    Args:
+        rank (int): Index of the worker
+        bounds (tuple[int, int]): First and past-the-end row of the shard
+        arrays (dict): The shared "X", "y", "params" and "partials" arrays
+        dtype (str): Precision of the computation
+        epochs (int): Number of epochs
+        barrier (Barrier): Barrier shared by the workers and the parent
+    """
+    start, stop = bounds
+    kernel = GradientDescentKernel(arrays["X"][start:stop], arrays["y"][start:stop], dtype)
+    params, partial = arrays["params"], arrays["partials"][rank]
+    weights = params[:-1]
+
+    for _ in range(epochs):
+        barrier.wait(STEP_TIMEOUT)
+        gradient, error_sum = kernel.gradient_sums(weights, params[-1])
+        partial[:-1] = gradient
+        partial[-1] = error_sum
+        barrier.wait(STEP_TIMEOUT)
+
+def _worker(rank, bounds, layout, dtype, epochs, barrier):
+    """
+    Entry point of a worker process.
+
+    Each epoch waits for the parent to publish the parameters, computes
+    X^T (p - y) and sum(p - y) over rows `bounds` of the shared training
+    data into row `rank` of the shared partial gradients, and waits again
+    so the parent knows every shard is done. An exception aborts the
+    barrier, which fails the training in the parent instead of hanging it.
+
+    Args:
+        rank (int): Index of the worker
+        bounds (tuple[int, int]): First and past-the-end row of the shard
+        layout (dict): Name and shape of the "X", "y", "params" and "partials" blocks
+        dtype (str): Precision of the computation
+        epochs (int): Number of epochs
+        barrier (Barrier): Barrier shared by the workers and the parent
+    """
+    blocks, arrays = [], {}
+    try:
+        for key, (name, shape) in layout.items():
+            block, arrays[key] = _attach(name, shape, np.float64 if key == "partials" else dtype)
+            blocks.append(block)
+        _shard_loop(rank, bounds, arrays, dtype, epochs, barrier)
+    except threading.BrokenBarrierError:
+        pass
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        arrays.clear()
+        for block in blocks:
+            block.close()
+
+def _reduce_loop(arrays, weights, bias, learning_rate, epochs, barrier):
+    """
+    Publish the parameters, collect the partial gradients and take the step, every epoch.
+
+    Args:
+        arrays (dict): The shared "params" and "partials" arrays
+        weights (ndarray): Initial weights
+        bias (float): Initial bias
+        learning_rate (float): Learning rate
+        epochs (int): Number of epochs
+        barrier (Barrier): Barrier shared by the workers and the parent
+
+    Returns:
+        tuple[ndarray, float]: The trained weights of shape (n_features,) as float64 and the bias
+    """
+    params, partials = arrays["params"], arrays["partials"]
+    w = np.array(np.ravel(weights), dtype=np.float64)
+    bias = float(bias)
+    step = learning_rate / len(arrays["y"])
+
+    for _ in range(epochs):
+        params[:-1] = w
+        params[-1] = bias
+        barrier.wait(STEP_TIMEOUT)
+        barrier.wait(STEP_TIMEOUT)
+        total = partials.sum(axis=0)
+        w -= step * total[:-1]
+        bias -= step * total[-1]
+
+    return w, bias
+
+def train_parallel(X, y, weights, bias, learning_rate, epochs, workers, dtype=np.float64):
+    """
+    Run full-batch gradient descent with the rows split across processes.
+
+    The training data is copied once into shared memory and every worker
+    process computes the gradient of its contiguous row shard with the
+    same kernel as single-process training (see `ML.gradient_descent`).
+    Each epoch the parent publishes the weights and bias in shared memory,
+    the workers write their partial sums into their own row of a shared
+    (workers, n_features + 1) array, and the parent adds them up in rank
+    order and takes the step. Only the tiny parameter and partial arrays
+    change hands, through shared memory, and two barrier waits per epoch
+    synchronize the processes. The result matches single-process training
+    up to the rounding of the different summation order.
+
+    Args:
+        X (ndarray): Training features of shape (n_rows, n_features)
+        y (ndarray): Training labels, 0 or 1
+        weights (ndarray): Initial weights of shape (n_features,) or (n_features, 1)
+        bias (float): Initial bias
+        learning_rate (float): Learning rate
+        epochs (int): Number of epochs
+        workers (int): Number of worker processes
+        dtype: np.float64 or np.float32 (default: np.float64)
+
+    Returns:
+        tuple[ndarray, float]: The trained weights of shape (n_features, 1) as float64 and the bias
+
+    Raises:
+        RuntimeError: If a worker process failed or didn't finish an epoch within STEP_TIMEOUT
+    """
+    dtype = np.dtype(dtype)
+    rows, features = X.shape
+    shapes = {"X": (rows, features), "y": (rows,), "params": (features + 1,), "partials": (workers, features + 1)}
+    blocks, arrays = {}, {}
+    processes = []
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers + 1)
+
+    try:
+        for key, shape in shapes.items():
+            item_dtype = np.dtype(np.float64) if key == "partials" else dtype
+            blocks[key] = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * item_dtype.itemsize))
+            arrays[key] = np.ndarray(shape, dtype=item_dtype, buffer=blocks[key].buf)
+        arrays["X"][...] = X
+        arrays["y"][...] = np.ravel(y)
+
+        layout = {key: (blocks[key].name, shape) for key, shape in shapes.items()}
+        edges = np.linspace(0, rows, workers + 1).astype(int)
+        processes = _start_workers(context, workers, lambda rank: (rank, (int(edges[rank]), int(edges[rank + 1])), layout, dtype.name, epochs, barrier))
+
+        w, bias = _reduce_loop(arrays, weights, bias, learning_rate, epochs, barrier)
+    except threading.BrokenBarrierError:
+        raise RuntimeError("A training worker failed or timed out") from None
+    finally:
+        barrier.abort()
+        for process in processes:
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+        arrays.clear()
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    return w.reshape(-1, 1), bias
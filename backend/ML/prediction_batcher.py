@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+from core import metrics
+
+BATCHING_ENABLED = os.environ.get("PREDICTION_BATCHING", "0") == "1"
+BATCH_WINDOW_MS = float(os.environ.get("PREDICTION_BATCH_WINDOW_MS", "2"))
+BATCH_MAX_SIZE = int(os.environ.get("PREDICTION_BATCH_MAX_SIZE", "64"))
+
+batch_size_histogram = metrics.histogram(
+    "prediction_batch_size",
+    [1, 2, 4, 8, 16, 32, 64, 128, 256],
+    "Number of predictions scored together by the micro-batching scheduler",
+)
+queue_wait_histogram = metrics.histogram(
+    "prediction_batch_queue_wait_ms",
+    [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50],
+    "Time a prediction waited in the micro-batching queue in milliseconds",
+)
+
+class PredictionBatcher:
+    """
+    Micro-batching scheduler for single-row predictions.
+
+    Collects prediction requests arriving within a short time window and scores
+    them as one matrix, which is much cheaper than scoring every row on its own.
+    A batch is scored when the window elapses or when `max_size` requests are
+    waiting, whichever happens first. Every caller awaits its own future.
+
+    Attributes:
+        window (float): Collection window in seconds
+        max_size (int): Number of waiting requests that triggers scoring immediately
+    """
+    def __init__(self, window_ms=BATCH_WINDOW_MS, max_size=BATCH_MAX_SIZE):
+        """
+        Initialize the scheduler.
+
+        Args:
+            window_ms (float): Collection window in milliseconds (default: PREDICTION_BATCH_WINDOW_MS or 2)
+            max_size (int): Maximum batch size (default: PREDICTION_BATCH_MAX_SIZE or 64)
+        """
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._pending = []
+        self._timer = None
+
+    async def predict(self, model, features):
+        """
+        Queue a single row for prediction and wait for its result.
+
+        Args:
+            model (CompiledLoanPrediction): The model used for scoring
+            features (list): Feature values of the row
+
+        Returns:
+            int: Binary prediction (0 for rejected, 1 for approved)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((model, features, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """
+        Score all waiting requests and resolve their futures.
+
+        Requests are grouped by model, so a model swap in the middle of a
+        window doesn't mix parameters within one matrix.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        now = time.perf_counter()
+        batch_size_histogram.observe(len(pending))
+        for _, _, _, enqueued_at in pending:
+            queue_wait_histogram.observe((now - enqueued_at) * 1000)
+
+        groups = {}
+        for item in pending:
+            groups.setdefault(id(item[0]), []).append(item)
+
+        for items in groups.values():
+            try:
+                predictions = items[0][0].predict_rows([features for _, features, _, _ in items])
+            except Exception as e:
+                for _, _, future, _ in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, _, future, _), prediction in zip(items, predictions):
+                if not future.done():
+                    future.set_result(prediction)
+
+prediction_batcher = PredictionBatcher()
@@ -0,0 +1,218 @@
+from collections import deque
+from typing import NamedTuple
+import numpy as np
+
+ARMIJO = 1e-4
+MIN_STEP = 1e-10
+
+class SolverResult(NamedTuple):
+    """
+    Outcome of fitting a logistic regression model.
+
+    Attributes:
+        theta (ndarray): Fitted weights followed by the bias
+        iterations (int): Number of parameter updates
+        converged (bool): Whether a tolerance was reached, False at the iteration limit
+                          or when the line search found no step that decreases the loss
+        loss (float): Mean log-loss at `theta`
+    """
+    theta: np.ndarray
+    iterations: int
+    converged: bool
+    loss: float
+
+def _sigmoid(z):
+    """
+    Sigmoid function that doesn't overflow for large negative inputs.
+
+    Args:
+        z (ndarray): Input values
+
+    Returns:
+        ndarray: Sigmoid output values between 0 and 1
+    """
+    return 0.5 * (1 + np.tanh(0.5 * z))
+
+def _with_bias(X):
+    """
+    Append a column of ones to the features, so the bias is the last parameter.
+
+    Args:
+        X (ndarray): Feature matrix of shape (n_rows, n_features)
+
+    Returns:
+        ndarray: Feature matrix of shape (n_rows, n_features + 1)
+    """
+    return np.hstack([X, np.ones((X.shape[0], 1))])
+
+def _loss(X, y, theta):
+    """
+    Compute the mean log-loss without overflow.
+
+    Args:
+        X (ndarray): Feature matrix with the bias column
+        y (ndarray): Labels, 0 or 1
+        theta (ndarray): Parameters
+
+    Returns:
+        float: The mean log-loss
+    """
+    z = X @ theta
+    return float(np.mean(np.logaddexp(0, z) - y * z))
+
+def _line_search(X, y, theta, loss, gradient, direction):
+    """
+    Find a step along a descent direction with sufficient decrease (Armijo backtracking).
+
+    A step must lower the loss, also when the Armijo term is lost to
+    rounding near the optimum, so a search that can't make progress
+    anymore is reported instead of taking a step that changes nothing.
+
+    Args:
+        X (ndarray): Feature matrix with the bias column
+        y (ndarray): Labels
+        theta (ndarray): Current parameters
+        loss (float): Loss at `theta`
+        gradient (ndarray): Gradient at `theta`
+        direction (ndarray): Descent direction, `theta` moves to `theta - step * direction`
+
+    Returns:
+        tuple[ndarray, float]|None: The new parameters and their loss, None if no step
+                                    of at least MIN_STEP decreased the loss enough
+    """
+    slope = float(gradient @ direction)
+    step = 1.0
+    while step >= MIN_STEP:
+        candidate = theta - step * direction
+        candidate_loss = _loss(X, y, candidate)
+        if candidate_loss < loss and candidate_loss <= loss - ARMIJO * step * slope:
+            return candidate, candidate_loss
+        step /= 2
+    return None
+
+def _converged(gradient, loss, previous_loss, tolerance):
+    """
+    Check the stopping criteria.
+
+    Near the optimum the loss is within about |gradient|^2 of its minimum,
+    so the relative loss change is compared against `tolerance` squared.
+    This way both criteria stop at about the same distance from the optimum.
+
+    Args:
+        gradient (ndarray): Current gradient
+        loss (float): Current loss
+        previous_loss (float|None): Loss before the last update, None before the first one
+        tolerance (float): Tolerance for the largest gradient component
+
+    Returns:
+        bool: True if the gradient or the loss change is within the tolerance
+    """
+    if np.max(np.abs(gradient)) < tolerance:
+        return True
+    return previous_loss is not None and abs(previous_loss - loss) <= tolerance ** 2 * max(1.0, abs(loss))
+
+def newton(X, y, max_iterations=100, tolerance=1e-6):
+    """
+    Fit logistic regression with Newton's method (iteratively reweighted least squares).
+
+    Every iteration solves the linear system of the (n_features + 1)^2
+    Hessian X^T W X / n with W = p (1 - p), which is cheap for a handful of
+    features and converges quadratically near the optimum. Steps are
+    damped by a backtracking line search, so the loss never increases.
+
+    Args:
+        X (ndarray): Normalized feature matrix of shape (n_rows, n_features)
+        y (ndarray): Labels, 0 or 1
+        max_iterations (int): Maximum number of updates (default: 100)
+        tolerance (float): Stopping tolerance for the largest gradient component (default: 1e-6)
+
+    Returns:
+        SolverResult: The fitted parameters and convergence information
+    """
+    X = _with_bias(np.asarray(X, dtype=float))
+    y = np.asarray(y, dtype=float).ravel()
+    theta = np.zeros(X.shape[1])
+    loss, previous_loss = _loss(X, y, theta), None
+
+    for iteration in range(max_iterations + 1):
+        p = _sigmoid(X @ theta)
+        gradient = X.T @ (p - y) / len(y)
+        if _converged(gradient, loss, previous_loss, tolerance):
+            return SolverResult(theta, iteration, True, loss)
+        if iteration == max_iterations:
+            break
+
+        hessian = (X.T * (p * (1 - p))) @ X / len(y)
+        try:
+            direction = np.linalg.solve(hessian, gradient)
+        except np.linalg.LinAlgError:
+            direction = np.linalg.lstsq(hessian, gradient, rcond=None)[0]
+
+        update = _line_search(X, y, theta, loss, gradient, direction)
+        if update is None:
+            return SolverResult(theta, iteration, False, loss)
+        previous_loss = loss
+        theta, loss = update
+
+    return SolverResult(theta, max_iterations, False, loss)
+
+def lbfgs(X, y, max_iterations=100, tolerance=1e-6, history=10):
+    """
+    Fit logistic regression with the limited-memory BFGS method.
+
+    The inverse Hessian is approximated from the last `history` parameter
+    and gradient changes (two-loop recursion), so every iteration only
+    needs the gradient. Steps are chosen by a backtracking line search,
+    and changes that would break the positive definiteness of the
+    approximation are skipped.
+
+    Args:
+        X (ndarray): Normalized feature matrix of shape (n_rows, n_features)
+        y (ndarray): Labels, 0 or 1
+        max_iterations (int): Maximum number of updates (default: 100)
+        tolerance (float): Stopping tolerance for the largest gradient component (default: 1e-6)
+        history (int): Number of stored changes (default: 10)
+
+    Returns:
+        SolverResult: The fitted parameters and convergence information
+    """
+    X = _with_bias(np.asarray(X, dtype=float))
+    y = np.asarray(y, dtype=float).ravel()
+    theta = np.zeros(X.shape[1])
+    loss, previous_loss = _loss(X, y, theta), None
+    gradient = X.T @ (_sigmoid(X @ theta) - y) / len(y)
+    pairs = deque(maxlen=history)
+
+    for iteration in range(max_iterations + 1):
+        if _converged(gradient, loss, previous_loss, tolerance):
+            return SolverResult(theta, iteration, True, loss)
+        if iteration == max_iterations:
+            break
+
+        direction = gradient.copy()
+        alphas = []
+        for s, g, rho in reversed(pairs):
+            alpha = rho * (s @ direction)
+            direction -= alpha * g
+            alphas.append(alpha)
+        if pairs:
+            s, g, _ = pairs[-1]
+            direction *= (s @ g) / (g @ g)
+        for (s, g, rho), alpha in zip(pairs, reversed(alphas)):
+            direction += s * (alpha - rho * (g @ direction))
+
+        update = _line_search(X, y, theta, loss, gradient, direction)
+        if update is None:
+            return SolverResult(theta, iteration, False, loss)
+        previous_loss = loss
+        new_theta, loss = update
+        new_gradient = X.T @ (_sigmoid(X @ new_theta) - y) / len(y)
+
+        s, g = new_theta - theta, new_gradient - gradient
+        if s @ g > 1e-12:
+            pairs.append((s, g, 1.0 / (s @ g)))
+        theta, gradient = new_theta, new_gradient
+
+    return SolverResult(theta, max_iterations, False, loss)
+
+SOLVERS = {"newton": newton, "lbfgs": lbfgs}
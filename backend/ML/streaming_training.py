@@ -0,0 +1,361 @@
+import os
+import numpy as np
+import pandas as pd
+from ML import evaluation
+from ML.load_prediction_logistic_regression import LoanPrediction, encode_dataset
+
+CHUNK_ROWS = int(os.environ.get("TRAINING_CHUNK_ROWS", "100000"))
+BATCH_SIZE = int(os.environ.get("TRAINING_BATCH_SIZE", "256"))
+SHUFFLE_ROWS = int(os.environ.get("TRAINING_SHUFFLE_ROWS", str(4 * CHUNK_ROWS)))
+OPTIMIZER = os.environ.get("TRAINING_OPTIMIZER", "adam")
+STREAMING_EPOCHS = int(os.environ.get("TRAINING_STREAMING_EPOCHS", "10"))
+STREAMING_TOLERANCE = float(os.environ.get("TRAINING_STREAMING_TOLERANCE", "1e-4"))
+
+class Sgd:
+    """
+    Plain stochastic gradient descent.
+
+    Attributes:
+        learning_rate (float): Step size
+    """
+    def __init__(self, learning_rate, size):
+        """
+        Initialize the optimizer.
+
+        Args:
+            learning_rate (float): Step size
+            size (int): Number of parameters
+        """
+        self.learning_rate = learning_rate
+
+    def step(self, theta, gradient):
+        """
+        Update the parameters in place.
+
+        Args:
+            theta (ndarray): The parameters
+            gradient (ndarray): Gradient of the loss at `theta`
+        """
+        theta -= self.learning_rate * gradient
+
+class Momentum(Sgd):
+    """
+    Stochastic gradient descent with (heavy ball) momentum.
+
+    Attributes:
+        learning_rate (float): Step size
+        beta (float): Decay of the velocity
+    """
+    def __init__(self, learning_rate, size, beta=0.9):
+        """
+        Initialize the optimizer with zero velocity.
+
+        Args:
+            learning_rate (float): Step size
+            size (int): Number of parameters
+            beta (float): Decay of the velocity (default: 0.9)
+        """
+        super().__init__(learning_rate, size)
+        self.beta = beta
+        self.velocity = np.zeros(size)
+
+    def step(self, theta, gradient):
+        """
+        Update the parameters in place.
+
+        Args:
+            theta (ndarray): The parameters
+            gradient (ndarray): Gradient of the loss at `theta`
+        """
+        self.velocity *= self.beta
+        self.velocity += gradient
+        theta -= self.learning_rate * self.velocity
+
+class Adam(Sgd):
+    """
+    Adam: per-parameter step sizes from bias-corrected moment estimates.
+
+    Attributes:
+        learning_rate (float): Step size
+        beta1 (float): Decay of the first moment estimate
+        beta2 (float): Decay of the second moment estimate
+        epsilon (float): Term keeping the step finite for parameters without gradient
+    """
+    def __init__(self, learning_rate, size, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        """
+        Initialize the optimizer with zero moment estimates.
+
+        Args:
+            learning_rate (float): Step size
+            size (int): Number of parameters
+            beta1 (float): Decay of the first moment estimate (default: 0.9)
+            beta2 (float): Decay of the second moment estimate (default: 0.999)
+            epsilon (float): Numerical stability term (default: 1e-8)
+        """
+        super().__init__(learning_rate, size)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.m = np.zeros(size)
+        self.v = np.zeros(size)
+        self.t = 0
+
+    def step(self, theta, gradient):
+        """
+        Update the parameters in place.
+
+        Args:
+            theta (ndarray): The parameters
+            gradient (ndarray): Gradient of the loss at `theta`
+        """
+        self.t += 1
+        self.m = self.beta1 * self.m + (1 - self.beta1) * gradient
+        self.v = self.beta2 * self.v + (1 - self.beta2) * gradient * gradient
+        m_hat = self.m / (1 - self.beta1 ** self.t)
+        v_hat = self.v / (1 - self.beta2 ** self.t)
+        theta -= self.learning_rate * m_hat / (np.sqrt(v_hat) + self.epsilon)
+
+OPTIMIZERS = {"sgd": Sgd, "momentum": Momentum, "adam": Adam}
+
+def iter_chunks(csv_path, chunk_rows=CHUNK_ROWS):
+    """
+    Read a dataset in the training CSV layout chunk by chunk.
+
+    Args:
+        csv_path (str): Path to the CSV file
+        chunk_rows (int): Number of rows per chunk
+
+    Yields:
+        tuple[ndarray, ndarray]: Raw features as float64 and labels of shape (n_rows,)
+    """
+    with pd.read_csv(csv_path, chunksize=chunk_rows) as reader:
+        for df in reader:
+            X, y = encode_dataset(df)
+            yield X.astype(float), y.ravel().astype(float)
+
+def _train_mask(seed, chunk_index, rows, train_size):
+    """
+    Assign the rows of a chunk to the training or the test set.
+
+    The assignment depends only on the seed and the position of the chunk,
+    so every pass over the file sees the same split.
+
+    Args:
+        seed (int): Seed of the training run
+        chunk_index (int): Position of the chunk in the file
+        rows (int): Number of rows in the chunk
+        train_size (float): Proportion of rows used for training
+
+    Returns:
+        ndarray: True for training rows
+    """
+    return np.random.default_rng([seed, chunk_index]).random(rows) < train_size
+
+def feature_statistics(csv_path, train_size, seed, chunk_rows=CHUNK_ROWS):
+    """
+    Compute the mean and standard deviation of the training features in one streaming pass.
+
+    The per-chunk means and sums of squared deviations are merged with the
+    parallel variance formula (Chan et al.), which stays accurate for large
+    feature values unlike accumulating sums of squares.
+
+    Args:
+        csv_path (str): Path to the CSV file
+        train_size (float): Proportion of rows used for training
+        seed (int): Seed of the training run
+        chunk_rows (int): Number of rows per chunk
+
+    Returns:
+        tuple[ndarray, ndarray, int]: Feature means, (population) standard deviations
+                                      and the number of training rows
+    """
+    count, mean, m2 = 0, None, None
+    for chunk_index, (X, _) in enumerate(iter_chunks(csv_path, chunk_rows)):
+        X = X[_train_mask(seed, chunk_index, len(X), train_size)]
+        if not len(X):
+            continue
+
+        chunk_mean = X.mean(axis=0)
+        chunk_m2 = ((X - chunk_mean) ** 2).sum(axis=0)
+        if mean is None:
+            count, mean, m2 = len(X), chunk_mean, chunk_m2
+            continue
+
+        total = count + len(X)
+        delta = chunk_mean - mean
+        mean = mean + delta * len(X) / total
+        m2 = m2 + chunk_m2 + delta ** 2 * count * len(X) / total
+        count = total
+
+    if not count:
+        raise ValueError("Dataset doesn't contain any training rows")
+
+    std = np.sqrt(m2 / count)
+    std[std == 0] = 1.0
+    return mean, std, count
+
+def _training_chunks(csv_path, train_size, seed, chunk_rows, x_mean, x_std):
+    """
+    Read the normalized training rows of a CSV file chunk by chunk.
+
+    Args:
+        csv_path (str): Path to the CSV file
+        train_size (float): Proportion of rows used for training
+        seed (int): Seed of the training run
+        chunk_rows (int): Number of rows per chunk
+        x_mean (ndarray): Feature means of the training rows
+        x_std (ndarray): Feature standard deviations of the training rows
+
+    Yields:
+        tuple[ndarray, ndarray]: Normalized features and labels of the training rows of a chunk
+    """
+    for chunk_index, (X, y) in enumerate(iter_chunks(csv_path, chunk_rows)):
+        mask = _train_mask(seed, chunk_index, len(X), train_size)
+        yield (X[mask] - x_mean) / x_std, y[mask]
+
+def shuffled_batches(chunks, batch_size, buffer_rows, rng):
+    """
+    Mix the rows of consecutive chunks in a bounded shuffle buffer and split them into mini-batches.
+
+    Every chunk is added to the buffer, then whole mini-batches of rows
+    drawn at random from the buffer are taken out until at most
+    `buffer_rows` rows are left. The remaining rows are shuffled and taken
+    out after the last chunk. A mini-batch thus mixes rows of the current
+    chunk with rows of earlier ones, while memory stays bounded by the
+    buffer and one chunk.
+
+    Args:
+        chunks (Iterable[tuple[ndarray, ndarray]]): Features and labels of every chunk
+        batch_size (int): Number of rows per mini-batch
+        buffer_rows (int): Number of rows kept in the buffer between chunks
+        rng (Generator): Random generator of the shuffling
+
+    Yields:
+        tuple[ndarray, ndarray]: Features and labels of a mini-batch
+    """
+    X_buffer, y_buffer = None, None
+    for X, y in chunks:
+        if X_buffer is None:
+            X_buffer, y_buffer = X, y
+        else:
+            X_buffer, y_buffer = np.concatenate((X_buffer, X)), np.concatenate((y_buffer, y))
+
+        ready = (len(y_buffer) - buffer_rows) // batch_size * batch_size
+        if ready <= 0:
+            continue
+
+        order = rng.permutation(len(y_buffer))
+        for start in range(0, ready, batch_size):
+            batch = order[start:start + batch_size]
+            yield X_buffer[batch], y_buffer[batch]
+        kept = order[ready:]
+        X_buffer, y_buffer = X_buffer[kept], y_buffer[kept]
+
+    if X_buffer is None:
+        return
+
+    order = rng.permutation(len(y_buffer))
+    for start in range(0, len(y_buffer), batch_size):
+        batch = order[start:start + batch_size]
+        yield X_buffer[batch], y_buffer[batch]
+
+def _sigmoid(z):
+    """
+    Sigmoid function that doesn't overflow for large negative inputs.
+
+    Args:
+        z (ndarray): Input values
+
+    Returns:
+        ndarray: Sigmoid output values between 0 and 1
+    """
+    return 0.5 * (1 + np.tanh(0.5 * z))
+
+def train_streaming(csv_path, train_size, learning_rate, epochs=STREAMING_EPOCHS, batch_size=BATCH_SIZE, optimizer=OPTIMIZER, chunk_rows=CHUNK_ROWS, seed=None, tolerance=STREAMING_TOLERANCE, shuffle_rows=SHUFFLE_ROWS):
+    """
+    Train a model with mini-batch gradient descent without loading the whole dataset.
+
+    The file is read `chunk_rows` rows at a time: once to compute the
+    normalization statistics of the training rows, then once per epoch to
+    train and finally once to evaluate on the held-out rows. The training
+    rows pass through a shuffle buffer of `shuffle_rows` rows that mixes
+    rows across chunks (see `shuffled_batches`) and are processed in
+    mini-batches of `batch_size` rows, so memory use is bounded by the
+    chunk and buffer sizes and doesn't grow with the file. Chunks are read
+    in file order, so rows further apart than the buffer are never mixed;
+    datasets sorted by time should use a buffer covering many periods.
+
+    Every pass re-reads the whole file, so the number of epochs is small
+    and training stops early once the mean training loss of an epoch,
+    accumulated over its mini-batches, changes by no more than `tolerance`
+    (relative) from the previous epoch.
+
+    Only the labels and probabilities of the held-out rows are kept for
+    the evaluation (9 bytes per row).
+
+    Args:
+        csv_path (str): Path to the CSV file containing training data
+        train_size (float): Proportion of rows to use for training
+        learning_rate (float): Step size of the optimizer
+        epochs (int): Maximum number of passes over the training rows
+                      (default: TRAINING_STREAMING_EPOCHS or 10)
+        batch_size (int): Number of rows per gradient step (default: TRAINING_BATCH_SIZE or 256)
+        optimizer (str): "sgd", "momentum" or "adam" (default: TRAINING_OPTIMIZER or "adam")
+        chunk_rows (int): Number of rows read at a time (default: TRAINING_CHUNK_ROWS or 100000)
+        seed (int|None): Seed of the split and the shuffling, random if None
+        tolerance (float): Relative change of the epoch loss to stop at
+                           (default: TRAINING_STREAMING_TOLERANCE or 1e-4)
+        shuffle_rows (int): Number of rows kept in the shuffle buffer
+                            (default: TRAINING_SHUFFLE_ROWS or 4 chunks)
+
+    Returns:
+        tuple[LoanPrediction, dict, dict]: The trained model, its test set metrics as
+                                           returned by `ML.evaluation.evaluate` and the
+                                           training run (epochs, iterations as the number
+                                           of mini-batch steps, converged)
+
+    Raises:
+        ValueError: If the optimizer is unknown or the dataset has no training rows
+    """
+    if optimizer not in OPTIMIZERS:
+        raise ValueError(f"Unknown optimizer {optimizer!r}, expected one of {', '.join(OPTIMIZERS)}")
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2 ** 32)
+
+    x_mean, x_std, _ = feature_statistics(csv_path, train_size, seed, chunk_rows)
+    theta = np.zeros(len(x_mean) + 1)
+    gradient = np.empty_like(theta)
+    step = OPTIMIZERS[optimizer](learning_rate, len(theta))
+    rng = np.random.default_rng(seed)
+
+    epochs_run, steps, converged = 0, 0, False
+    previous_loss = None
+    for epochs_run in range(1, epochs + 1):
+        loss_sum, rows_seen = 0.0, 0
+        chunks = _training_chunks(csv_path, train_size, seed, chunk_rows, x_mean, x_std)
+        for X_batch, y_batch in shuffled_batches(chunks, batch_size, shuffle_rows, rng):
+            z = X_batch @ theta[:-1] + theta[-1]
+            error = _sigmoid(z) - y_batch
+            loss_sum += float(np.sum(np.logaddexp(0, z) - y_batch * z))
+            rows_seen += len(y_batch)
+            gradient[:-1] = X_batch.T @ error / len(error)
+            gradient[-1] = error.mean()
+            step.step(theta, gradient)
+            steps += 1
+
+        loss = loss_sum / max(1, rows_seen)
+        if previous_loss is not None and abs(previous_loss - loss) <= tolerance * max(1.0, abs(loss)):
+            converged = True
+            break
+        previous_loss = loss
+
+    model = LoanPrediction.from_params(theta[:-1], theta[-1], x_mean, x_std)
+
+    labels, probabilities = [], []
+    for chunk_index, (X, y) in enumerate(iter_chunks(csv_path, chunk_rows)):
+        mask = ~_train_mask(seed, chunk_index, len(X), train_size)
+        labels.append(y[mask].astype(np.int8))
+        probabilities.append(model.predict_proba(X[mask]).ravel())
+
+    run = {"epochs": epochs_run, "iterations": steps, "converged": converged}
+    return model, evaluation.evaluate(np.concatenate(labels), np.concatenate(probabilities)), run
@@ -0,0 +1,66 @@
+import os
+import time
+from ML import streaming_training
+from ML.load_prediction_logistic_regression import LoanPrediction
+
+DATASET_PATH = "./training-dataset/loan_approval_dataset.csv"
+TRAINING_MODE = os.environ.get("TRAINING_MODE", "batch")
+TRAINING_DTYPE = os.environ.get("TRAINING_DTYPE", "float64")
+TRAINING_PARALLELISM = int(os.environ.get("TRAINING_PARALLELISM", "1"))
+
+def train_model(csv_path, train_size, learning_rate, epochs, solver="gd", tolerance=1e-6):
+    """
+    Train a model and evaluate it on the test set.
+
+    Runs in a worker process, so it only takes and returns plain picklable
+    values instead of database objects.
+
+    With TRAINING_MODE=streaming the dataset is read in chunks and the model
+    is trained with mini-batches (see `ML.streaming_training`), so datasets
+    larger than memory can be used. Since every epoch re-reads the file,
+    streaming runs at most TRAINING_STREAMING_EPOCHS epochs (default 10)
+    and stops early once the epoch loss settles. The default, "batch",
+    loads the whole dataset and trains it with the given solver (see
+    `LoanPrediction.train`).
+    TRAINING_DTYPE=float32 runs gradient descent in single precision, and
+    TRAINING_PARALLELISM=N splits its rows across up to N processes.
+
+    Args:
+        csv_path (str): Path to the CSV file containing training data
+        train_size (float): Proportion of data to use for training
+        learning_rate (float): Learning rate for gradient descent
+        epochs (int): Number of training iterations, the iteration limit for
+                      the "newton" and "lbfgs" solvers and an upper bound of the
+                      streaming epochs
+        solver (str): "gd", "newton" or "lbfgs", ignored in streaming mode (default: "gd")
+        tolerance (float): Stopping tolerance of the "newton" and "lbfgs" solvers (default: 1e-6)
+
+    Returns:
+        dict: Trained parameters (weights, bias, x_mean, x_std), test set
+              metrics (accuracy, precision, f1_score, recall, confusion_matrix,
+              roc_auc, average_precision, roc_curve, pr_curve) from a single
+              evaluation pass and the training run (solver, epochs, iterations,
+              converged, training_seconds). Streaming runs count mini-batch
+              steps as iterations, full-batch runs make one pass per
+              iteration. The training time covers fitting the model, and in
+              streaming mode also reading the file
+    """
+    if TRAINING_MODE == "streaming":
+        start = time.perf_counter()
+        model, metrics, run = streaming_training.train_streaming(csv_path, train_size, learning_rate, min(epochs, streaming_training.STREAMING_EPOCHS))
+        run = {"solver": streaming_training.OPTIMIZER, **run, "training_seconds": time.perf_counter() - start}
+    else:
+        model = LoanPrediction(csv_path, train_size=train_size, learning_rate=learning_rate, epochs=epochs, solver=solver, tolerance=tolerance, dtype=TRAINING_DTYPE, workers=TRAINING_PARALLELISM)
+        start = time.perf_counter()
+        model.train()
+        run = {"solver": solver, "epochs": model.iterations, "iterations": model.iterations, "converged": model.converged, "training_seconds": time.perf_counter() - start}
+        metrics = model.evaluate()
+
+    return {
+        "weights": model.get_weights(),
+        "bias": float(model.get_bias()),
+        "x_mean": model.X_mean.tolist(),
+        "x_std": model.X_std.tolist(),
+        **metrics,
+        **run,
+    }
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+from services import metrics_service
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+router = APIRouter()
+security = HTTPBearer()
+
+@router.get("/get")
+async def get_metrics(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Get the current values of the runtime metrics of this worker (admin only operation).
+
+    Args:
+        request (Request): FastAPI request object containing user_id in state
+        credentials: JWT bearer token for authentication
+
+    Returns:
+        dict: Snapshots of all registered metrics keyed by name
+
+    Raises:
+        HTTPException: 404 if user does not exist, 403 if not admin
+    """
+    user_id = request.state.user_id
+    try:
+        return await metrics_service.get_metrics(user_id, request.state.role_claim)
+    except HTTPException as e:
+        raise e
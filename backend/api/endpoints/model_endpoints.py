@@ -1,15 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from schemas import model_schema
-from services import model_service
+from services import model_service, training_service
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 router = APIRouter()
 security = HTTPBearer()
 
-@router.get("/get", response_model=model_schema.ModelOut)
-async def get_model(credentials: HTTPAuthorizationCredentials = Depends(security)):
+@router.get("/get", response_model=list[model_schema.ModelVersionOut])
+async def get_models(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
-    Get the current machine learning model information.
+    Get all machine learning model versions.
+    
+    Args:
+        credentials: JWT bearer token for authentication
+    
+    Returns:
+        list[model_schema.ModelVersionOut]: Every model version with its hyperparameters,
+                              training/test split configuration, model parameters,
+                              performance metrics and whether it is the active one
+    """
+    try:
+        models = await model_service.get_models()
+        return models
+    except HTTPException as e:
+        raise e
+
+@router.get("/get/active", response_model=model_schema.ModelOut)
+async def get_active_model(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Get the machine learning model version used for predictions.
     
     Args:
         credentials: JWT bearer token for authentication
@@ -23,7 +42,102 @@ async def get_model(credentials: HTTPAuthorizationCredentials = Depends(security
         HTTPException: 404 if model does not exist
     """
     try:
-        model = await model_service.get_model()
+        model = await model_service.get_active_model()
+        return model
+    except HTTPException as e:
+        raise e
+
+@router.post("/promote/{id}", response_model=model_schema.ModelOut)
+async def promote_model(request: Request, id: int, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Make a model version the one used for predictions (admin only operation).
+    
+    Running workers pick up the new version within the model cache refresh interval.
+    
+    Args:
+        request (Request): FastAPI request object containing user_id in state
+        id (int): ID of the model version to promote
+        credentials: JWT bearer token for authentication
+    
+    Returns:
+        model_schema.ModelOut: The promoted model
+                              
+    Raises:
+        HTTPException: 404 if user or model does not exist, 403 if not admin
+    """
+    user_id = request.state.user_id
+    try:
+        model = await model_service.promote_model(user_id, id, request.state.role_claim)
+        return model
+    except HTTPException as e:
+        raise e
+
+@router.post("/rollback", response_model=model_schema.ModelOut)
+async def rollback_model(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Make the previously active model version the one used for predictions again (admin only operation).
+    
+    Args:
+        request (Request): FastAPI request object containing user_id in state
+        credentials: JWT bearer token for authentication
+    
+    Returns:
+        model_schema.ModelOut: The model that is active after the rollback
+                              
+    Raises:
+        HTTPException: 404 if user or previous model does not exist, 403 if not admin
+    """
+    user_id = request.state.user_id
+    try:
+        model = await model_service.rollback_model(user_id, request.state.role_claim)
         return model
     except HTTPException as e:
         raise e
+
+@router.post("/train", response_model=model_schema.TrainingJobOut)
+async def start_training(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Start retraining the model in the background (admin only operation).
+    
+    The current model keeps serving predictions until the training job
+    publishes the new one.
+    
+    Args:
+        request (Request): FastAPI request object containing user_id in state
+        credentials: JWT bearer token for authentication
+    
+    Returns:
+        model_schema.TrainingJobOut: The created training job
+                              
+    Raises:
+        HTTPException: 404 if user does not exist, 403 if not admin
+    """
+    user_id = request.state.user_id
+    try:
+        job = await training_service.start_training(user_id, request.state.role_claim)
+        return job
+    except HTTPException as e:
+        raise e
+
+@router.get("/train/{id}", response_model=model_schema.TrainingJobOut)
+async def get_training_job(request: Request, id: int, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Get the state of a training job.
+    
+    Args:
+        request (Request): FastAPI request object containing user_id in state
+        id (int): ID of the training job
+        credentials: JWT bearer token for authentication
+    
+    Returns:
+        model_schema.TrainingJobOut: The training job with its current status
+                              
+    Raises:
+        HTTPException: 404 if user or training job does not exist
+    """
+    user_id = request.state.user_id
+    try:
+        job = await training_service.get_training_job(user_id, id)
+        return job
+    except HTTPException as e:
+        raise e
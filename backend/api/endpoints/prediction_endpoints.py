@@ -1,76 +1,176 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query, Header
+from typing_extensions import Optional
+from api.responses import UploadStreamingResponse
 from schemas import prediction_schema
 from services import prediction_service
+from services.prediction_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 router = APIRouter()
 security = HTTPBearer()
 
 @router.post("/predict", response_model=prediction_schema.PredictionOut)
-async def predict(request: Request, prediction_data: prediction_schema.PredictionCreate, credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def predict(request: Request, response: Response, prediction_data: prediction_schema.PredictionCreate, idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"), credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
     Create a new loan approval prediction using the trained ML model.
     
+    Requests sent with an `Idempotency-Key` header create the prediction
+    only once: retries with the same key get the first response back, marked
+    with the `Idempotent-Replayed: true` header.
+    
     Args:
         request (Request): FastAPI request object containing user_id in state
+        response (Response): FastAPI response object used to set headers
         prediction_data (prediction_schema.PredictionCreate): Input data for loan prediction
                                                               including financial and personal information
+        idempotency_key (Optional[str]): Client-chosen key identifying the request, at most 255 characters
         credentials: JWT bearer token for authentication
     
     Returns:
         prediction_schema.PredictionOut: Prediction result with input data and approval/rejection decision
         
     Raises:
-        HTTPException: 404 if user does not exist
+        HTTPException: 400 if the idempotency key is invalid, 404 if user does not exist,
+                       422 if the idempotency key was used for a different request
     """
     user_id = request.state.user_id
     try:
-        prediction = await prediction_service.make_prediction(user_id, prediction_data)
+        if idempotency_key is None:
+            return await prediction_service.make_prediction(user_id, prediction_data)
+
+        prediction, replayed = await prediction_service.make_prediction_idempotent(user_id, prediction_data, idempotency_key)
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
         return prediction
     except HTTPException as e:
         raise e
 
-@router.get("/get/all", response_model=list[prediction_schema.PredictionOut])
-async def get_current_user_predictions(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+@router.post("/predict/prequalify", response_model=prediction_schema.PredictionDecisionOut)
+async def predict_prequalify(request: Request, prediction_data: prediction_schema.PredictionCreate, credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
-    Get all predictions for the current authenticated user.
+    Create a loan approval prediction without waiting for it to be stored.
+    
+    The prediction record is written in the background, usually within a
+    few hundred milliseconds, so it doesn't have an ID yet.
     
     Args:
         request (Request): FastAPI request object containing user_id in state
+        prediction_data (prediction_schema.PredictionCreate): Input data for loan prediction
         credentials: JWT bearer token for authentication
     
     Returns:
-        list[prediction_schema.PredictionOut]: List of user's predictions with input data and results
+        prediction_schema.PredictionDecisionOut: The approval/rejection decision
         
     Raises:
         HTTPException: 404 if user does not exist
     """
     user_id = request.state.user_id
     try:
-        predictions = await prediction_service.get_predictions(user_id, user_id)
+        prediction = await prediction_service.make_prediction_deferred(user_id, prediction_data)
+        return prediction
+    except HTTPException as e:
+        raise e
+
+@router.post("/predict/batch", response_model=list[prediction_schema.PredictionOut])
+async def predict_batch(request: Request, predictions_data: list[prediction_schema.PredictionCreate], credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Create loan approval predictions for a batch of inputs.
+    
+    Args:
+        request (Request): FastAPI request object containing user_id in state
+        predictions_data (list[prediction_schema.PredictionCreate]): Input data for each prediction
+        credentials: JWT bearer token for authentication
+    
+    Returns:
+        list[prediction_schema.PredictionOut]: Prediction results in the same order as the inputs
+        
+    Raises:
+        HTTPException: 400 if the batch is empty, 413 if it has more than PREDICTION_MAX_BATCH_SIZE
+                       (default 1000) inputs, 404 if user does not exist
+    """
+    user_id = request.state.user_id
+    try:
+        predictions = await prediction_service.make_predictions_batch(user_id, predictions_data)
+        return predictions
+    except HTTPException as e:
+        raise e
+
+@router.post("/predict/csv", response_class=UploadStreamingResponse)
+async def predict_csv(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Score a CSV file in the training dataset layout.
+    
+    The CSV is sent as the raw request body. Rows are scored in chunks while
+    the upload is still being read and the results are streamed back as
+    NDJSON, one line per row. Quoted values may contain line breaks.
+    Results are not stored.
+    
+    Args:
+        request (Request): FastAPI request object containing user_id in state and the CSV body
+        credentials: JWT bearer token for authentication
+    
+    Returns:
+        UploadStreamingResponse: NDJSON lines with `row`, `loan_id` and `prediction` (or `error`) for every row
+        
+    Raises:
+        HTTPException: 400 if the file is empty or columns are missing, 404 if user does not exist
+    """
+    user_id = request.state.user_id
+    try:
+        results = await prediction_service.score_csv(user_id, request.stream())
+        return UploadStreamingResponse(results, media_type="application/x-ndjson")
+    except HTTPException as e:
+        raise e
+
+@router.get("/get/all", response_model=prediction_schema.PredictionPageOut, response_model_exclude_unset=True)
+async def get_current_user_predictions(request: Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, fields: Optional[str] = None, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Get one page of predictions of the current authenticated user, newest first.
+    
+    Args:
+        request (Request): FastAPI request object containing user_id in state
+        limit (int): Maximum number of predictions on the page
+        cursor (Optional[str]): `next_cursor` of the previous page
+        fields (Optional[str]): Comma-separated prediction fields to return (default: all).
+                                Leaving out `prediction_inputs` skips loading the input data.
+        credentials: JWT bearer token for authentication
+    
+    Returns:
+        prediction_schema.PredictionPageOut: The user, the page of predictions and the next cursor
+        
+    Raises:
+        HTTPException: 404 if user does not exist, 400 if cursor or fields are invalid
+    """
+    user_id = request.state.user_id
+    try:
+        predictions = await prediction_service.get_predictions(user_id, user_id, limit, cursor, fields)
         return predictions
     except HTTPException as e:
         raise e
 
-@router.get("/get/all/{id}", response_model=list[prediction_schema.PredictionOut])
-async def get_user_predictions(request: Request, id: int, credentials: HTTPAuthorizationCredentials = Depends(security)):
+@router.get("/get/all/{id}", response_model=prediction_schema.PredictionPageOut, response_model_exclude_unset=True)
+async def get_user_predictions(request: Request, id: int, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, fields: Optional[str] = None, credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
-    Get all predictions for a specific user by their ID.
+    Get one page of predictions of a specific user by their ID, newest first.
     
     Args:
         request (Request): FastAPI request object containing user_id in state
         id (int): ID of the user whose predictions to retrieve
+        limit (int): Maximum number of predictions on the page
+        cursor (Optional[str]): `next_cursor` of the previous page
+        fields (Optional[str]): Comma-separated prediction fields to return (default: all).
+                                Leaving out `prediction_inputs` skips loading the input data.
         credentials: JWT bearer token for authentication
     
     Returns:
-        list[prediction_schema.PredictionOut]: List of the specified user's predictions
+        prediction_schema.PredictionPageOut: The user, the page of predictions and the next cursor
         
     Raises:
-        HTTPException: 404 if either user does not exist
+        HTTPException: 404 if either user does not exist, 400 if cursor or fields are invalid
     """
     user_id = request.state.user_id
     try:
-        predictions = await prediction_service.get_predictions(user_id, id)
+        predictions = await prediction_service.get_predictions(user_id, id, limit, cursor, fields)
         return predictions
     except HTTPException as e:
         raise e
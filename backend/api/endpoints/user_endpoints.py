@@ -68,7 +68,7 @@ async def delete_user_admin(request: Request, id: int, credentials: HTTPAuthoriz
     """
     user_id = request.state.user_id
     try:
-        user = await user_service.delete_user_admin(user_id, id)
+        user = await user_service.delete_user_admin(user_id, id, request.state.role_claim)
         return user
     except HTTPException as e:
         raise e
@@ -115,7 +115,7 @@ async def update_user_admin(request: Request, id: int, user_data: user_schema.Us
     """
     user_id = request.state.user_id
     try:
-        user = await user_service.update_user_admin(user_id, id, user_data)
+        user = await user_service.update_user_admin(user_id, id, user_data, request.state.role_claim)
         return user
     except HTTPException as e:
         raise e
@@ -180,11 +180,11 @@ async def update_user_role(request: Request, id: int, role_id: int, credentials:
         user_schema.UserOut: User information with updated role
         
     Raises:
-        HTTPException: 404 if user does not exist, 403 if not admin
+        HTTPException: 404 if user or role does not exist, 403 if not admin
     """
     user_id = request.state.user_id
     try:
-         user = await user_service.change_user_role(user_id, id, role_id)
+         user = await user_service.change_user_role(user_id, id, role_id, request.state.role_claim)
          return user
     except HTTPException as e:
          raise e
@@ -0,0 +1,34 @@
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose content is produced while the request body is still being read.
+
+    On servers implementing ASGI spec versions before 2.4 (e.g. uvicorn),
+    StreamingResponse reads the receive channel in a background task to
+    notice disconnects. That task consumes the `http.request` messages the
+    content generator is waiting for through `Request.stream()`, so the
+    response never completes. This response leaves the receive channel to
+    the request body: a disconnect during the upload ends `Request.stream()`
+    with ClientDisconnect, and a disconnect afterwards fails the next send.
+    """
+    async def __call__(self, scope, receive, send):
+        """
+        Send the response without listening for disconnects.
+
+        Args:
+            scope (Scope): The ASGI connection scope
+            receive (Receive): The ASGI receive channel, used only by the request body
+            send (Send): The ASGI send channel
+
+        Raises:
+            ClientDisconnect: If the client disconnected while the response was sent
+        """
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,91 @@
+"""
+Helpers for benchmarks that run the application in-process.
+
+Importing this module provides defaults for the environment variables the
+application reads at import time, so the benchmarks can run without a
+deployment configuration.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+for name in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT", "DB_NAME"):
+    os.environ.setdefault(name, "unused")
+
+import httpx
+from tortoise import Tortoise
+from main import app
+from db.config import TORTOISE_ORM
+from db.init import init_db
+from ML import training
+from repositories import models_repository
+
+async def start(db_url_env: str):
+    """
+    Initialize a fresh database with a published model.
+
+    The database configured in the environment variable `db_url_env` is
+    used, a temporary SQLite database otherwise. A model trained for a few
+    epochs is published, since the benchmarks measure serving, not accuracy.
+
+    Args:
+        db_url_env (str): Name of the environment variable holding the database URL
+
+    Returns:
+        str: Dialect of the database connection
+    """
+    db_url = os.environ.get(db_url_env)
+    if not db_url:
+        db_url = f"sqlite://{os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')}"
+
+    TORTOISE_ORM["connections"]["default"] = db_url
+    await init_db()
+
+    if await models_repository.get_active_model() is None:
+        result = training.train_model(training.DATASET_PATH, 0.8, 0.0001, 10)
+        params = await models_repository.set_params(weights=result["weights"], bias=result["bias"], x_mean=result["x_mean"], x_std=result["x_std"])
+        model_metrics = await models_repository.set_model_metrics(
+            result["accuracy"], result["precision"], result["f1_score"], result["recall"], result["confusion_matrix"],
+            result["roc_auc"], result["average_precision"], result["roc_curve"], result["pr_curve"],
+        )
+        model = await models_repository.add_model(params, model_metrics, result["solver"], result["iterations"], result["converged"], result["training_seconds"], result["epochs"])
+        await models_repository.promote_model(model.id)
+
+    return Tortoise.get_connection("default").capabilities.dialect
+
+async def stop():
+    """
+    Close the database connections.
+    """
+    await Tortoise.close_connections()
+
+def client():
+    """
+    Create an HTTP client calling the application in-process.
+
+    Returns:
+        httpx.AsyncClient: The client
+    """
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+async def register(client, username: str):
+    """
+    Register a user and log in.
+
+    Args:
+        client (httpx.AsyncClient): The client
+        username (str): Username of the new user
+
+    Returns:
+        dict: Authorization header with the access token
+    """
+    await client.post("/api/auth/register", json={"username": username, "first_name": "First", "last_name": "Last", "password": "password"})
+    response = await client.post("/api/auth/login", json={"username": username, "password": "password"})
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+PREDICTION = {
+    "no_of_dependents": 2, "education": True, "self_employed": False, "income_amount": 9600000,
+    "loan_amont": 29900000, "loan_amont_term": 12, "cibil_score": 778, "residential_assets_value": 2400000,
+    "commercial_assets_value": 17600000, "luxury_assets_value": 22700000, "bank_asset_value": 8000000,
+    "title": "Benchmark",
+}
@@ -0,0 +1,139 @@
+"""
+Compare the throughput of the authentication middleware implementations.
+
+Drives a minimal application directly through ASGI (no network or server)
+with authenticated requests, once behind the previous `BaseHTTPMiddleware`
+implementation that verifies the token signature on every request, and
+once behind the current plain ASGI middleware with the verified token cache.
+
+Run from the backend directory:
+
+    JWT_SECRET=... python -m benchmarks.auth_middleware
+"""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from fastapi import FastAPI, Request
+from jose import JWTError
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from core import security
+from middlewares.auth_middleware import AuthMiddleware, EXCLUDE_PATHS
+
+REQUESTS = 20000
+CONCURRENCY = 50
+
+class BaseHTTPAuthMiddleware(BaseHTTPMiddleware):
+    """
+    The previous implementation of the authentication middleware, kept as the baseline.
+    """
+    async def dispatch(self, request: Request, call_next):
+        """
+        Validate the token of the request with a full signature check.
+
+        Args:
+            request (Request): The incoming HTTP request
+            call_next: The next middleware or endpoint to call
+
+        Returns:
+            Response: The response from the next handler or an error response
+        """
+        if request.url.path in EXCLUDE_PATHS:
+            return await call_next(request)
+
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+
+        token = auth_header.split(" ")[1]
+        try:
+            request.state.user_id = security.decode_access_token(token)
+        except JWTError:
+            return JSONResponse(status_code=401, content={"detail": "Invalid token"})
+
+        return await call_next(request)
+
+def build_app(middleware):
+    """
+    Build an application with a single authenticated endpoint.
+
+    Args:
+        middleware (type): The authentication middleware class
+
+    Returns:
+        FastAPI: The application
+    """
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/api/users/me")
+    async def me(request: Request):
+        return {"id": request.state.user_id}
+
+    return app
+
+async def call(app, headers):
+    """
+    Send one GET request through the application.
+
+    Args:
+        app (ASGIApp): The application
+        headers (list[tuple[bytes, bytes]]): Raw request headers
+
+    Returns:
+        int: The response status code
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/users/me", "raw_path": b"/api/users/me", "root_path": "",
+        "query_string": b"", "headers": headers, "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+async def measure(app, token):
+    """
+    Measure the request throughput of an application.
+
+    Args:
+        app (ASGIApp): The application
+        token (str): Access token sent with every request
+
+    Returns:
+        float: Requests per second
+    """
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    assert await call(app, headers) == 200
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS // CONCURRENCY):
+        statuses = await asyncio.gather(*(call(app, headers) for _ in range(CONCURRENCY)))
+        assert all(status == 200 for status in statuses)
+    return REQUESTS / (time.perf_counter() - start)
+
+async def main():
+    token = security.create_access_token({"id": 1})
+
+    before = await measure(build_app(BaseHTTPAuthMiddleware), token)
+    after = await measure(build_app(AuthMiddleware), token)
+
+    print(f"{'middleware':<40}{'req/s':>12}")
+    print(f"{'BaseHTTPMiddleware, no token cache':<40}{before:>12.0f}")
+    print(f"{'ASGI, verified token cache':<40}{after:>12.0f}")
+    print(f"speedup: {after / before:.2f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+import logging
+import time
+import numpy as np
+import pandas as pd
+from ML.load_prediction_logistic_regression import LoanPrediction
+
+DATASET_PATH = "./training-dataset/loan_approval_dataset.csv"
+
+def load_features(csv_path=DATASET_PATH):
+    """
+    Load the raw (not normalized) features of a dataset in the training layout.
+
+    Args:
+        csv_path (str): Path to the CSV file
+
+    Returns:
+        ndarray: Feature matrix in the order the model was trained on
+    """
+    df = pd.read_csv(csv_path)
+    df.columns = df.columns.str.strip()
+    df['education'] = df['education'].str.strip().str.lower().map({'graduate': 1, 'not graduate': 0})
+    df['self_employed'] = df['self_employed'].str.strip().str.lower().map({'yes': 1, 'no': 0})
+    return df.drop(columns=['loan_id', 'loan_status']).values.astype(float)
+
+def trained_model(epochs=1000, learning_rate=0.0001, seed=0):
+    """
+    Train a model on the bundled dataset with the default hyperparameters.
+
+    Args:
+        epochs (int): Number of training iterations
+        learning_rate (float): Learning rate for gradient descent
+        seed (int): Seed for the train/test split
+
+    Returns:
+        LoanPrediction: The trained model
+    """
+    np.random.seed(seed)
+    model = LoanPrediction(DATASET_PATH, learning_rate=learning_rate, epochs=epochs)
+    model.train()
+    return model
+
+def timeit(fn, repeat=5):
+    """
+    Measure the best wall time of a function over several runs.
+
+    Args:
+        fn (callable): Function to measure
+        repeat (int): Number of runs
+
+    Returns:
+        float: Best wall time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+class QueryRecorder(logging.Handler):
+    """
+    Logging handler collecting the queries logged by the database client.
+
+    Attributes:
+        statements (tuple[str]|None): Statement keywords to record, None records every query
+        queries (list[tuple[str, list]]): Recorded SQL and its parameter values
+    """
+    def __init__(self, statements=None):
+        """
+        Initialize an empty recorder.
+
+        Args:
+            statements (tuple[str]|None): Statement keywords to record, e.g. ("SELECT",) (default: all)
+        """
+        super().__init__(logging.DEBUG)
+        self.statements = statements
+        self.queries = []
+
+    def emit(self, record):
+        """
+        Record a logged query.
+
+        Args:
+            record (LogRecord): The log record of the database client
+        """
+        if isinstance(record.args, tuple) and len(record.args) == 2:
+            query, values = record.args
+            if isinstance(query, str) and (self.statements is None or query.lstrip().upper().startswith(self.statements)):
+                self.queries.append((query, list(values or [])))
+
+    def __enter__(self):
+        """
+        Start recording the queries of the database client.
+
+        Returns:
+            QueryRecorder: The recorder
+        """
+        client_log = logging.getLogger("tortoise.db_client")
+        client_log.setLevel(logging.DEBUG)
+        client_log.addHandler(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Stop recording the queries of the database client.
+        """
+        logging.getLogger("tortoise.db_client").removeHandler(self)
@@ -0,0 +1,37 @@
+"""
+Compare LoanPrediction.predict with the compiled inference form.
+
+Checks that both give the same decision for every row of the training
+dataset and reports the per-row and batch scoring cost.
+
+Run from the backend directory:
+    python -m benchmarks.compiled_inference
+"""
+import numpy as np
+from ML.compiled_prediction import CompiledLoanPrediction
+from benchmarks.common import load_features, trained_model, timeit
+
+def main():
+    model = trained_model()
+    compiled = CompiledLoanPrediction.from_model(model)
+    X = load_features()
+
+    with np.errstate(over="ignore"):
+        expected = model.predict(X)
+        mismatches = int(np.sum(expected != compiled.predict(X)))
+        print(f"parity: {len(X) - mismatches}/{len(X)} rows identical")
+
+        rows = [X[i:i + 1] for i in range(len(X))]
+        single = timeit(lambda: [model.predict(row) for row in rows]) / len(X)
+        single_compiled = timeit(lambda: [compiled.predict(row) for row in rows]) / len(X)
+        batch = timeit(lambda: model.predict(X)) / len(X)
+        batch_compiled = timeit(lambda: compiled.predict(X)) / len(X)
+
+    print(f"single row: {single * 1e6:.2f} us -> {single_compiled * 1e6:.2f} us ({single / single_compiled:.1f}x)")
+    print(f"batch:      {batch * 1e9:.1f} ns/row -> {batch_compiled * 1e9:.1f} ns/row ({batch / batch_compiled:.1f}x)")
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
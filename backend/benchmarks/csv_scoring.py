@@ -0,0 +1,174 @@
+"""
+Check the streaming CSV scoring endpoint.
+
+Uploads the training dataset, repeated CSV_SCORING_COPIES times (default
+3), to POST /api/predictions/predict/csv in-process, in 64 KiB body
+messages like a real server delivers them: through httpx's ASGI transport
+and through a minimal ASGI server reporting spec versions 2.3 (as
+uvicorn does) and 2.4. Then uploads a file whose quoted values contain
+line breaks. Reports the rows and throughput of every upload and exits
+with status 1 when an upload doesn't complete within TIMEOUT seconds,
+a row is missing or fails to parse, or a prediction differs from scoring
+the rows directly.
+
+Run from the backend directory:
+
+    python -m benchmarks.csv_scoring
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+from benchmarks.app_setup import app, start, stop, client, register
+from benchmarks.common import DATASET_PATH, load_features
+from services import model_service
+
+COPIES = int(os.environ.get("CSV_SCORING_COPIES", "3"))
+MESSAGE_BYTES = 64 * 1024
+TIMEOUT = 60
+URL = "/api/predictions/predict/csv"
+QUOTED_CSV = (
+    'loan_id,no_of_dependents,education,self_employed,income_annum,loan_amount,loan_term,cibil_score,'
+    'residential_assets_value,commercial_assets_value,luxury_assets_value,bank_asset_value\n'
+    '"first\nline break",2," Graduate", No,9600000,29900000,12,778,2400000,17600000,22700000,8000000\n'
+    '"second ""quoted""\r\nline break",0," Not Graduate"," Yes",4100000,12200000,8,417,2700000,2200000,8800000,3300000\n'
+    '3,3," Graduate", No,9100000,29700000,20,506,7100000,4500000,33300000,12800000\n'
+)
+
+def body_messages(body: bytes):
+    """
+    Split a request body into chunks of MESSAGE_BYTES.
+
+    Args:
+        body (bytes): The request body
+
+    Returns:
+        list[bytes]: The chunks
+    """
+    return [body[i:i + MESSAGE_BYTES] for i in range(0, len(body), MESSAGE_BYTES)]
+
+async def upload_httpx(http, headers, body: bytes):
+    """
+    Upload a CSV through httpx's ASGI transport.
+
+    Args:
+        http (httpx.AsyncClient): The client
+        headers (dict): Request headers
+        body (bytes): The CSV file
+
+    Returns:
+        tuple[int, str]: Status code and response body
+    """
+    async def chunks():
+        for chunk in body_messages(body):
+            yield chunk
+
+    response = await http.post(URL, headers=headers, content=chunks())
+    return response.status_code, response.text
+
+async def upload_asgi(spec_version: str, headers: dict, body: bytes):
+    """
+    Upload a CSV through a minimal ASGI server reporting a spec version.
+
+    The body is delivered in MESSAGE_BYTES messages, and after the last one
+    `receive` blocks until the response is complete, like a connection that
+    stays open.
+
+    Args:
+        spec_version (str): ASGI spec version of the scope, e.g. "2.3"
+        headers (dict): Request headers
+        body (bytes): The CSV file
+
+    Returns:
+        tuple[int, str]: Status code and response body
+    """
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in body_messages(body)]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+    finished = asyncio.Event()
+    status, parts = None, []
+
+    async def receive():
+        if messages:
+            message = messages.pop(0)
+            await asyncio.sleep(0)
+            return message
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            parts.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": spec_version}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": URL, "raw_path": URL.encode(), "query_string": b"",
+        "root_path": "", "server": ("test", 80), "client": ("127.0.0.1", 1234),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+                   + [(b"host", urlsplit("http://test").netloc.encode()), (b"content-type", b"text/csv")],
+    }
+    await app(scope, receive, send)
+    return status, b"".join(parts).decode()
+
+async def main():
+    """
+    Upload the CSV files and verify the results.
+
+    Returns:
+        int: Exit status, 1 if any check failed
+    """
+    await start("CSV_SCORING_DB_URL")
+    failures = []
+
+    with open(DATASET_PATH, "rb") as file:
+        header, *rows = file.read().splitlines(keepends=True)
+    body = header + b"".join(rows) * COPIES
+    model = await model_service.get_loaded_model()
+    expected = [bool(value) for value in model.predict(load_features())[:, 0].tolist()] * COPIES
+
+    async with client() as http:
+        headers = await register(http, "csv")
+        uploads = {
+            "httpx ASGITransport": lambda data: upload_httpx(http, headers, data),
+            "ASGI spec 2.3": lambda data: upload_asgi("2.3", headers, data),
+            "ASGI spec 2.4": lambda data: upload_asgi("2.4", headers, data),
+        }
+
+        print(f"{len(rows) * COPIES} rows, {len(body) / 2 ** 20:.1f} MiB in {len(body_messages(body))} messages")
+        print(f"{'upload':<22}{'status':>8}{'rows':>8}{'rows/s':>10}")
+        for name, upload in uploads.items():
+            started = time.perf_counter()
+            try:
+                status, text = await asyncio.wait_for(upload(body), TIMEOUT)
+                elapsed = time.perf_counter() - started
+                results = [json.loads(line) for line in text.splitlines()]
+                print(f"{name:<22}{status:>8}{len(results):>8}{len(results) / elapsed:>10.0f}")
+                if status != 200 or len(results) != len(expected):
+                    failures.append(f"{name}: status {status}, {len(results)} of {len(expected)} rows")
+                elif [result.get("prediction") for result in results] != expected:
+                    failures.append(f"{name}: predictions differ from scoring the rows directly")
+
+                status, text = await asyncio.wait_for(upload(QUOTED_CSV.encode()), TIMEOUT)
+                results = [json.loads(line) for line in text.splitlines()]
+                loan_ids = [result.get("loan_id") for result in results]
+                if loan_ids != ["first\nline break", 'second "quoted"\nline break', "3"] or any("error" in result for result in results):
+                    failures.append(f"{name}: quoted line breaks parsed as {results}")
+            except asyncio.TimeoutError:
+                failures.append(f"{name}: no response within {TIMEOUT} s")
+            except Exception as e:
+                failures.append(f"{name}: {type(e).__name__}: {e}")
+
+    await stop()
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,118 @@
+"""
+Compare the single pass evaluation with the previous per-metric evaluation.
+
+Trains a model on the training dataset and evaluates it on the test set
+twice: the way `train_model` used to, with every metric scoring the test
+set on its own (seven scoring passes), and with `LoanPrediction.evaluate`.
+Checks that both give the same metrics and that the ROC-AUC equals the
+pairwise (Mann-Whitney) definition, then reports the evaluation time on
+the test set and on a synthetic test set of a million rows.
+
+Run from the backend directory:
+
+    python -m benchmarks.evaluation
+"""
+import sys
+import numpy as np
+from ML import evaluation, training
+from ML.load_prediction_logistic_regression import LoanPrediction
+from benchmarks.common import timeit
+
+EPOCHS = 200
+LARGE_ROWS = 1_000_000
+
+def previous_evaluation(model):
+    """
+    The previous evaluation, kept as the baseline.
+
+    Args:
+        model (LoanPrediction): The trained model
+
+    Returns:
+        dict: accuracy, precision, recall, f1_score and confusion_matrix
+    """
+    def confusion():
+        y_pred = model.predict(model.X_test).astype(int)
+        y_true = model.y_test.astype(int)
+        return (
+            np.sum((y_pred == 1) & (y_true == 1)), np.sum((y_pred == 0) & (y_true == 0)),
+            np.sum((y_pred == 1) & (y_true == 0)), np.sum((y_pred == 0) & (y_true == 1)),
+        )
+
+    def precision():
+        tp, _, fp, _ = confusion()
+        return tp / (tp + fp + 1e-8)
+
+    def recall():
+        tp, _, _, fn = confusion()
+        return tp / (tp + fn + 1e-8)
+
+    accuracy = np.mean(model.predict(model.X_test) == model.y_test)
+    p, r = precision(), recall()
+    tp, tn, fp, fn = confusion()
+    return {
+        "accuracy": accuracy,
+        "precision": p,
+        "recall": r,
+        "f1_score": 2 * precision() * recall() / (precision() + recall() + 1e-8),
+        "confusion_matrix": np.array([[tn, fp], [fn, tp]]),
+    }
+
+def pairwise_auc(y_true, probabilities):
+    """
+    ROC-AUC as the probability that a random positive is scored above a random negative.
+
+    Args:
+        y_true (ndarray): True labels
+        probabilities (ndarray): Predicted probabilities
+
+    Returns:
+        float: The ROC-AUC, counting ties as one half
+    """
+    y_true = y_true.ravel().astype(bool)
+    probabilities = probabilities.ravel()
+    positives, negatives = probabilities[y_true], probabilities[~y_true]
+    greater = (positives[:, None] > negatives[None, :]).sum()
+    ties = (positives[:, None] == negatives[None, :]).sum()
+    return (greater + ties / 2) / (len(positives) * len(negatives))
+
+def main():
+    """
+    Check the single pass evaluation and time it against the previous one.
+
+    Returns:
+        int: Exit status, 1 if the evaluations disagree
+    """
+    np.random.seed(0)
+    model = LoanPrediction(training.DATASET_PATH, train_size=0.8, learning_rate=0.01, epochs=EPOCHS)
+    model.train()
+
+    previous = previous_evaluation(model)
+    current = model.evaluate()
+    failures = [
+        name for name in ("accuracy", "precision", "recall", "f1_score")
+        if not np.isclose(previous[name], current[name], atol=1e-6)
+    ]
+    if not np.array_equal(previous["confusion_matrix"], current["confusion_matrix"]):
+        failures.append("confusion_matrix")
+    expected_auc = pairwise_auc(model.y_test, model.predict_proba(model.X_test))
+    if not np.isclose(expected_auc, current["roc_auc"]):
+        failures.append("roc_auc")
+
+    print(f"test set: {len(model.y_test)} rows, accuracy {current['accuracy']:.4f}, f1 {current['f1_score']:.4f}, "
+          f"roc_auc {current['roc_auc']:.4f} (pairwise {expected_auc:.4f}), average precision {current['average_precision']:.4f}")
+
+    rng = np.random.default_rng(0)
+    large_y = rng.integers(0, 2, LARGE_ROWS)
+    large_probabilities = 1 / (1 + np.exp(-(large_y * 1.5 + rng.normal(size=LARGE_ROWS))))
+
+    print(f"{'evaluation':<36}{'test set ms':>12}{'1M rows ms':>12}")
+    print(f"{'previous, one pass per metric':<36}{timeit(lambda: previous_evaluation(model)) * 1000:>12.3f}{'-':>12}")
+    print(f"{'single pass with curves':<36}{timeit(model.evaluate) * 1000:>12.3f}{timeit(lambda: evaluation.evaluate(large_y, large_probabilities), repeat=3) * 1000:>12.1f}")
+
+    for failure in failures:
+        print(f"FAIL {failure} differs")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
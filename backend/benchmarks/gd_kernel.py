@@ -0,0 +1,101 @@
+"""
+Compare the throughput and memory of the gradient descent kernel with the previous loop.
+
+Each variant runs in a fresh process on the same synthetic training set
+(GD_ROWS rows, default 2000000, and 11 standardized features): the
+previous training loop, replayed inline, which allocates the logits,
+probabilities, errors and gradient every epoch, and
+`ML.gradient_descent.GradientDescentKernel` in float64 and float32.
+Reports epochs per second, the peak resident memory of the process and
+how much of it training added on top of the data, and the largest weight
+difference from the previous loop.
+
+Run from the backend directory:
+
+    python -m benchmarks.gd_kernel
+"""
+import multiprocessing
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ML.gradient_descent import GradientDescentKernel
+
+ROWS = int(os.environ.get("GD_ROWS", "2000000"))
+FEATURES = 11
+EPOCHS = 20
+LEARNING_RATE = 0.1
+
+def previous_loop(X, y, epochs, learning_rate):
+    """
+    The previous training loop, kept as the baseline.
+
+    Args:
+        X (ndarray): Training features
+        y (ndarray): Training labels of shape (n_rows, 1)
+        epochs (int): Number of epochs
+        learning_rate (float): Learning rate
+
+    Returns:
+        tuple[ndarray, float]: The trained weights and bias
+    """
+    weights = np.zeros((X.shape[1], 1))
+    bias = 0
+    for _ in range(epochs):
+        z = np.dot(X, weights) + bias
+        predictions = 1 / (1 + np.exp(-z))
+        error = predictions - y
+        dw = np.dot(X.T, error) / len(y)
+        db = np.sum(error) / len(y)
+        weights -= learning_rate * dw
+        bias -= learning_rate * db
+    return weights, bias
+
+def peak_rss_mib():
+    """
+    Get the peak resident memory of the process.
+
+    Returns:
+        float: Peak RSS in MiB
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run(variant):
+    """
+    Train on the synthetic dataset and measure the process.
+
+    Args:
+        variant (str): "previous", "float64" or "float32"
+
+    Returns:
+        tuple[float, float, float, ndarray]: Epochs per second, peak RSS in MiB,
+                                             RSS added by training in MiB and the weights
+    """
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((ROWS, FEATURES))
+    y = (X @ rng.standard_normal(FEATURES) + rng.standard_normal(ROWS) > 0).astype(float).reshape(-1, 1)
+    data_rss = peak_rss_mib()
+
+    start = time.perf_counter()
+    if variant == "previous":
+        weights, _ = previous_loop(X, y, EPOCHS, LEARNING_RATE)
+    else:
+        kernel = GradientDescentKernel(X, y, getattr(np, variant))
+        weights, _ = kernel.run(np.zeros(FEATURES), 0.0, LEARNING_RATE, EPOCHS)
+    elapsed = time.perf_counter() - start
+
+    return EPOCHS / elapsed, peak_rss_mib(), peak_rss_mib() - data_rss, weights
+
+def main():
+    print(f"{ROWS} rows x {FEATURES} features ({ROWS * FEATURES * 8 / 2 ** 20:.0f} MiB float64), {EPOCHS} epochs")
+    print(f"{'loop':<22}{'epochs/s':>10}{'peak RSS MiB':>14}{'training MiB':>14}{'max |dw|':>10}")
+    baseline = None
+    for variant, name in (("previous", "previous loop"), ("float64", "kernel float64"), ("float32", "kernel float32")):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            epochs_per_second, peak_rss, training_rss, weights = executor.submit(run, variant).result()
+        baseline = weights if baseline is None else baseline
+        print(f"{name:<22}{epochs_per_second:>10.1f}{peak_rss:>14.0f}{training_rss:>14.0f}{np.max(np.abs(weights - baseline)):>10.1e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Check and measure idempotency keys on the prediction endpoint.
+
+Calls POST /api/predictions/predict in-process through ASGI and simulates
+client retries: bursts of concurrent requests sharing an idempotency key,
+followed by sequential retries of the same keys. Reports the prediction
+rows written and the latency of first requests and retries, and exits
+with status 1 when a key produced more than one prediction, a retry got
+a different response, or a key reused for a different request wasn't
+rejected.
+
+Runs against a temporary SQLite database by default. Set
+IDEMPOTENCY_DB_URL (e.g. to a local, empty postgres:// database) to
+measure with real round trips.
+
+Run from the backend directory:
+
+    python -m benchmarks.idempotency
+"""
+import asyncio
+import sys
+import time
+import uuid
+import numpy as np
+from benchmarks.app_setup import start, stop, client, register, PREDICTION
+from models import predictions_model
+
+KEYS = 50
+CONCURRENT_DUPLICATES = 10
+RETRIES = 5
+
+async def timed_post(http, headers, json):
+    """
+    Send a prediction request and measure its latency.
+
+    Args:
+        http (httpx.AsyncClient): The client
+        headers (dict): Request headers
+        json (dict): Request body
+
+    Returns:
+        tuple[httpx.Response, float]: The response and its latency in milliseconds
+    """
+    start = time.perf_counter()
+    response = await http.post("/api/predictions/predict", headers=headers, json=json)
+    return response, (time.perf_counter() - start) * 1000
+
+async def main():
+    """
+    Send duplicate requests and verify each key produced a single prediction.
+
+    Returns:
+        int: Exit status, 1 if any check failed
+    """
+    await start("IDEMPOTENCY_DB_URL")
+    failures = []
+
+    async with client() as http:
+        auth = await register(http, "idempotency")
+        await http.post("/api/predictions/predict", headers=auth, json=PREDICTION)
+        rows_before = await predictions_model.Predictions.all().count()
+
+        burst_latencies, retry_latencies, replayed = [], [], 0
+        for _ in range(KEYS):
+            headers = dict(auth, **{"Idempotency-Key": str(uuid.uuid4())})
+            results = await asyncio.gather(*(timed_post(http, headers, PREDICTION) for _ in range(CONCURRENT_DUPLICATES)))
+            results += [await timed_post(http, headers, PREDICTION) for _ in range(RETRIES)]
+
+            bodies = {response.text for response, _ in results}
+            if len(bodies) != 1 or any(response.status_code != 200 for response, _ in results):
+                failures.append(f"key {headers['Idempotency-Key']} got {len(bodies)} different responses")
+            replayed += sum(response.headers.get("Idempotent-Replayed") == "true" for response, _ in results)
+            burst_latencies.extend(latency for _, latency in results[:CONCURRENT_DUPLICATES])
+            retry_latencies.extend(latency for _, latency in results[CONCURRENT_DUPLICATES:])
+
+        rows_written = await predictions_model.Predictions.all().count() - rows_before
+
+        reused = dict(auth, **{"Idempotency-Key": headers["Idempotency-Key"]})
+        response = await http.post("/api/predictions/predict", headers=reused, json=dict(PREDICTION, title="Different"))
+        if response.status_code != 422:
+            failures.append(f"reusing a key for a different request returned {response.status_code}")
+
+    await stop()
+
+    if rows_written != KEYS:
+        failures.append(f"{rows_written} predictions written for {KEYS} keys")
+
+    print(f"{KEYS} keys, {KEYS * (CONCURRENT_DUPLICATES + RETRIES)} requests, {rows_written} predictions written, {replayed} replayed")
+    print(f"{'requests':<28}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, latencies in (("concurrent duplicates", np.array(burst_latencies)), ("sequential retries", np.array(retry_latencies))):
+        print(f"{name:<28}{latencies.mean():>10.2f}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
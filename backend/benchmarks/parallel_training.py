@@ -0,0 +1,66 @@
+"""
+Measure the scaling of data-parallel gradient descent and check it against single-process training.
+
+Trains the same synthetic training set (PARALLEL_ROWS rows, default
+2000000, and 11 standardized features) with
+`ML.gradient_descent.GradientDescentKernel` in this process and with
+`ML.parallel_training.train_parallel` on 1, 2, 4, ... up to
+PARALLEL_WORKERS processes (default: the number of CPUs). Reports epochs
+per second, including starting the workers and copying the data into
+shared memory, the speedup over the single-process kernel and the largest
+weight difference from it. Exits with status 1 when a difference exceeds
+the tolerance.
+
+Run from the backend directory:
+
+    python -m benchmarks.parallel_training
+"""
+import os
+import sys
+import time
+import numpy as np
+from ML.gradient_descent import GradientDescentKernel
+from ML.parallel_training import train_parallel
+
+ROWS = int(os.environ.get("PARALLEL_ROWS", "2000000"))
+MAX_WORKERS = int(os.environ.get("PARALLEL_WORKERS", str(os.cpu_count() or 1)))
+FEATURES = 11
+EPOCHS = 50
+LEARNING_RATE = 0.1
+TOLERANCE = 1e-9
+
+def main():
+    """
+    Train with every worker count and compare the results.
+
+    Returns:
+        int: Exit status, 1 if a result differs from single-process training
+    """
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((ROWS, FEATURES))
+    y = (X @ rng.standard_normal(FEATURES) + rng.standard_normal(ROWS) > 0).astype(float)
+
+    start = time.perf_counter()
+    baseline, baseline_bias = GradientDescentKernel(X, y).run(np.zeros(FEATURES), 0.0, LEARNING_RATE, EPOCHS)
+    baseline_rate = EPOCHS / (time.perf_counter() - start)
+
+    print(f"{ROWS} rows x {FEATURES} features, {EPOCHS} epochs, {os.cpu_count()} CPUs")
+    print(f"{'workers':<10}{'epochs/s':>10}{'speedup':>9}{'max |dw|':>10}")
+    print(f"{'kernel':<10}{baseline_rate:>10.1f}{1:>9.2f}{0:>10.1e}")
+
+    status = 0
+    workers = 1
+    while workers <= MAX_WORKERS:
+        start = time.perf_counter()
+        weights, bias = train_parallel(X, y, np.zeros(FEATURES), 0.0, LEARNING_RATE, EPOCHS, workers)
+        rate = EPOCHS / (time.perf_counter() - start)
+        difference = max(np.max(np.abs(weights - baseline)), abs(bias - baseline_bias))
+        print(f"{workers:<10}{rate:>10.1f}{rate / baseline_rate:>9.2f}{difference:>10.1e}")
+        if difference > TOLERANCE:
+            print(f"FAIL {workers} workers differ from single-process training by {difference:.1e}")
+            status = 1
+        workers *= 2
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
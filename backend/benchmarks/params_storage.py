@@ -0,0 +1,51 @@
+"""
+Compare the stored size and load time of model parameters as JSON and as
+binary blobs.
+
+For growing feature counts, encodes random weights, means and standard
+deviations the way `set_params` used to (JSON text) and the way it does
+now (`ML.array_blob`), and measures turning the stored values back into
+the numpy arrays the model is built from.
+
+Run from the backend directory:
+
+    python -m benchmarks.params_storage
+"""
+import json
+import numpy as np
+from ML.array_blob import encode_array, decode_array
+from benchmarks.common import timeit
+
+FEATURE_COUNTS = (11, 1_000, 100_000)
+
+def main():
+    rng = np.random.default_rng(0)
+
+    print(f"{'features':>9}{'json bytes':>12}{'f8 bytes':>10}{'f4 bytes':>10}{'json load us':>14}{'blob load us':>14}{'speedup':>9}")
+    for n_features in FEATURE_COUNTS:
+        weights = rng.normal(size=(n_features, 1))
+        x_mean = rng.normal(size=n_features)
+        x_std = rng.uniform(0.5, 2, size=n_features)
+
+        stored_json = [json.dumps(weights.tolist()), json.dumps(x_mean.tolist()), json.dumps(x_std.tolist())]
+        stored_f8 = [encode_array(array) for array in (weights, x_mean, x_std)]
+        stored_f4 = [encode_array(array, "<f4") for array in (weights, x_mean, x_std)]
+
+        def load_json():
+            return [np.asarray(json.loads(value), dtype=float) for value in stored_json]
+
+        def load_blob():
+            return [decode_array(value) for value in stored_f8]
+
+        for loaded_json, loaded_blob in zip(load_json(), load_blob()):
+            assert np.array_equal(loaded_json, loaded_blob)
+
+        json_load = timeit(load_json, repeat=20)
+        blob_load = timeit(load_blob, repeat=20)
+        print(
+            f"{n_features:>9}{sum(map(len, stored_json)):>12}{sum(map(len, stored_f8)):>10}{sum(map(len, stored_f4)):>10}"
+            f"{json_load * 1e6:>14.1f}{blob_load * 1e6:>14.1f}{json_load / blob_load:>8.0f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measure the prediction cache on resubmitted applications.
+
+Sends a workload where every application is submitted several times, the
+way partner integrations retry and re-quote, through
+`prediction_service.make_prediction` with the cache disabled and enabled.
+Reports the latency, the queries per prediction, the number of stored
+input rows and the cache hit ratio, and checks that every decision
+matches the uncached one.
+
+Runs against a temporary SQLite database by default. Set
+PREDICTION_CACHE_DB_URL (e.g. to a local, empty postgres:// database) to
+measure with real round trips.
+
+Run from the backend directory:
+
+    python -m benchmarks.prediction_cache
+"""
+import os
+
+os.environ["PREDICTION_CACHE"] = "1"
+
+import asyncio
+import random
+import time
+import numpy as np
+from benchmarks.app_setup import start, stop, PREDICTION
+from benchmarks.common import QueryRecorder
+from models import role_model, user_model, predictions_model
+from repositories.prediction_cache import prediction_cache, hits_counter, misses_counter, PREDICTION_CACHE_SIZE
+from schemas import prediction_schema
+from services import prediction_service
+
+APPLICATIONS = 100
+SUBMISSIONS = 5
+
+async def run(user_id, workload, cache_size):
+    """
+    Submit a workload of applications.
+
+    Args:
+        user_id (int): The ID of the user making the predictions
+        workload (list[prediction_schema.PredictionCreate]): The applications in submission order
+        cache_size (int): Size of the prediction cache, 0 disables it
+
+    Returns:
+        tuple[list[bool], ndarray, float, int]: Decisions, latencies in milliseconds,
+                                                queries per prediction and stored input rows
+    """
+    prediction_cache.clear()
+    prediction_cache.max_size = cache_size
+    inputs_before = await predictions_model.PredictionInputs.all().count()
+
+    decisions, latencies = [], []
+    with QueryRecorder() as recorder:
+        for prediction_data in workload:
+            start = time.perf_counter()
+            prediction = await prediction_service.make_prediction(user_id, prediction_data)
+            latencies.append((time.perf_counter() - start) * 1000)
+            decisions.append(prediction.prediction)
+
+    stored_inputs = await predictions_model.PredictionInputs.all().count() - inputs_before
+    return decisions, np.array(latencies), len(recorder.queries) / len(workload), stored_inputs
+
+async def main():
+    await start("PREDICTION_CACHE_DB_URL")
+    role = await role_model.Role.get(role_name="user")
+    user, _ = await user_model.User.get_or_create(username="benchmark", defaults={"first_name": "First", "last_name": "Last", "password_hash": "unused", "role": role})
+
+    rng = random.Random(0)
+    applications = [
+        prediction_schema.PredictionCreate(**dict(PREDICTION, cibil_score=rng.randint(300, 900), loan_amont=rng.randint(1, 40) * 500000))
+        for _ in range(APPLICATIONS)
+    ]
+    workload = [application for application in applications for _ in range(SUBMISSIONS)]
+    rng.shuffle(workload)
+
+    await prediction_service.make_prediction(user.id, workload[0])
+    uncached, uncached_latencies, uncached_queries, uncached_inputs = await run(user.id, workload, 0)
+    hits, misses = hits_counter.value, misses_counter.value
+    cached, cached_latencies, cached_queries, cached_inputs = await run(user.id, workload, PREDICTION_CACHE_SIZE)
+    hit_ratio = (hits_counter.value - hits) / (hits_counter.value - hits + misses_counter.value - misses)
+
+    await stop()
+
+    assert cached == uncached, "cached decisions differ from scored decisions"
+    print(f"{len(workload)} predictions, {APPLICATIONS} distinct applications")
+    print(f"{'cache':<10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'queries':>9}{'input rows':>12}{'hit ratio':>11}")
+    for name, latencies, queries, inputs, ratio in (("disabled", uncached_latencies, uncached_queries, uncached_inputs, 0.0), ("enabled", cached_latencies, cached_queries, cached_inputs, hit_ratio)):
+        print(f"{name:<10}{latencies.mean():>10.2f}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}{queries:>9.1f}{inputs:>12}{ratio:>11.2f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
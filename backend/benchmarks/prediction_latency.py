@@ -0,0 +1,136 @@
+"""
+Compare the latency of the single prediction write path before and after
+collapsing it into one round trip.
+
+The previous path is replayed inline: it loads the user, inserts the input
+row, loads the model and inserts the result row, one await after another
+and outside of a transaction. The current path is
+`prediction_service.make_prediction`. Both are called directly, sequentially
+and with concurrent callers, and the latency percentiles and the number
+of queries per prediction are reported. Exits with status 1 when the
+current path stores different rows than the previous one, or returns
+IDs that don't match the stored rows.
+
+Runs against a temporary SQLite database by default, where a query costs
+no network round trip. Set PREDICTION_LATENCY_DB_URL (e.g. to a local,
+empty postgres:// database) to measure with real round trips.
+
+Run from the backend directory:
+
+    python -m benchmarks.prediction_latency
+"""
+import asyncio
+import sys
+import time
+import numpy as np
+from benchmarks.app_setup import start, stop, PREDICTION
+from benchmarks.common import QueryRecorder
+from models import role_model, user_model, predictions_model
+from repositories import prediction_repository
+from schemas import prediction_schema
+from services import model_service, prediction_service
+
+REQUESTS = 500
+CONCURRENCY = 20
+
+async def serial_make_prediction(user_id: int, prediction_data: prediction_schema.PredictionCreate):
+    """
+    The previous prediction write path, kept as the baseline.
+
+    Args:
+        user_id (int): The ID of the user making the prediction request
+        prediction_data (prediction_schema.PredictionCreate): Input data for the prediction
+
+    Returns:
+        Predictions: The created prediction record
+    """
+    user = await user_model.User.all().select_related("role").get(id=user_id)
+    prediction_input = prediction_repository._prediction_inputs(prediction_data)
+    await prediction_input.save()
+    model = await model_service.get_loaded_model()
+    prediction = model.predict_one(prediction_service._to_features(prediction_data))
+    return await predictions_model.Predictions.create(prediction=prediction, user=user, prediction_inputs=prediction_input, title=prediction_data.title)
+
+async def compare_paths(user_id: int, prediction_data: prediction_schema.PredictionCreate):
+    """
+    Check that the current write path stores the same rows as the previous one.
+
+    Args:
+        user_id (int): The ID of the user making the predictions
+        prediction_data (prediction_schema.PredictionCreate): Input data for the predictions
+
+    Returns:
+        list[str]: Description of every difference
+    """
+    returned = {
+        "previous": await serial_make_prediction(user_id, prediction_data),
+        "current": await prediction_service.make_prediction(user_id, prediction_data),
+    }
+    stored = {}
+    differences = []
+    for name, record in returned.items():
+        row = await predictions_model.Predictions.get(id=record.pk).select_related("prediction_inputs")
+        if row.prediction_inputs_id != record.prediction_inputs.pk or row.user_id != user_id or row.created_at is None:
+            differences.append(f"{name} path: returned prediction {record.pk} with input {record.prediction_inputs.pk}, "
+                               f"stored input {row.prediction_inputs_id}, user {row.user_id}, created at {row.created_at}")
+        stored[name] = (
+            {field: getattr(row, field) for field in ("prediction", "title")},
+            {field: getattr(row.prediction_inputs, field) for field in predictions_model.PredictionInputs._meta.db_fields if field != "id"},
+        )
+
+    if stored["previous"] != stored["current"]:
+        differences.append(f"stored rows differ: previous {stored['previous']}, current {stored['current']}")
+    return differences
+
+async def measure(make_prediction, user_id, prediction_data, concurrency):
+    """
+    Measure the latency of a prediction write path.
+
+    Args:
+        make_prediction (callable): The write path
+        user_id (int): The ID of the user making the predictions
+        prediction_data (prediction_schema.PredictionCreate): Input data for the predictions
+        concurrency (int): Number of concurrent callers
+
+    Returns:
+        tuple[ndarray, float]: Latencies in milliseconds and queries per prediction
+    """
+    async def timed():
+        start = time.perf_counter()
+        await make_prediction(user_id, prediction_data)
+        return (time.perf_counter() - start) * 1000
+
+    await timed()
+    latencies = []
+    with QueryRecorder() as recorder:
+        for _ in range(REQUESTS // concurrency):
+            latencies.extend(await asyncio.gather(*(timed() for _ in range(concurrency))))
+    return np.array(latencies), len(recorder.queries) / len(latencies)
+
+async def main():
+    """
+    Measure both write paths and compare the rows they store.
+
+    Returns:
+        int: Exit status, 1 if the stored rows differ
+    """
+    await start("PREDICTION_LATENCY_DB_URL")
+    role = await role_model.Role.get(role_name="user")
+    user, _ = await user_model.User.get_or_create(username="benchmark", defaults={"first_name": "First", "last_name": "Last", "password_hash": "unused", "role": role})
+    prediction_data = prediction_schema.PredictionCreate(**PREDICTION)
+
+    print(f"{'path':<34}{'callers':>8}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'queries':>9}")
+    for concurrency in (1, CONCURRENCY):
+        for name, make_prediction in (("serial awaits, no transaction", serial_make_prediction), ("concurrent reads, one write", prediction_service.make_prediction)):
+            latencies, queries = await measure(make_prediction, user.id, prediction_data, concurrency)
+            print(f"{name:<34}{concurrency:>8}{latencies.mean():>10.2f}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}{queries:>9.1f}")
+
+    differences = await compare_paths(user.id, prediction_data)
+    await stop()
+
+    for difference in differences:
+        print(f"FAIL {difference}")
+    return 1 if differences else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,100 @@
+"""
+Count the database round trips of the user and prediction endpoints.
+
+Calls the endpoints in-process through ASGI against a freshly created
+database and counts the queries sent by the database client per request.
+Every endpoint is called once to fill the caches and then measured, so
+the counts are those of a steady-state request. Exits with status 1 when
+an endpoint needs more queries than expected for the database dialect.
+
+Runs against a temporary SQLite database by default. Set QUERY_COUNT_DB_URL
+(e.g. to a local, empty postgres:// database) to count the queries of the
+single statement write paths.
+
+Run from the backend directory:
+
+    python -m benchmarks.query_counts
+"""
+import asyncio
+import sys
+from models import role_model, user_model
+from benchmarks.app_setup import start, stop, client, register, PREDICTION
+from benchmarks.common import QueryRecorder
+
+EXPECTED_QUERIES = {
+    "postgres": {
+        "GET /api/users/get": 0,
+        "PUT /api/users/update": 1,
+        "PUT /api/users/update/{id}": 1,
+        "PUT /api/users/update/role/{id}/{role_id}": 1,
+        "POST /api/predictions/predict": 1,
+    },
+    "sqlite": {
+        "GET /api/users/get": 0,
+        "PUT /api/users/update": 2,
+        "PUT /api/users/update/{id}": 2,
+        "PUT /api/users/update/role/{id}/{role_id}": 3,
+        "POST /api/predictions/predict": 2,
+    },
+}
+
+async def count(http, method, url, headers, json=None):
+    """
+    Call an endpoint twice and count the queries of the second call.
+
+    Args:
+        http (httpx.AsyncClient): The client
+        method (str): HTTP method
+        url (str): URL of the endpoint
+        headers (dict): Request headers
+        json (dict): Request body
+
+    Returns:
+        int: Number of queries of the second call
+    """
+    response = await http.request(method, url, headers=headers, json=json)
+    assert response.status_code == 200, response.text
+
+    with QueryRecorder() as recorder:
+        response = await http.request(method, url, headers=headers, json=json)
+    assert response.status_code == 200, response.text
+    return len(recorder.queries)
+
+async def main():
+    """
+    Count the queries of the endpoints and compare them with the expected counts.
+
+    Returns:
+        int: Exit status, 1 if any endpoint needs more queries than expected
+    """
+    dialect = await start("QUERY_COUNT_DB_URL")
+
+    async with client() as http:
+        await register(http, "admin")
+        user_headers = await register(http, "user")
+        admin_role = await role_model.Role.get(role_name="admin")
+        await user_model.User.filter(username="admin").update(role=admin_role)
+        admin_headers = await register(http, "admin")
+        user = await user_model.User.get(username="user")
+
+        counts = {
+            "GET /api/users/get": await count(http, "GET", "/api/users/get", user_headers),
+            "PUT /api/users/update": await count(http, "PUT", "/api/users/update", user_headers, {"first_name": "Updated"}),
+            "PUT /api/users/update/{id}": await count(http, "PUT", f"/api/users/update/{user.id}", admin_headers, {"last_name": "Updated"}),
+            "PUT /api/users/update/role/{id}/{role_id}": await count(http, "PUT", f"/api/users/update/role/{user.id}/{admin_role.id}", admin_headers),
+            "POST /api/predictions/predict": await count(http, "POST", "/api/predictions/predict", user_headers, PREDICTION),
+        }
+
+    await stop()
+
+    expected = EXPECTED_QUERIES.get(dialect, EXPECTED_QUERIES["sqlite"])
+    failed = False
+    print(f"{'endpoint':<46}{'queries':>8}{'expected':>10}")
+    for endpoint, queries in counts.items():
+        failed = failed or queries > expected[endpoint]
+        print(f"{endpoint:<46}{queries:>8}{expected[endpoint]:>10}{'  FAIL' if queries > expected[endpoint] else ''}")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
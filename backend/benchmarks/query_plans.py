@@ -0,0 +1,166 @@
+"""
+Check the query plans of the repository lookups against a seeded database.
+
+Seeds users and predictions, runs the repository functions that serve the
+hot endpoints while recording the SQL they send, and runs `EXPLAIN` for
+every recorded query. Exits with status 1 when a query scans a large table
+sequentially instead of using an index.
+
+Runs against a temporary SQLite database by default. Set QUERY_PLAN_DB_URL
+(e.g. to a local postgres:// URL) to check the plans of another database;
+the database should be empty, since the script creates and seeds the tables.
+
+Run from the backend directory:
+
+    python -m benchmarks.query_plans
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from datetime import timedelta
+from tortoise import Tortoise, timezone
+from models import role_model, user_model, predictions_model
+from repositories import user_repository, prediction_repository
+from benchmarks.common import QueryRecorder
+
+USERS = 2000
+PREDICTIONS_PER_USER = 25
+LARGE_TABLES = ("users", "predictions", "prediction_input")
+MODELS = ["models.role_model", "models.user_model", "models.models_model", "models.predictions_model"]
+
+async def seed():
+    """
+    Create users with predictions spread over the last year.
+
+    Returns:
+        tuple[User, Predictions]: A seeded user and one of their predictions
+    """
+    role = await role_model.Role.create(role_name="user")
+    users = [
+        user_model.User(username=f"user{i}", first_name="First", last_name="Last", password_hash="hash", role=role)
+        for i in range(USERS)
+    ]
+    await user_model.User.bulk_create(users, batch_size=1000)
+    users = await user_model.User.all()
+
+    inputs = [
+        predictions_model.PredictionInputs(
+            no_of_dependents=2, education=1, self_employed=0, income_amount=9600000, loan_amont=29900000,
+            loan_amont_term=12, cibil_score=778, residential_assets_value=2400000, commercial_assets_value=17600000,
+            luxury_assets_value=22700000, bank_asset_value=8000000,
+        )
+        for _ in range(USERS * PREDICTIONS_PER_USER)
+    ]
+    await predictions_model.PredictionInputs.bulk_create(inputs, batch_size=1000)
+    input_ids = await predictions_model.PredictionInputs.all().order_by("id").values_list("id", flat=True)
+
+    now = timezone.now()
+    predictions = [
+        predictions_model.Predictions(
+            prediction=random.random() < 0.5,
+            title="Loan",
+            created_at=now - timedelta(minutes=random.randint(0, 525600)),
+            user_id=users[i % USERS].id,
+            prediction_inputs_id=input_id,
+        )
+        for i, input_id in enumerate(input_ids)
+    ]
+    await predictions_model.Predictions.bulk_create(predictions, batch_size=1000)
+
+    user = users[USERS // 2]
+    prediction = await predictions_model.Predictions.filter(user_id=user.id).first()
+    return user, prediction
+
+async def explain(connection, dialect, query, values):
+    """
+    Get the query plan of a query.
+
+    Args:
+        connection (BaseDBAsyncClient): The database connection
+        dialect (str): Dialect of the connection
+        query (str): The SQL query
+        values (list): Parameter values of the query
+
+    Returns:
+        list[str]: Lines of the query plan
+    """
+    if dialect == "sqlite":
+        _, rows = await connection.execute_query(f"EXPLAIN QUERY PLAN {query}", values)
+        return [row["detail"] for row in rows]
+
+    _, rows = await connection.execute_query(f"EXPLAIN {query}", values)
+    return [row["QUERY PLAN"] for row in rows]
+
+def sequential_scans(dialect, plan):
+    """
+    Find the large tables a query plan scans sequentially.
+
+    Args:
+        dialect (str): Dialect of the connection
+        plan (list[str]): Lines of the query plan
+
+    Returns:
+        list[str]: Names of the large tables scanned without an index
+    """
+    scanned = []
+    for line in plan:
+        for table in LARGE_TABLES:
+            if dialect == "sqlite":
+                words = line.replace('"', "").split()
+                if words[:2] == ["SCAN", table] and "INDEX" not in words:
+                    scanned.append(table)
+            elif f"Seq Scan on {table} " in line + " ":
+                scanned.append(table)
+    return scanned
+
+async def main():
+    """
+    Seed the database, record the repository queries and check their plans.
+
+    Returns:
+        int: Exit status, 1 if any query scans a large table sequentially
+    """
+    db_url = os.environ.get("QUERY_PLAN_DB_URL")
+    if not db_url:
+        db_url = f"sqlite://{os.path.join(tempfile.mkdtemp(), 'query_plans.sqlite3')}"
+
+    await Tortoise.init(db_url=db_url, modules={"models": MODELS})
+    await Tortoise.generate_schemas()
+    connection = Tortoise.get_connection("default")
+    dialect = connection.capabilities.dialect
+
+    user, prediction = await seed()
+    await connection.execute_script("ANALYZE")
+
+    checks = {}
+    lookups = {
+        "user_repository.get_user_by_username": lambda: user_repository.get_user_by_username(user.username),
+        "user_repository.get_user_by_id": lambda: user_repository.get_user_by_id(user.id),
+        "prediction_repository.get_predictions": lambda: prediction_repository.get_predictions(user.id, 50),
+        "prediction_repository.get_predictions (cursor)": lambda: prediction_repository.get_predictions(user.id, 50, (prediction.created_at, prediction.id)),
+        "prediction_repository.get_predictions (projection)": lambda: prediction_repository.get_predictions(user.id, 50, with_inputs=False),
+        "prediction_repository.get_prediction": lambda: prediction_repository.get_prediction(prediction.id),
+    }
+    for name, lookup in lookups.items():
+        with QueryRecorder(("SELECT", "DELETE", "UPDATE")) as recorder:
+            await lookup()
+        checks[name] = recorder.queries
+
+    failed = False
+    for name, queries in checks.items():
+        for query, values in queries:
+            plan = await explain(connection, dialect, query, values)
+            scanned = sequential_scans(dialect, plan)
+            failed = failed or bool(scanned)
+            print(f"{'FAIL' if scanned else 'ok':4}  {name}")
+            print(f"      {query}")
+            for line in plan:
+                print(f"        {line}")
+
+    await Tortoise.close_connections()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,44 @@
+"""
+Find the batch size at which numpy scoring becomes cheaper than the scalar path.
+
+Times `CompiledLoanPrediction.predict_one` in a loop against a single
+numpy matrix multiplication for growing batch sizes, checks that the scalar
+path decides every row of the training dataset like LoanPrediction.predict,
+and prints the recommended value for PREDICTION_NUMPY_CROSSOVER.
+
+Run from the backend directory:
+    python -m benchmarks.scoring_crossover
+"""
+import numpy as np
+from ML.compiled_prediction import CompiledLoanPrediction
+from benchmarks.common import load_features, trained_model, timeit
+
+BATCH_SIZES = [1, 2, 4, 8, 12, 16, 24, 32, 48, 64, 128]
+
+def main():
+    model = trained_model()
+    compiled = CompiledLoanPrediction.from_model(model)
+    X = load_features()
+    rows = X.tolist()
+
+    with np.errstate(over="ignore"):
+        expected = model.predict(X)[:, 0].tolist()
+    mismatches = sum(compiled.predict_one(row) != prediction for row, prediction in zip(rows, expected))
+    print(f"parity: {len(rows) - mismatches}/{len(rows)} rows identical")
+
+    crossover = BATCH_SIZES[-1]
+    for size in BATCH_SIZES:
+        batch = rows[:size]
+        scalar = timeit(lambda: [compiled.predict_one(row) for row in batch], repeat=200)
+        vectorized = timeit(lambda: compiled.predict(np.array(batch, dtype=float))[:, 0].tolist(), repeat=200)
+        print(f"{size:>4} rows: scalar {scalar * 1e6:8.2f} us, numpy {vectorized * 1e6:8.2f} us")
+        if vectorized < scalar and crossover == BATCH_SIZES[-1]:
+            crossover = size
+
+    print(f"PREDICTION_NUMPY_CROSSOVER={max(crossover - 1, 1)}")
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare the training solvers on the bundled dataset.
+
+Trains on the same train/test split with gradient descent (the seeded
+hyperparameters and a large learning rate), Newton/IRLS and L-BFGS, and
+reports the iterations, the wall time of `LoanPrediction.train`, the
+final log-loss and gradient norm, and the test set metrics. Exits with
+status 1 when Newton and L-BFGS don't converge to the same parameters.
+
+Run from the backend directory:
+
+    python -m benchmarks.solvers
+"""
+import sys
+import time
+import numpy as np
+from ML import training
+from ML.load_prediction_logistic_regression import LoanPrediction
+from ML.solvers import _loss, _with_bias
+
+RUNS = (
+    ("gd", 1000, 0.0001),
+    ("gd", 1000, 0.5),
+    ("newton", 100, None),
+    ("lbfgs", 100, None),
+)
+
+def main():
+    """
+    Train with every solver and compare the results.
+
+    Returns:
+        int: Exit status, 1 if the second-order solvers disagree
+    """
+    thetas = {}
+    print(f"{'solver':<8}{'lr':>8}{'iterations':>12}{'converged':>11}{'train ms':>10}{'log-loss':>10}{'|grad|':>10}{'accuracy':>10}{'roc_auc':>9}")
+    for solver, epochs, learning_rate in RUNS:
+        np.random.seed(0)
+        model = LoanPrediction(training.DATASET_PATH, train_size=0.8, learning_rate=learning_rate or 0.0, epochs=epochs, solver=solver)
+        start = time.perf_counter()
+        model.train()
+        elapsed = time.perf_counter() - start
+
+        X, y = _with_bias(model.X_train), model.y_train.ravel()
+        theta = np.r_[model.weights.ravel(), model.bias]
+        gradient = X.T @ (1 / (1 + np.exp(-(X @ theta))) - y) / len(y)
+        metrics = model.evaluate()
+        thetas[solver] = theta
+        print(f"{solver:<8}{learning_rate or '-':>8}{model.iterations:>12}{str(model.converged):>11}{elapsed * 1000:>10.1f}"
+              f"{_loss(X, y, theta):>10.5f}{np.max(np.abs(gradient)):>10.1e}{metrics['accuracy']:>10.4f}{metrics['roc_auc']:>9.4f}")
+
+    if not np.allclose(thetas["newton"], thetas["lbfgs"], atol=1e-3):
+        print("FAIL newton and lbfgs converged to different parameters")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
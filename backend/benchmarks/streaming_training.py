@@ -0,0 +1,90 @@
+"""
+Compare the peak memory of in-memory and streaming training on a large dataset.
+
+Writes a synthetic dataset in the training CSV layout by resampling the
+rows of the bundled dataset with noise, then trains on it in fresh worker
+processes: with `LoanPrediction` (whole file loaded, full-batch gradient
+descent) and with `ML.streaming_training.train_streaming` (chunks,
+mini-batches). Reports the wall time, the peak resident memory of each
+process and the test set metrics.
+
+Set STREAMING_ROWS to change the size of the synthetic dataset (default
+1000000 rows).
+
+Run from the backend directory:
+
+    python -m benchmarks.streaming_training
+"""
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from ML import streaming_training, training
+from ML.load_prediction_logistic_regression import LoanPrediction
+
+ROWS = int(os.environ.get("STREAMING_ROWS", "1000000"))
+WRITE_CHUNK_ROWS = 200_000
+BATCH_EPOCHS = 20
+STREAMING_EPOCHS = 1
+
+def write_dataset(path, rows):
+    """
+    Write a synthetic dataset by resampling the bundled one.
+
+    Numeric values are scaled by up to ±10 % so the rows aren't exact copies.
+
+    Args:
+        path (str): Path of the CSV file to write
+        rows (int): Number of rows
+    """
+    source = pd.read_csv(training.DATASET_PATH)
+    numeric = [column for column in source.columns if source[column].dtype.kind in "if" and column.strip() != "loan_id"]
+    rng = np.random.default_rng(0)
+
+    for start in range(0, rows, WRITE_CHUNK_ROWS):
+        size = min(WRITE_CHUNK_ROWS, rows - start)
+        chunk = source.iloc[rng.integers(0, len(source), size)].reset_index(drop=True)
+        chunk[numeric] = (chunk[numeric] * rng.uniform(0.9, 1.1, (size, len(numeric)))).round().astype(np.int64)
+        chunk[source.columns[0]] = np.arange(start + 1, start + size + 1)
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+def run(mode, csv_path):
+    """
+    Train on a dataset and measure the process.
+
+    Args:
+        mode (str): "batch" or "streaming"
+        csv_path (str): Path to the CSV file
+
+    Returns:
+        tuple[float, float, dict]: Wall time in seconds, peak RSS in MiB and test set metrics
+    """
+    start = time.perf_counter()
+    if mode == "batch":
+        model = LoanPrediction(csv_path, train_size=0.8, learning_rate=0.01, epochs=BATCH_EPOCHS)
+        model.train()
+        metrics = model.evaluate()
+    else:
+        _, metrics, _ = streaming_training.train_streaming(csv_path, 0.8, 0.01, STREAMING_EPOCHS, optimizer="momentum", seed=0)
+    elapsed = time.perf_counter() - start
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, metrics
+
+def main():
+    csv_path = os.path.join(tempfile.mkdtemp(), "dataset.csv")
+    write_dataset(csv_path, ROWS)
+    print(f"{ROWS} rows, {os.path.getsize(csv_path) / 2 ** 20:.0f} MiB CSV")
+
+    print(f"{'training':<40}{'seconds':>9}{'peak RSS MiB':>14}{'accuracy':>10}{'roc_auc':>9}")
+    for mode, name in (("batch", f"in-memory, {BATCH_EPOCHS} full-batch epochs"), ("streaming", f"streaming, {STREAMING_EPOCHS} mini-batch epoch")):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            elapsed, peak_rss, metrics = executor.submit(run, mode, csv_path).result()
+        print(f"{name:<40}{elapsed:>9.1f}{peak_rss:>14.0f}{metrics['accuracy']:>10.4f}{metrics['roc_auc']:>9.4f}")
+
+    os.remove(csv_path)
+
+if __name__ == "__main__":
+    main()
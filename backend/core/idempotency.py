@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from core import metrics
+import asyncio
+import os
+import time
+
+IDEMPOTENCY_TTL = float(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_CACHE_SIZE = int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", "10000"))
+MAX_KEY_LENGTH = 255
+
+replays_counter = metrics.counter("idempotency_replays", "Requests answered with the stored response of an earlier request with the same idempotency key")
+coalesced_counter = metrics.counter("idempotency_coalesced", "Requests that waited for an in-flight request with the same idempotency key")
+
+class IdempotencyKeyMismatch(Exception):
+    """
+    Raised when an idempotency key is reused for a different request.
+    """
+
+class IdempotencyStore:
+    """
+    Process-wide store of the results of requests sent with an idempotency key.
+
+    The first request with a key runs its computation, later requests with
+    the same key get the same result for `ttl` seconds without running it
+    again. A request arriving while the first one is still running waits
+    for it instead of starting a second computation. Failed computations
+    aren't kept, so a retry after an error runs again. Every entry stores a
+    fingerprint of its request, and reusing a key for a different request
+    is rejected. The least recently used entries are dropped once
+    `max_size` keys are stored.
+
+    Results live in the memory of the worker process, so retries are only
+    deduplicated when they reach the same worker.
+
+    Attributes:
+        ttl (float): Number of seconds a result is replayed
+        max_size (int): Maximum number of stored keys
+    """
+    def __init__(self, ttl=IDEMPOTENCY_TTL, max_size=IDEMPOTENCY_CACHE_SIZE):
+        """
+        Initialize an empty store.
+
+        Args:
+            ttl (float): Result lifetime in seconds (default: IDEMPOTENCY_TTL_SECONDS or 86400)
+            max_size (int): Maximum number of stored keys (default: IDEMPOTENCY_CACHE_SIZE or 10000)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    async def run(self, key, fingerprint: str, compute):
+        """
+        Get the result for an idempotency key, computing it on first use.
+
+        The computation runs in its own task, so it completes for the
+        waiting requests even if the request that started it is cancelled.
+
+        Args:
+            key: Hashable idempotency key, scoped to the caller
+            fingerprint (str): Fingerprint of the request the key is sent with
+            compute (callable): Coroutine function computing the result
+
+        Returns:
+            tuple: The result and whether it was produced by an earlier request
+
+        Raises:
+            IdempotencyKeyMismatch: If the key was used for a different request
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] is not None and time.monotonic() >= entry[2]:
+            del self._entries[key]
+            entry = None
+
+        if entry is not None:
+            task, entry_fingerprint, expires_at = entry
+            if entry_fingerprint != fingerprint:
+                raise IdempotencyKeyMismatch()
+
+            self._entries.move_to_end(key)
+            if expires_at is None:
+                coalesced_counter.inc()
+            else:
+                replays_counter.inc()
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(compute())
+        self._entries[key] = (task, fingerprint, None)
+        self._entries.move_to_end(key)
+        task.add_done_callback(lambda task: self._completed(key, task))
+        self._evict()
+        return await asyncio.shield(task), False
+
+    def _completed(self, key, task):
+        """
+        Keep the result of a finished computation, drop a failed one.
+
+        Args:
+            key: The idempotency key
+            task (asyncio.Task): The finished computation
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not task:
+            return
+
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            del self._entries[key]
+        else:
+            self._entries[key] = (task, entry[1], time.monotonic() + self.ttl)
+
+    def _evict(self):
+        """
+        Drop the least recently used finished results while the store is over `max_size` keys.
+
+        Keys of running computations are kept, so waiting requests are never
+        detached from them.
+        """
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_size:
+                break
+            if self._entries[key][2] is not None:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Drop all stored results.
+        """
+        self._entries.clear()
+
+idempotency_store = IdempotencyStore()
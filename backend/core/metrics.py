@@ -0,0 +1,177 @@
+import bisect
+
+class Counter:
+    """
+    Monotonically increasing counter.
+
+    Attributes:
+        description (str): Human readable description of the counter
+        value (float): Current value of the counter
+    """
+    def __init__(self, description=""):
+        """
+        Initialize the counter with zero value.
+
+        Args:
+            description (str): Human readable description of the counter
+        """
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount=1):
+        """
+        Increase the counter.
+
+        Args:
+            amount (float): Amount to add (default: 1)
+        """
+        self.value += amount
+
+    def snapshot(self):
+        """
+        Get the current state of the counter.
+
+        Returns:
+            dict: Description and value of the counter
+        """
+        return {"description": self.description, "value": self.value}
+
+class Gauge:
+    """
+    Value that can go up and down, e.g. a queue depth.
+
+    Attributes:
+        description (str): Human readable description of the gauge
+        value (float): Current value of the gauge
+    """
+    def __init__(self, description=""):
+        """
+        Initialize the gauge with zero value.
+
+        Args:
+            description (str): Human readable description of the gauge
+        """
+        self.description = description
+        self.value = 0
+
+    def set(self, value):
+        """
+        Set the current value.
+
+        Args:
+            value (float): The new value
+        """
+        self.value = value
+
+    def snapshot(self):
+        """
+        Get the current state of the gauge.
+
+        Returns:
+            dict: Description and value of the gauge
+        """
+        return {"description": self.description, "value": self.value}
+
+class Histogram:
+    """
+    Histogram counting observations into fixed upper-bound buckets.
+
+    Attributes:
+        description (str): Human readable description of the histogram
+        buckets (list[float]): Sorted upper bounds of the buckets
+        counts (list[int]): Observations per bucket, the last one counts values above all bounds
+        count (int): Total number of observations
+        sum (float): Sum of all observed values
+    """
+    def __init__(self, buckets, description=""):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets (list[float]): Upper bounds of the buckets
+            description (str): Human readable description of the histogram
+        """
+        self.description = description
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """
+        Record an observation.
+
+        Args:
+            value (float): The observed value
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        """
+        Get the current state of the histogram.
+
+        Returns:
+            dict: Description, count, sum and per bucket counts keyed by upper bound
+        """
+        buckets = {str(bound): count for bound, count in zip(self.buckets, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {"description": self.description, "count": self.count, "sum": self.sum, "buckets": buckets}
+
+_metrics = {}
+
+def counter(name, description=""):
+    """
+    Get a registered counter, creating it if it doesn't exist.
+
+    Args:
+        name (str): Unique name of the counter
+        description (str): Human readable description of the counter
+
+    Returns:
+        Counter: The registered counter
+    """
+    if name not in _metrics:
+        _metrics[name] = Counter(description)
+    return _metrics[name]
+
+def gauge(name, description=""):
+    """
+    Get a registered gauge, creating it if it doesn't exist.
+
+    Args:
+        name (str): Unique name of the gauge
+        description (str): Human readable description of the gauge
+
+    Returns:
+        Gauge: The registered gauge
+    """
+    if name not in _metrics:
+        _metrics[name] = Gauge(description)
+    return _metrics[name]
+
+def histogram(name, buckets, description=""):
+    """
+    Get a registered histogram, creating it if it doesn't exist.
+
+    Args:
+        name (str): Unique name of the histogram
+        buckets (list[float]): Upper bounds of the buckets
+        description (str): Human readable description of the histogram
+
+    Returns:
+        Histogram: The registered histogram
+    """
+    if name not in _metrics:
+        _metrics[name] = Histogram(buckets, description)
+    return _metrics[name]
+
+def snapshot():
+    """
+    Get the current state of all registered metrics.
+
+    Returns:
+        dict: Snapshots of all metrics keyed by name
+    """
+    return {name: metric.snapshot() for name, metric in sorted(_metrics.items())}
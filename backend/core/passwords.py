@@ -0,0 +1,163 @@
+from concurrent.futures import ThreadPoolExecutor
+from core import metrics
+import asyncio
+import bcrypt
+import os
+import threading
+import time
+
+BCRYPT_ROUNDS = 12
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+hash_ms_histogram = metrics.histogram(
+    "password_hash_ms",
+    [50, 100, 150, 200, 250, 300, 400, 500, 750, 1000],
+    "Time spent in bcrypt hashing or verification in milliseconds",
+)
+queue_wait_histogram = metrics.histogram(
+    "password_hash_queue_wait_ms",
+    [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500],
+    "Time a password operation waited for a free bcrypt worker in milliseconds",
+)
+queue_depth_gauge = metrics.gauge("password_hash_queue_depth", "Password operations running or waiting for a bcrypt worker")
+rejected_counter = metrics.counter("password_hash_rejected", "Password operations rejected because the bcrypt queue was full")
+
+class PasswordQueueFull(Exception):
+    """
+    Raised when too many password operations are already waiting for a worker.
+    """
+
+_executor = None
+_depth = 0
+_depth_lock = threading.Lock()
+
+def _get_executor():
+    """
+    Get the thread pool used for bcrypt, creating it on first use.
+
+    Returns:
+        ThreadPoolExecutor: The password hashing thread pool
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+def shutdown():
+    """
+    Shut down the password hashing thread pool without waiting for running operations.
+
+    Queued operations are cancelled. The running ones finish in their
+    threads, which the interpreter joins on exit, so the event loop isn't
+    blocked for the duration of a bcrypt hash.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def _release(future):
+    """
+    Count a password operation as no longer running or waiting.
+
+    Called by the executor when the operation finished or was cancelled
+    before it started. A caller that is cancelled while bcrypt runs doesn't
+    release its place, since the worker thread stays busy until then.
+
+    Args:
+        future (Future): The future of the operation
+    """
+    global _depth
+    with _depth_lock:
+        _depth -= 1
+        queue_depth_gauge.set(_depth)
+
+def _timed(fn, enqueued_at, *args):
+    """
+    Run a bcrypt function in a worker thread and record its timings.
+
+    Args:
+        fn (callable): The bcrypt function
+        enqueued_at (float): `time.perf_counter()` when the operation was queued
+        *args: Arguments of the bcrypt function
+
+    Returns:
+        The result of the bcrypt function
+    """
+    started_at = time.perf_counter()
+    queue_wait_histogram.observe((started_at - enqueued_at) * 1000)
+    try:
+        return fn(*args)
+    finally:
+        hash_ms_histogram.observe((time.perf_counter() - started_at) * 1000)
+
+async def _run(fn, *args):
+    """
+    Run a bcrypt function on the password hashing thread pool.
+
+    bcrypt releases the GIL while hashing, so the event loop keeps serving
+    other requests and up to PASSWORD_HASH_WORKERS operations run in
+    parallel. At most PASSWORD_HASH_MAX_QUEUE operations may be running or
+    waiting at once; beyond that the call fails immediately instead of
+    queueing work the client would likely time out on. An operation
+    counts until its bcrypt call returns, even when the caller is cancelled
+    first, e.g. by a client disconnect.
+
+    Args:
+        fn (callable): The bcrypt function
+        *args: Arguments of the bcrypt function
+
+    Returns:
+        The result of the bcrypt function
+
+    Raises:
+        PasswordQueueFull: If the queue depth cap is reached
+    """
+    global _depth
+    with _depth_lock:
+        if _depth >= PASSWORD_HASH_MAX_QUEUE:
+            rejected_counter.inc()
+            raise PasswordQueueFull()
+        _depth += 1
+        queue_depth_gauge.set(_depth)
+
+    try:
+        future = _get_executor().submit(_timed, fn, time.perf_counter(), *args)
+    except BaseException:
+        _release(None)
+        raise
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
+
+async def hash_password(password: str):
+    """
+    Hash a password with a new salt.
+
+    Args:
+        password (str): The plain text password
+
+    Returns:
+        str: The bcrypt hash of the password
+
+    Raises:
+        PasswordQueueFull: If too many password operations are waiting
+    """
+    hashed_password = await _run(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+    return hashed_password.decode("utf-8")
+
+async def check_password(password: str, password_hash: str):
+    """
+    Check a password against its bcrypt hash.
+
+    Args:
+        password (str): The plain text password
+        password_hash (str): The stored bcrypt hash
+
+    Returns:
+        bool: True if the password matches the hash
+
+    Raises:
+        PasswordQueueFull: If too many password operations are waiting
+    """
+    return await _run(bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
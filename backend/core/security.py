@@ -1,10 +1,42 @@
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import NamedTuple, Optional
 from jose import JWTError, jwt
+from core import metrics
 import os
+import time
 
 SECRET_KEY = os.environ["JWT_SECRET"]
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 30  # 30 days
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "10000"))
+
+_token_cache = OrderedDict()
+
+token_cache_hits = metrics.counter("auth_token_cache_hits", "Tokens accepted from the verified token cache")
+token_cache_misses = metrics.counter("auth_token_cache_misses", "Tokens whose signature had to be verified")
+
+class RoleClaim(NamedTuple):
+    """
+    Role of the user at the time the token was issued.
+
+    Attributes:
+        role (str): Name of the role (e.g. 'user' or 'admin')
+        role_version (int): Role version of the user the claim was issued for
+    """
+    role: str
+    role_version: int
+
+class AccessClaims(NamedTuple):
+    """
+    Verified claims of an access token.
+
+    Attributes:
+        user_id (int|None): The user ID
+        role_claim (RoleClaim|None): The role claim, None for tokens issued without one
+    """
+    user_id: Optional[int]
+    role_claim: Optional[RoleClaim]
 
 def create_access_token(data: dict):
     """
@@ -33,6 +65,21 @@ def decode_access_token(token: str):
     Returns:
         int: The user ID extracted from the token payload
         
+    Raises:
+        JWTError: If the token is invalid, expired, or malformed
+    """
+    return _decode_access_token(token)[0].user_id
+
+def _decode_access_token(token: str):
+    """
+    Decode and validate a JWT access token, keeping its expiration time.
+    
+    Args:
+        token (str): The JWT token string to decode
+    
+    Returns:
+        tuple[AccessClaims, int|None]: The claims and the expiration timestamp of the token
+        
     Raises:
         JWTError: If the token is invalid, expired, or malformed
     """
@@ -40,8 +87,48 @@ def decode_access_token(token: str):
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         id = payload.get("id")
         if not id:
-            return None
+            return AccessClaims(None, None), payload.get("exp")
+
+        role_claim = None
+        if payload.get("role") is not None and payload.get("rv") is not None:
+            role_claim = RoleClaim(payload["role"], int(payload["rv"]))
 
-        return int(id)
+        return AccessClaims(int(id), role_claim), payload.get("exp")
     except JWTError:
         raise JWTError
+
+def verify_access_token(token: str):
+    """
+    Validate a JWT access token, skipping the signature check for known tokens.
+    
+    Verified tokens are kept in a bounded LRU cache (TOKEN_CACHE_SIZE entries)
+    together with their claims and expiration time. A repeated token is
+    accepted from the cache until it expires; only the HMAC verification is
+    skipped, the expiration is still checked on every call. Tokens without an
+    expiration time are never cached.
+    
+    Args:
+        token (str): The JWT token string to validate
+    
+    Returns:
+        AccessClaims: The user ID and role claim extracted from the token payload
+        
+    Raises:
+        JWTError: If the token is invalid, expired, or malformed
+    """
+    entry = _token_cache.get(token)
+    if entry is not None:
+        claims, exp = entry
+        if time.time() <= exp:
+            _token_cache.move_to_end(token)
+            token_cache_hits.inc()
+            return claims
+        del _token_cache[token]
+
+    token_cache_misses.inc()
+    claims, exp = _decode_access_token(token)
+    if exp is not None and TOKEN_CACHE_SIZE > 0:
+        _token_cache[token] = (claims, exp)
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return claims
@@ -1,23 +1,63 @@
+from contextlib import asynccontextmanager
 from tortoise import Tortoise
 from db.config import TORTOISE_ORM
+from db.migrations import run_migrations
 from models import role_model, models_model
 
+INIT_LOCK_ID = 720401
+
+@asynccontextmanager
+async def _init_lock():
+    """
+    Serialize database initialization across server processes.
+    
+    Several server processes (e.g. uvicorn workers) starting on the same
+    empty PostgreSQL database would otherwise create the same tables and
+    seed rows at the same time, and all but one of them would fail. A
+    session-level advisory lock is held on a dedicated connection while
+    one process initializes the database. SQLite serializes writes itself.
+    """
+    connection = Tortoise.get_connection("default")
+    if connection.capabilities.dialect != "postgres":
+        yield
+        return
+
+    async with connection.acquire_connection() as lock_connection:
+        await lock_connection.execute("SELECT pg_advisory_lock($1)", INIT_LOCK_ID)
+        try:
+            yield
+        finally:
+            await lock_connection.execute("SELECT pg_advisory_unlock($1)", INIT_LOCK_ID)
+
 async def init_db():
     """
     Initialize the database connection and seed default data.
     
     This function performs the following operations:
     - Initializes Tortoise ORM with the database configuration
-    - Generates database schemas for all models
+    - Generates database schemas for all models, which also creates indexes
+      declared in model Meta that are missing from existing tables
+    - Adds columns introduced by newer versions to existing tables
     - Creates default user roles ('user' and 'admin') if they don't exist
     - Creates default hyperparameters for ML model training if they don't exist
     - Creates default train/test split configuration if it doesn't exist
+    - Creates the model registry row, without an active model, if it doesn't exist
     
     The function is idempotent - it can be called multiple times safely
-    as it checks for existing data before creating new records.
+    as it checks for existing data before creating new records. Server
+    processes starting at the same time initialize the database one after
+    another.
     """
     await Tortoise.init(config=TORTOISE_ORM)
+    async with _init_lock():
+        await _init_schema_and_data()
+
+async def _init_schema_and_data():
+    """
+    Create and migrate the tables and seed the default data.
+    """
     await Tortoise.generate_schemas()
+    await run_migrations()
 
     existing = await role_model.Role.all().values_list("role_name", flat=True)
     for role_name in ["user", "admin"]:
@@ -33,3 +73,5 @@ async def init_db():
         await models_model.TestTrainSplit.get(id=1)
     except:
         await models_model.TestTrainSplit.create(testing=0.2, training=0.8)
+
+    await models_model.ModelRegistry.bulk_create([models_model.ModelRegistry(id=1, version=0)], ignore_conflicts=True)
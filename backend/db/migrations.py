@@ -0,0 +1,127 @@
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+from ML.array_blob import PARAMS_DTYPE, encode_array
+import json
+
+PARAMS_ARRAYS = ("weights", "x_mean", "x_std")
+
+async def _column_type(connection, table: str, column: str):
+    """
+    Get the type of a table column.
+
+    Args:
+        connection (BaseDBAsyncClient): The database connection
+        table (str): Name of the table
+        column (str): Name of the column
+
+    Returns:
+        str|None: The lowercase type name of the column, None if the column doesn't exist
+    """
+    if connection.capabilities.dialect == "sqlite":
+        _, rows = await connection.execute_query(f'PRAGMA table_info("{table}")')
+        return next((row["type"].lower() for row in rows if row["name"] == column), None)
+
+    _, rows = await connection.execute_query(
+        "SELECT data_type FROM information_schema.columns WHERE table_schema = current_schema() AND table_name = $1 AND column_name = $2",
+        [table, column],
+    )
+    return rows[0]["data_type"].lower() if rows else None
+
+async def _add_column(connection, table: str, column: str, definition: str):
+    """
+    Add a column to an existing table if it's missing.
+
+    Args:
+        connection (BaseDBAsyncClient): The database connection
+        table (str): Name of the table
+        column (str): Name of the column
+        definition (str): SQL type and constraints of the column
+    """
+    if await _column_type(connection, table, column) is None:
+        await connection.execute_script(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {definition}')
+
+def _json_array(value):
+    """
+    Parse an array stored in a JSON column.
+
+    Weights used to be JSON encoded before being stored in a JSON field,
+    so strings are parsed until the array itself comes out.
+
+    Args:
+        value: The raw column value
+
+    Returns:
+        list: The array as (nested) lists
+    """
+    while isinstance(value, (str, bytes)):
+        value = json.loads(value)
+    return value
+
+async def _convert_params_to_binary(connection):
+    """
+    Convert the parameter arrays of trained models from JSON to binary blobs.
+
+    Every row is re-encoded with `ML.array_blob.encode_array` into a new
+    binary column, which then replaces the JSON column. Runs in a single
+    transaction and only when the weights column isn't binary yet.
+
+    Args:
+        connection (BaseDBAsyncClient): The database connection
+    """
+    column_type = await _column_type(connection, "params", "weights")
+    if column_type is None or column_type in ("blob", "bytea"):
+        return
+
+    sqlite = connection.capabilities.dialect == "sqlite"
+    binary_type = "BLOB NOT NULL DEFAULT x''" if sqlite else "BYTEA NOT NULL DEFAULT ''"
+    assignments = ", ".join(f'"{column}_blob" = {"?" if sqlite else f"${i}"}' for i, column in enumerate(PARAMS_ARRAYS, start=1))
+    id_param = "?" if sqlite else f"${len(PARAMS_ARRAYS) + 1}"
+    columns = ", ".join(f'"{column}"' for column in PARAMS_ARRAYS)
+
+    async with in_transaction() as transaction:
+        rows = await transaction.execute_query_dict(f'SELECT "id", {columns} FROM "params"')
+        for column in PARAMS_ARRAYS:
+            await transaction.execute_script(f'ALTER TABLE "params" ADD COLUMN "{column}_blob" {binary_type}')
+
+        for row in rows:
+            blobs = [encode_array(_json_array(row[column]), PARAMS_DTYPE) for column in PARAMS_ARRAYS]
+            await transaction.execute_query(f'UPDATE "params" SET {assignments} WHERE "id" = {id_param}', [*blobs, row["id"]])
+
+        for column in PARAMS_ARRAYS:
+            await transaction.execute_script(f'ALTER TABLE "params" DROP COLUMN "{column}"')
+            await transaction.execute_script(f'ALTER TABLE "params" RENAME COLUMN "{column}_blob" TO "{column}"')
+
+async def run_migrations():
+    """
+    Bring tables created by older versions of the application up to date.
+
+    `Tortoise.generate_schemas` only creates missing tables and indexes, so
+    changes to existing tables are made here. Every step checks the current
+    schema first, which makes the function safe to run on every start.
+    """
+    connection = Tortoise.get_connection("default")
+    sqlite = connection.capabilities.dialect == "sqlite"
+    float_type = "REAL" if sqlite else "DOUBLE PRECISION"
+    json_type = "JSON" if sqlite else "JSONB"
+
+    await _add_column(connection, "users", "role_version", "INT NOT NULL DEFAULT 0")
+    await _convert_params_to_binary(connection)
+    await _add_column(connection, "model_metrics", "roc_auc", f"{float_type} NOT NULL DEFAULT 0")
+    await _add_column(connection, "model_metrics", "average_precision", f"{float_type} NOT NULL DEFAULT 0")
+    await _add_column(connection, "model_metrics", "roc_curve", json_type)
+    await _add_column(connection, "model_metrics", "pr_curve", json_type)
+    await _add_column(connection, "hyper_params", "solver", "VARCHAR(16) NOT NULL DEFAULT 'gd'")
+    await _add_column(connection, "hyper_params", "tolerance", f"{float_type} NOT NULL DEFAULT 0.000001")
+    await _add_column(connection, "models", "solver", "VARCHAR(16) NOT NULL DEFAULT 'gd'")
+    await _add_column(connection, "models", "iterations", "INT NOT NULL DEFAULT 0")
+    await _add_column(connection, "models", "converged", f"{'INT' if sqlite else 'BOOL'} NOT NULL DEFAULT {'0' if sqlite else 'FALSE'}")
+    await _add_column(connection, "models", "training_seconds", f"{float_type} NOT NULL DEFAULT 0")
+    await _add_column(connection, "models", "epochs", "INT NOT NULL DEFAULT 0")
+    await _add_column(connection, "training_jobs", "owner", "VARCHAR(64)")
+    await _add_column(connection, "training_jobs", "heartbeat_at", "TIMESTAMP" if sqlite else "TIMESTAMPTZ")
+    await _add_column(connection, "training_jobs", "bootstrap", f"{'INT' if sqlite else 'BOOL'} NOT NULL DEFAULT {'0' if sqlite else 'FALSE'}")
+    # Partial indexes can't be declared in the model Meta
+    await connection.execute_script(
+        'CREATE UNIQUE INDEX IF NOT EXISTS "uidx_training_jobs_bootstrap" ON "training_jobs" ("bootstrap") '
+        "WHERE \"bootstrap\" AND \"status\" IN ('queued', 'running')"
+    )
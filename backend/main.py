@@ -1,9 +1,11 @@
 from fastapi import FastAPI
 from db.init import init_db
-from api.endpoints import auth_endpoints, user_endpoints, prediction_endpoints, model_endpoints
+from api.endpoints import auth_endpoints, user_endpoints, prediction_endpoints, model_endpoints, metrics_endpoints
 from middlewares import auth_middleware
-from ML import load_prediction_logistic_regression
+from core import passwords
 from repositories import models_repository
+from repositories.prediction_write_buffer import prediction_write_buffer
+from services import training_service
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI()
@@ -25,28 +27,43 @@ async def startup_event():
     This function is called when the FastAPI application starts up. It performs
     the following initialization tasks:
     - Initializes the database connection and creates schemas
-    - Retrieves hyperparameters and train/test split configuration
-    - Trains a new machine learning model if parameters don't exist
-    - Stores model parameters and metrics in the database
+    - Marks training jobs abandoned by stopped server processes as failed and
+      starts renewing the training jobs of this process
+    - Starts the write-behind buffer for prediction records
+    - Promotes the latest model if no model version is active yet
+    - Starts a background training job if no trained model exists, unless
+      another server process already started one
     
-    The ML model is only trained once on startup if no existing parameters
-    are found in the database.
+    Training runs in a worker process, so the server starts accepting
+    requests immediately.
     """
     await init_db()
+    await training_service.start_heartbeat()
+    prediction_write_buffer.start()
 
-    hyper_params = await models_repository.get_hyper_params()
-    test_train_split = await models_repository.get_test_train_split()
+    if await models_repository.get_active_model() is None:
+        latest_model = await models_repository.get_latest_model()
+        if latest_model is not None:
+            await models_repository.promote_model(latest_model.id)
+        else:
+            await training_service.enqueue_training(bootstrap=True)
 
-    try:
-        await models_repository.get_params()
-    except:
-        model = load_prediction_logistic_regression.LoanPrediction("./training-dataset/loan_approval_dataset.csv", train_size=test_train_split.training, learning_rate=hyper_params.learning_rate, epochs=hyper_params.epochs)
-        model.train()
-        await models_repository.set_params(weights=model.get_weights(), bias=model.get_bias(), x_mean=model.X_mean.tolist(), x_std=model.X_std.tolist())
-        await models_repository.set_model_metrics(model.get_accuracy(), model.get_precision(), model.get_f1_score(), model.get_recall(), model.get_confusion_matrix())
-        await models_repository.add_model()
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Release resources on shutdown.
+    
+    Writes all buffered prediction records, stops renewing training
+    jobs, stops the training process pool without waiting for running
+    jobs and stops the password hashing thread pool.
+    """
+    await prediction_write_buffer.stop()
+    training_service.stop_heartbeat()
+    training_service.shutdown()
+    passwords.shutdown()
 
 app.include_router(auth_endpoints.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(user_endpoints.router, prefix="/api/users", tags=["Users"])
 app.include_router(prediction_endpoints.router, prefix="/api/predictions", tags=["Predictions"])
 app.include_router(model_endpoints.router, prefix="/api/models", tags=["Models"])
+app.include_router(metrics_endpoints.router, prefix="/api/metrics", tags=["Metrics"])
@@ -1,45 +1,68 @@
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
-from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 from jose import JWTError
 from core import security
 
 EXCLUDE_PATHS = {"/api/auth/login", "/api/auth/register", "/docs", "/openapi.json"}
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware:
     """
     Authentication middleware for validating JWT tokens.
-    
+
     This middleware intercepts all requests except those in EXCLUDE_PATHS,
     validates the JWT token in the Authorization header, and injects the
-    user ID into the request state for use by protected endpoints.
-    
+    user ID and the role claim of the token into the request state for use
+    by protected endpoints.
+
+    It is a plain ASGI middleware, so authenticated requests are passed to
+    the application without wrapping the request and response streams.
+    Tokens are validated with `security.verify_access_token`, which caches
+    verified tokens until they expire.
+
     Attributes:
+        app (ASGIApp): The wrapped ASGI application
         EXCLUDE_PATHS: Set of paths that don't require authentication
     """
-    
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The ASGI application to wrap
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """
         Process the request through authentication middleware.
-        
+
+        Non-HTTP connections (lifespan, websockets) are passed through unchanged.
+
         Args:
-            request (Request): The incoming HTTP request
-            call_next: The next middleware or endpoint to call
-            
-        Returns:
-            Response: The response from the next handler or an error response
+            scope (Scope): The ASGI connection scope
+            receive (Receive): The ASGI receive channel
+            send (Send): The ASGI send channel
         """
-        if request.url.path in EXCLUDE_PATHS:
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"] in EXCLUDE_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-        auth_header = request.headers.get("Authorization")
+        auth_header = Headers(scope=scope).get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+            response = JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+            await response(scope, receive, send)
+            return
 
         token = auth_header.split(" ")[1]
         try:
-            request.state.user_id = security.decode_access_token(token)
+            claims = security.verify_access_token(token)
         except JWTError:
-            return JSONResponse(status_code=401, content={"detail": "Invalid token"})
+            response = JSONResponse(status_code=401, content={"detail": "Invalid token"})
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        state = scope.setdefault("state", {})
+        state["user_id"] = claims.user_id
+        state["role_claim"] = claims.role_claim
+        await self.app(scope, receive, send)
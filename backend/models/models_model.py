@@ -1,5 +1,6 @@
 from tortoise import fields, models
 from tortoise.fields.base import CASCADE
+from enum import Enum
 
 class HyperParams(models.Model):
     """
@@ -7,8 +8,10 @@ class HyperParams(models.Model):
     
     Attributes:
         id (int): Primary key, auto-generated hyperparameter ID
-        epochs (int): Number of training epochs (default: 0)
+        epochs (int): Number of training epochs, the iteration limit of the "newton" and "lbfgs" solvers (default: 0)
         learning_rate (float): Learning rate for training (default: 0.001)
+        solver (str): Training algorithm, "gd", "newton" or "lbfgs" (default: "gd")
+        tolerance (float): Stopping tolerance of the "newton" and "lbfgs" solvers (default: 1e-6)
         
     Related:
         models: One-to-many relationship with Models
@@ -16,6 +19,8 @@ class HyperParams(models.Model):
     id = fields.IntField(pk=True)
     epochs = fields.IntField(default=0.0)
     learning_rate = fields.FloatField(default=0.001)
+    solver = fields.CharField(max_length=16, default="gd")
+    tolerance = fields.FloatField(default=1e-6)
 
     class Meta:
         table = "hyper_params"
@@ -46,19 +51,22 @@ class Params(models.Model):
     
     Attributes:
         id (int): Primary key, auto-generated parameter ID
-        weights (JSON): Model weights as JSON array (default: empty list)
+        weights (bytes): Model weights as an encoded array of shape (n_features, 1)
         bias (float): Model bias value (default: 0.0)
-        x_mean (JSON): Feature mean values for normalization (default: empty list)
-        x_std (JSON): Feature standard deviation values for normalization (default: empty list)
+        x_mean (bytes): Feature mean values for normalization as an encoded array
+        x_std (bytes): Feature standard deviation values for normalization as an encoded array
+        
+    The arrays are stored as raw little-endian floats with a dtype and shape
+    header (see `ML.array_blob`), so loading them needs no parsing.
         
     Related:
         models: One-to-many relationship with Models
     """
     id = fields.IntField(pk=True)
-    weights = fields.JSONField(default=list[list])
+    weights = fields.BinaryField()
     bias = fields.FloatField(default=0.0)
-    x_mean = fields.JSONField(default=list)
-    x_std = fields.JSONField(default=list)
+    x_mean = fields.BinaryField()
+    x_std = fields.BinaryField()
 
     class Meta:
         table = "params"
@@ -74,6 +82,10 @@ class ModelMetrics(models.Model):
         recall (float): Model recall score (default: 0.0)
         f1_score (float): Model F1-score (default: 0.0)
         confusion_matrix (JSON): Confusion matrix as JSON array (default: empty list)
+        roc_auc (float): Area under the ROC curve (default: 0.0)
+        average_precision (float): Area under the precision-recall curve (default: 0.0)
+        roc_curve (JSON): ROC curve as {"fpr", "tpr", "thresholds"} lists, None for older models
+        pr_curve (JSON): Precision-recall curve as {"precision", "recall", "thresholds"} lists, None for older models
         
     Related:
         models: One-to-many relationship with Models
@@ -84,6 +96,10 @@ class ModelMetrics(models.Model):
     recall = fields.FloatField(default=0.0)
     f1_score = fields.FloatField(default=0.0)
     confusion_matrix = fields.JSONField(default=list[list])
+    roc_auc = fields.FloatField(default=0.0)
+    average_precision = fields.FloatField(default=0.0)
+    roc_curve = fields.JSONField(null=True)
+    pr_curve = fields.JSONField(null=True)
 
     class Meta:
         table = "model_metrics"
@@ -103,6 +119,11 @@ class Models(models.Model):
         test_train_split (TestTrainSplit): Foreign key to train/test split configuration
         params (Params): Foreign key to trained model parameters
         model_metrics (ModelMetrics): Foreign key to model performance metrics
+        solver (str): Training algorithm the model was trained with
+        iterations (int): Number of training iterations, mini-batch steps for streaming training
+        converged (bool): Whether training stopped on a tolerance before the iteration limit
+        training_seconds (float): Wall time of the training
+        epochs (int): Number of passes over the training rows
     """
     id = fields.IntField(pk=True)
     hyper_params = fields.ForeignKeyField(
@@ -125,6 +146,89 @@ class Models(models.Model):
             related_name="models",
             on_delete=CASCADE,
         )
+    solver = fields.CharField(max_length=16, default="gd")
+    iterations = fields.IntField(default=0)
+    converged = fields.BooleanField(default=False)
+    training_seconds = fields.FloatField(default=0.0)
+    epochs = fields.IntField(default=0)
 
     class Meta:
         table = "models"
+
+
+class ModelRegistry(models.Model):
+    """
+    ModelRegistry model holding the pointer to the model version used for predictions.
+    
+    There is a single registry row. Every promotion or rollback increments
+    `version`, which lets running workers detect a swap with a cheap query.
+    
+    Attributes:
+        id (int): Primary key, always 1
+        active_model (Models): Foreign key to the model used for predictions
+        previous_model (Models): Foreign key to the previously active model, used for rollback
+        version (int): Counter incremented on every change of the active model
+        updated_at (datetime): Timestamp of the last change (auto-updated)
+    """
+    id = fields.IntField(pk=True)
+    active_model = fields.ForeignKeyField(
+            "models.Models",
+            related_name="active_in",
+            null=True,
+        )
+    previous_model = fields.ForeignKeyField(
+            "models.Models",
+            related_name="previous_in",
+            null=True,
+        )
+    version = fields.IntField(default=0)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "model_registry"
+
+
+class TrainingJobStatus(str, Enum):
+    """
+    Lifecycle states of a training job.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class TrainingJobs(models.Model):
+    """
+    TrainingJobs model for tracking background model training.
+    
+    Attributes:
+        id (int): Primary key, auto-generated job ID
+        status (TrainingJobStatus): Current state of the job (default: queued)
+        error (str): Error message if the job failed
+        created_at (datetime): Timestamp when the job was created (auto-generated)
+        started_at (datetime): Timestamp when training started
+        finished_at (datetime): Timestamp when the job finished or failed
+        trained_model (Models): Foreign key to the model published by the job
+        owner (str): Boot ID of the server process running the job
+        heartbeat_at (datetime): Last time the owner confirmed it is still running the job
+        bootstrap (bool): Whether the job was started because no model existed yet.
+                          Only one such job can be queued or running at a time
+    """
+    id = fields.IntField(pk=True)
+    status = fields.CharEnumField(TrainingJobStatus, default=TrainingJobStatus.QUEUED)
+    error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    started_at = fields.DatetimeField(null=True)
+    finished_at = fields.DatetimeField(null=True)
+    trained_model = fields.ForeignKeyField(
+            "models.Models",
+            related_name="training_jobs",
+            null=True,
+        )
+    owner = fields.CharField(max_length=64, null=True)
+    heartbeat_at = fields.DatetimeField(null=True)
+    bootstrap = fields.BooleanField(default=False)
+
+    class Meta:
+        table = "training_jobs"
@@ -11,6 +11,9 @@ class Predictions(models.Model):
         title (str): Descriptive title for the prediction (max 512 chars)
         prediction_inputs (PredictionInputs): Foreign key to input data used for prediction
         user (User): Foreign key to the user who made the prediction
+        
+    Indexes:
+        (user_id, created_at, id): Listing a user's predictions newest first with keyset pagination
     """
     id = fields.IntField(pk=True)
     prediction = fields.BooleanField()
@@ -29,6 +32,7 @@ class Predictions(models.Model):
 
     class Meta:
         table = "predictions"
+        indexes = (("user_id", "created_at", "id"),)
 
 class PredictionInputs(models.Model):
     """
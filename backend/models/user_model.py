@@ -11,9 +11,14 @@ class User(models.Model):
         last_name (str): User's last name (max 255 chars)
         password_hash (str): Bcrypt hashed password (max 255 chars)
         role (Role): Foreign key reference to user's role (user/admin)
+        role_version (int): Incremented on every role change, so role claims
+                            in tokens issued before the change are no longer trusted
         
     Related:
         predictions: One-to-many relationship with Predictions model
+        
+    Indexes:
+        username: Unique index, used by the lookup on every login
     """
     id = fields.IntField(pk=True)
     username = fields.CharField(max_length=255, null=False, unique=True)
@@ -25,6 +30,7 @@ class User(models.Model):
         related_name="users",
         null=True
     )
+    role_version = fields.IntField(default=0)
 
     class Meta:
         table = "users"
@@ -1,47 +1,141 @@
 from models import models_model
+from ML.model_cache import model_cache
+from ML.array_blob import PARAMS_DTYPE, encode_array
+from tortoise.transactions import in_transaction
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Q
+from tortoise import timezone
+from tortoise.expressions import F
 import json
 
+MODEL_RELATIONS = ("hyper_params", "params", "test_train_split", "model_metrics")
+UNFINISHED_JOB_STATUSES = [models_model.TrainingJobStatus.QUEUED, models_model.TrainingJobStatus.RUNNING]
+REGISTRY_ID = 1
+
 async def get_hyper_params():
     """
     Retrieve the machine learning model hyperparameters.
     
     Returns:
-        HyperParams: Object containing epochs and learning rate configuration
+        HyperParams: Object containing epochs, learning rate, solver and tolerance configuration
     """
     return await models_model.HyperParams.get(id=1)
 
-async def get_params():
+async def get_test_train_split():
     """
-    Retrieve the trained model parameters.
+    Retrieve the train/test split configuration.
     
     Returns:
-        Params: Object containing model weights, bias, and normalization parameters
+        TestTrainSplit: Object containing training and testing data split ratios
     """
-    return await models_model.Params.get(id=1)
+    return await models_model.TestTrainSplit.get(id=1)
 
-async def get_test_train_split():
+async def get_model(model_id: int):
     """
-    Retrieve the train/test split configuration.
+    Retrieve a model version with all related data.
     
+    Args:
+        model_id (int): The ID of the model version
+        
     Returns:
-        TestTrainSplit: Object containing training and testing data split ratios
+        Models|None: Complete model object with hyperparameters, parameters,
+                     train/test split, and performance metrics, None if not found
     """
-    return await models_model.TestTrainSplit.get(id=1)
+    return await models_model.Models.get_or_none(id=model_id).select_related(*MODEL_RELATIONS)
+
+async def get_models():
+    """
+    Retrieve all model versions with all related data.
+    
+    Returns:
+        list[Models]: Model versions ordered from oldest to newest
+    """
+    return await models_model.Models.all().order_by("id").select_related(*MODEL_RELATIONS)
+
+async def get_latest_model():
+    """
+    Retrieve the most recently created model version.
+    
+    Returns:
+        Models|None: The latest model, None if no model exists
+    """
+    return await models_model.Models.all().order_by("-id").first()
+
+async def get_registry():
+    """
+    Retrieve the model registry with the active model and its parameters.
+    
+    Returns:
+        ModelRegistry|None: The registry, None if no model was promoted yet
+    """
+    return await models_model.ModelRegistry.get_or_none(id=REGISTRY_ID, active_model_id__isnull=False).select_related("active_model__params")
+
+async def get_active_version():
+    """
+    Retrieve the version of the model registry.
+    
+    Used by the model cache as a cheap check whether the active model
+    was changed since it was loaded.
+    
+    Returns:
+        int|None: The registry version, None if no model was promoted yet
+    """
+    return await models_model.ModelRegistry.filter(id=REGISTRY_ID, active_model_id__isnull=False).first().values_list("version", flat=True)
+
+async def get_active_model():
+    """
+    Retrieve the model version used for predictions with all related data.
+    
+    Returns:
+        Models|None: The active model, None if no model was promoted yet
+    """
+    active_model_id = await models_model.ModelRegistry.filter(id=REGISTRY_ID).first().values_list("active_model_id", flat=True)
+    if active_model_id is None:
+        return None
+
+    return await get_model(active_model_id)
+
+async def promote_model(model_id: int):
+    """
+    Make a model version the one used for predictions.
+    
+    The registry row, created by `db.init.init_db`, is locked for the
+    update, so concurrent promotions and rollbacks are applied one after
+    another, also the first one.
+    
+    Args:
+        model_id (int): The ID of the model version to promote
+    """
+    async with in_transaction() as connection:
+        registry = await models_model.ModelRegistry.select_for_update().using_db(connection).get(id=REGISTRY_ID)
+        if registry.active_model_id != model_id:
+            await models_model.ModelRegistry.filter(id=REGISTRY_ID).using_db(connection).update(active_model_id=model_id, previous_model_id=registry.active_model_id, version=F("version") + 1)
+
+    model_cache.invalidate()
 
-async def get_model():
+async def rollback_model():
     """
-    Retrieve the complete model information with all related data.
+    Make the previously active model version the one used for predictions again.
     
     Returns:
-        Models: Complete model object with hyperparameters, parameters,
-                train/test split, and performance metrics
+        bool: True if the active model was changed, False if there is no previous model
     """
-    return await models_model.Models.get(id=1).select_related("hyper_params", "params", "test_train_split", "model_metrics")
+    async with in_transaction() as connection:
+        registry = await models_model.ModelRegistry.select_for_update().using_db(connection).get_or_none(id=REGISTRY_ID)
+        if registry is None or registry.previous_model_id is None:
+            return False
+
+        await models_model.ModelRegistry.filter(id=REGISTRY_ID).using_db(connection).update(active_model_id=registry.previous_model_id, previous_model_id=registry.active_model_id, version=F("version") + 1)
+
+    model_cache.invalidate()
+    return True
 
 async def set_params(weights, bias, x_mean, x_std):
     """
     Store trained model parameters in the database.
     
+    The arrays are stored as binary blobs of PARAMS_DTYPE values.
+    
     Args:
         weights: Model weights as numpy array
         bias (float): Model bias value
@@ -51,19 +145,15 @@ async def set_params(weights, bias, x_mean, x_std):
     Returns:
         Params: The created parameters object
     """
-    params = await models_model.Params.create(weights = json.dumps(weights.tolist()), bias = bias, x_mean = x_mean, x_std = x_std)
+    params = await models_model.Params.create(
+        weights = encode_array(weights, PARAMS_DTYPE),
+        bias = bias,
+        x_mean = encode_array(x_mean, PARAMS_DTYPE),
+        x_std = encode_array(x_std, PARAMS_DTYPE)
+    )
     return params
 
-async def get_model_metrics():
-    """
-    Retrieve the model performance metrics.
-    
-    Returns:
-        ModelMetrics: Object containing accuracy, precision, recall, F1-score, and confusion matrix
-    """
-    return await models_model.ModelMetrics.get(id=1)
-
-async def set_model_metrics(accuracy, precision, f1_score, recall, confusion_matrix):
+async def set_model_metrics(accuracy, precision, f1_score, recall, confusion_matrix, roc_auc=0.0, average_precision=0.0, roc_curve=None, pr_curve=None):
     """
     Store model performance metrics in the database.
     
@@ -73,25 +163,131 @@ async def set_model_metrics(accuracy, precision, f1_score, recall, confusion_mat
         f1_score (float): Model F1-score
         recall (float): Model recall score
         confusion_matrix: Confusion matrix as numpy array
+        roc_auc (float): Area under the ROC curve
+        average_precision (float): Area under the precision-recall curve
+        roc_curve (dict): ROC curve as {"fpr", "tpr", "thresholds"} lists
+        pr_curve (dict): Precision-recall curve as {"precision", "recall", "thresholds"} lists
         
     Returns:
         ModelMetrics: The created model metrics object
     """
-    return await models_model.ModelMetrics.create(accuracy=accuracy, precision=precision, f1_score=f1_score, recall=recall, confusion_matrix=json.dumps(confusion_matrix.tolist()))
+    return await models_model.ModelMetrics.create(
+        accuracy=accuracy,
+        precision=precision,
+        f1_score=f1_score,
+        recall=recall,
+        confusion_matrix=json.dumps(confusion_matrix.tolist()),
+        roc_auc=roc_auc,
+        average_precision=average_precision,
+        roc_curve=roc_curve,
+        pr_curve=pr_curve,
+    )
 
-async def add_model():
+async def add_model(params: models_model.Params, model_metrics: models_model.ModelMetrics, solver: str = "gd", iterations: int = 0, converged: bool = False, training_seconds: float = 0.0, epochs: int = 0):
     """
     Create a complete model record linking all model components.
     
     This function creates a Models record that links together the hyperparameters,
-    trained parameters, train/test split configuration, and performance metrics.
+    trained parameters, train/test split configuration, and performance metrics,
+    and records how the training run went.
     
+    Args:
+        params (models_model.Params): The trained parameters of the model
+        model_metrics (models_model.ModelMetrics): The performance metrics of the model
+        solver (str): Training algorithm the model was trained with
+        iterations (int): Number of training iterations
+        converged (bool): Whether training stopped on a tolerance before the iteration limit
+        training_seconds (float): Wall time of the training
+        epochs (int): Number of passes over the training rows
+        
     Returns:
         Models: The created complete model object
     """
     hp = await get_hyper_params()
-    p = await get_params()
     train_test = await get_test_train_split()
-    mm = await get_model_metrics()
-    model = await models_model.Models.create(model_metrics=mm, hyper_params=hp, params=p, test_train_split=train_test)
+    model = await models_model.Models.create(
+        model_metrics=model_metrics,
+        hyper_params=hp,
+        params=params,
+        test_train_split=train_test,
+        solver=solver,
+        iterations=iterations,
+        converged=converged,
+        training_seconds=training_seconds,
+        epochs=epochs,
+    )
     return model
+
+async def create_training_job(owner: str, bootstrap: bool = False):
+    """
+    Create a new training job in the queued state.
+    
+    Args:
+        owner (str): Boot ID of the server process that runs the job
+        bootstrap (bool): Whether the job trains the first model (default: False)
+    
+    Returns:
+        TrainingJobs|None: The created training job, None if another bootstrap job is already queued or running
+    """
+    try:
+        return await models_model.TrainingJobs.create(owner=owner, heartbeat_at=timezone.now(), bootstrap=bootstrap)
+    except IntegrityError:
+        if not bootstrap:
+            raise
+        return None
+
+async def get_training_job(job_id: int):
+    """
+    Retrieve a training job by its ID.
+    
+    Args:
+        job_id (int): The ID of the training job
+        
+    Returns:
+        TrainingJobs|None: The training job if found, None otherwise
+    """
+    return await models_model.TrainingJobs.get_or_none(id=job_id)
+
+async def update_training_job(job_id: int, **fields):
+    """
+    Update the state of a training job.
+    
+    Args:
+        job_id (int): The ID of the training job
+        **fields: Field values to set (e.g. status, started_at, error)
+    """
+    await models_model.TrainingJobs.filter(id=job_id).update(**fields)
+
+async def renew_training_jobs(owner: str):
+    """
+    Record that a server process is still running its unfinished training jobs.
+    
+    Args:
+        owner (str): Boot ID of the server process
+        
+    Returns:
+        int: Number of renewed jobs
+    """
+    return await models_model.TrainingJobs.filter(owner=owner, status__in=UNFINISHED_JOB_STATUSES).update(heartbeat_at=timezone.now())
+
+async def fail_abandoned_training_jobs(expired_before):
+    """
+    Mark training jobs of server processes that stopped as failed.
+    
+    Training runs inside the process pool of the server process that
+    created the job, so a job can never finish once that process is gone.
+    Running processes renew their jobs regularly (see `renew_training_jobs`),
+    so queued or running jobs that weren't renewed since `expired_before`
+    are abandoned. Jobs created before owners were recorded have no
+    heartbeat and are abandoned as well.
+    
+    Args:
+        expired_before (datetime): Jobs last renewed before this time are abandoned
+        
+    Returns:
+        int: Number of jobs marked as failed
+    """
+    return await models_model.TrainingJobs.filter(
+        Q(heartbeat_at__lt=expired_before) | Q(heartbeat_at__isnull=True),
+        status__in=UNFINISHED_JOB_STATUSES,
+    ).update(status=models_model.TrainingJobStatus.FAILED, error="Interrupted by server restart")
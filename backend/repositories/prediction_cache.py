@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from core import metrics
+import os
+
+PREDICTION_CACHE_ENABLED = os.environ.get("PREDICTION_CACHE", "0") == "1"
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", "10000"))
+
+hits_counter = metrics.counter("prediction_cache_hits", "Predictions served from the prediction cache")
+misses_counter = metrics.counter("prediction_cache_misses", "Predictions that had to be scored and have their input stored")
+
+class PredictionCache:
+    """
+    Process-wide cache of prediction decisions, keyed by model version and input.
+
+    Partner integrations resubmit identical applications, so the decision
+    and the ID of the stored `PredictionInputs` row are kept for every
+    input that was scored. A resubmission is answered from the cache and
+    its prediction record references the existing input row instead of a
+    new copy. Entries are keyed by the registry version of the model that
+    made the decision, so promoting or rolling back a model never serves a
+    decision of another model. The least recently used entries are dropped
+    once `max_size` inputs are cached.
+
+    Attributes:
+        max_size (int): Maximum number of cached inputs
+    """
+    def __init__(self, max_size=PREDICTION_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of cached inputs (default: PREDICTION_CACHE_SIZE or 10000)
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def key(model_version, features):
+        """
+        Build the cache key of a prediction input.
+
+        Boolean features are normalized to integers, so inputs that only
+        differ in the type of equal values share an entry.
+
+        Args:
+            model_version: Registry version of the model scoring the input
+            features (list): Feature values in the order the model was trained on
+
+        Returns:
+            tuple: The hashable cache key
+        """
+        return (model_version, tuple(int(value) for value in features))
+
+    def get(self, key):
+        """
+        Get the cached decision of an input.
+
+        Args:
+            key (tuple): Key built with `PredictionCache.key`
+
+        Returns:
+            tuple[bool, int]|None: The decision and the ID of the stored input row, None if it isn't cached
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            misses_counter.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        hits_counter.inc()
+        return entry
+
+    def store(self, key, prediction: bool, prediction_inputs_id: int):
+        """
+        Cache the decision of a scored input.
+
+        Args:
+            key (tuple): Key built with `PredictionCache.key`
+            prediction (bool): The decision
+            prediction_inputs_id (int): The ID of the stored input row
+        """
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = (prediction, prediction_inputs_id)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop all cached decisions.
+        """
+        self._entries.clear()
+
+prediction_cache = PredictionCache()
@@ -1,19 +1,62 @@
 from models import predictions_model
 from schemas import prediction_schema
 from models import user_model, predictions_model
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+from tortoise.expressions import Q
+from pypika_tortoise import Table, Parameter
 
-async def insert_prediction_input(prediction_data: prediction_schema.PredictionCreate):
+BULK_INSERT_BATCH_SIZE = 1000
+
+async def _bulk_insert(instances: list, connection):
+    """
+    Insert model instances with multi-row INSERT statements and set their IDs.
+    
+    Unlike `bulk_create`, the generated primary keys are read back with
+    `RETURNING`, so the instances can be referenced by foreign keys and
+    returned in API responses.
+    
+    Args:
+        instances (list): Unsaved model instances of the same model
+        connection: Database connection or transaction to execute the statements on
+    
+    Returns:
+        list: The same instances with their primary keys populated
     """
-    Store prediction input data in the database.
+    if not instances:
+        return instances
+
+    meta = instances[0]._meta
+    table = Table(meta.db_table)
+    fields = [name for name in meta.fields_db_projection if not meta.fields_map[name].generated]
+    columns = [meta.fields_db_projection[name] for name in fields]
+
+    for start in range(0, len(instances), BULK_INSERT_BATCH_SIZE):
+        batch = instances[start:start + BULK_INSERT_BATCH_SIZE]
+        query = connection.query_class.into(table).columns(*columns)
+        values = []
+        for instance in batch:
+            query = query.insert(*[Parameter(idx=len(values) + i + 1) for i in range(len(fields))])
+            values.extend(meta.fields_map[name].to_db_value(getattr(instance, name), instance) for name in fields)
+
+        rows = await connection.execute_query_dict(query.returning(meta.db_pk_column).get_sql(), values)
+        for instance, row in zip(batch, rows):
+            instance.pk = row[meta.db_pk_column]
+            instance._saved_in_db = True
+
+    return instances
+
+def _prediction_inputs(prediction_data: prediction_schema.PredictionCreate):
+    """
+    Build an unsaved prediction input record from the request data.
     
     Args:
         prediction_data (prediction_schema.PredictionCreate): Input data for loan prediction
-                                                              including financial and personal information
     
     Returns:
-        PredictionInputs: The created prediction input record
+        PredictionInputs: The unsaved prediction input record
     """
-    return await predictions_model.PredictionInputs.create(
+    return predictions_model.PredictionInputs(
         no_of_dependents = prediction_data.no_of_dependents,
         education = prediction_data.education,
         self_employed = prediction_data.self_employed,
@@ -27,32 +70,157 @@ async def insert_prediction_input(prediction_data: prediction_schema.PredictionC
         bank_asset_value = prediction_data.bank_asset_value
     )
 
-async def insert_prediction(prediction: bool, user: user_model.User, prediction_inputs: predictions_model.PredictionInputs, title: str):
+def _insert_values(instance):
+    """
+    Get the columns and database values of an unsaved model instance.
+    
+    Args:
+        instance: Unsaved model instance
+    
+    Returns:
+        tuple[list[str], list]: The column names and their values, generated columns excluded
+    """
+    meta = instance._meta
+    fields = [name for name in meta.fields_db_projection if not meta.fields_map[name].generated]
+    return [meta.fields_db_projection[name] for name in fields], [meta.fields_map[name].to_db_value(getattr(instance, name), instance) for name in fields]
+
+async def insert_prediction_with_input(prediction: bool, user: user_model.User, prediction_data: prediction_schema.PredictionCreate):
     """
-    Store a prediction result in the database.
+    Store a prediction result together with its input data.
+    
+    On PostgreSQL both rows are written by a single statement, with the
+    input row inserted in a CTE whose generated ID the prediction row
+    references. Other databases insert the two rows in one transaction.
     
     Args:
         prediction (bool): The prediction result (True for approved, False for rejected)
         user (user_model.User): The user who made the prediction request
-        prediction_inputs (predictions_model.PredictionInputs): The input data used for prediction
-        title (str): A descriptive title for the prediction
+        prediction_data (prediction_schema.PredictionCreate): Input data used for the prediction
     
     Returns:
-        Predictions: The created prediction record
+        Predictions: The created prediction record with its input data
     """
-    return await predictions_model.Predictions.create(prediction=prediction, user=user, prediction_inputs=prediction_inputs, title=title)
+    prediction_inputs = _prediction_inputs(prediction_data)
+    prediction_record = predictions_model.Predictions(prediction=bool(prediction), user=user, title=prediction_data.title)
 
-async def get_predictions(user: user_model.User):
+    connection = Tortoise.get_connection("default")
+    if connection.capabilities.dialect != "postgres":
+        async with in_transaction() as connection:
+            await _bulk_insert([prediction_inputs], connection)
+            prediction_record.prediction_inputs = prediction_inputs
+            await _bulk_insert([prediction_record], connection)
+        return prediction_record
+
+    input_columns, input_values = _insert_values(prediction_inputs)
+    prediction_columns, prediction_values = _insert_values(prediction_record)
+    prediction_values = [value for column, value in zip(prediction_columns, prediction_values) if column != "prediction_inputs_id"]
+    prediction_columns = [column for column in prediction_columns if column != "prediction_inputs_id"]
+
+    input_columns = ", ".join(f'"{column}"' for column in input_columns)
+    prediction_columns = ", ".join(f'"{column}"' for column in prediction_columns)
+    input_params = ", ".join(f"${i}" for i in range(1, len(input_values) + 1))
+    prediction_params = ", ".join(f"${i}" for i in range(len(input_values) + 1, len(input_values) + len(prediction_values) + 1))
+    rows = await connection.execute_query_dict(
+        f'WITH "input" AS (INSERT INTO "prediction_input" ({input_columns}) VALUES ({input_params}) RETURNING "id") '
+        f'INSERT INTO "predictions" ({prediction_columns}, "prediction_inputs_id") '
+        f'VALUES ({prediction_params}, (SELECT "id" FROM "input")) RETURNING "id", "prediction_inputs_id"',
+        [*input_values, *prediction_values],
+    )
+
+    prediction_inputs.pk = rows[0]["prediction_inputs_id"]
+    prediction_inputs._saved_in_db = True
+    prediction_record.prediction_inputs = prediction_inputs
+    prediction_record.pk = rows[0]["id"]
+    prediction_record._saved_in_db = True
+    return prediction_record
+
+async def insert_prediction_for_input(prediction: bool, user: user_model.User, prediction_data: prediction_schema.PredictionCreate, prediction_inputs_id: int):
     """
-    Retrieve all predictions for a specific user.
+    Store a prediction result referencing an already stored input record.
+
+    Args:
+        prediction (bool): The prediction result (True for approved, False for rejected)
+        user (user_model.User): The user who made the prediction request
+        prediction_data (prediction_schema.PredictionCreate): Input data used for the prediction
+        prediction_inputs_id (int): The ID of the stored input record with the same data
+
+    Returns:
+        Predictions: The created prediction record with its input data
+    """
+    prediction_inputs = _prediction_inputs(prediction_data)
+    prediction_inputs.pk = prediction_inputs_id
+    prediction_inputs._saved_in_db = True
+    prediction_record = predictions_model.Predictions(prediction=bool(prediction), user=user, prediction_inputs=prediction_inputs, title=prediction_data.title)
+
+    await _bulk_insert([prediction_record], Tortoise.get_connection("default"))
+    return prediction_record
+
+async def insert_predictions_bulk(predictions: list[bool], user: user_model.User, predictions_data: list[prediction_schema.PredictionCreate]):
+    """
+    Store a batch of prediction inputs and results in one transaction.
+    
+    All input records are written first with bulk inserts, followed by the
+    prediction records referencing them.
     
     Args:
-        user (user_model.User): The user whose predictions to retrieve
+        predictions (list[bool]): The prediction results, in the same order as predictions_data
+        user (user_model.User): The user who made the prediction request
+        predictions_data (list[prediction_schema.PredictionCreate]): Input data for each prediction
     
     Returns:
-        list[Predictions]: List of prediction records with related user and input data
+        list[Predictions]: The created prediction records with their input data
     """
-    return await predictions_model.Predictions.all().filter(user=user).select_related("user__role", "prediction_inputs")
+    async with in_transaction() as connection:
+        prediction_inputs = await _bulk_insert([_prediction_inputs(prediction_data) for prediction_data in predictions_data], connection)
+
+        return await _bulk_insert([
+            predictions_model.Predictions(prediction=bool(prediction), user=user, prediction_inputs=prediction_input, title=prediction_data.title)
+            for prediction, prediction_input, prediction_data in zip(predictions, prediction_inputs, predictions_data)
+        ], connection)
+
+async def insert_prediction_records(records: list[tuple]):
+    """
+    Store prediction records of any users in one transaction.
+    
+    Used by the write-behind buffer, which collects the records of many
+    requests and writes them together.
+    
+    Args:
+        records (list[tuple]): Tuples of (prediction, user_id, prediction_data, created_at)
+    """
+    async with in_transaction() as connection:
+        prediction_inputs = await _bulk_insert([_prediction_inputs(prediction_data) for _, _, prediction_data, _ in records], connection)
+        await _bulk_insert([
+            predictions_model.Predictions(prediction=bool(prediction), user_id=user_id, prediction_inputs=prediction_input, title=prediction_data.title, created_at=created_at)
+            for (prediction, user_id, prediction_data, created_at), prediction_input in zip(records, prediction_inputs)
+        ], connection)
+
+async def get_predictions(user_id: int, limit: int, cursor: tuple | None = None, with_inputs: bool = True):
+    """
+    Retrieve one page of a user's predictions, newest first.
+    
+    Uses keyset pagination on (created_at, id), so every page costs the same
+    no matter how deep it is.
+    
+    Args:
+        user_id (int): The ID of the user whose predictions to retrieve
+        limit (int): Maximum number of predictions to return
+        cursor (tuple|None): (created_at, id) of the last prediction of the previous page
+        with_inputs (bool): Whether to join the prediction input data
+    
+    Returns:
+        list[Predictions]: List of prediction records, with input data if requested
+    """
+    query = predictions_model.Predictions.filter(user_id=user_id)
+    if cursor is not None:
+        created_at, prediction_id = cursor
+        query = query.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=prediction_id))
+
+    query = query.order_by("-created_at", "-id").limit(limit)
+    if with_inputs:
+        query = query.select_related("prediction_inputs")
+
+    return await query
 
 async def delete_prediction(prediction_id: int):
     """
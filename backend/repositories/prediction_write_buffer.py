@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import os
+import time
+from core import metrics
+from repositories import prediction_repository
+
+WRITE_BEHIND_MAX_QUEUE = int(os.environ.get("PREDICTION_WRITE_BEHIND_MAX_QUEUE", "10000"))
+WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("PREDICTION_WRITE_BEHIND_BATCH_SIZE", "500"))
+WRITE_BEHIND_FLUSH_MS = float(os.environ.get("PREDICTION_WRITE_BEHIND_FLUSH_MS", "200"))
+FLUSH_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+queue_depth_gauge = metrics.gauge("prediction_write_behind_queue_depth", "Prediction records waiting to be written")
+flush_latency_histogram = metrics.histogram(
+    "prediction_write_behind_flush_ms",
+    [5, 10, 25, 50, 100, 250, 500, 1000, 2500],
+    "Time to write one batch of buffered prediction records in milliseconds",
+)
+flushed_counter = metrics.counter("prediction_write_behind_flushed", "Prediction records written by the write-behind buffer")
+dropped_counter = metrics.counter("prediction_write_behind_dropped", "Prediction records dropped after all write attempts failed")
+
+class PredictionWriteBuffer:
+    """
+    Write-behind buffer for prediction records.
+
+    Requests put their records into a bounded in-memory buffer and return
+    immediately. A background task writes the buffered records with bulk
+    inserts when `batch_size` records are waiting or `flush_interval` has
+    passed. When the buffer is full, `put` waits until a flush frees space,
+    which slows producers down instead of growing memory. `stop` writes
+    everything that is still buffered.
+
+    Attributes:
+        max_queue (int): Maximum number of records buffered or being written
+        batch_size (int): Number of records that triggers a flush and the maximum batch written at once
+        flush_interval (float): Maximum time in seconds a record waits before a flush
+    """
+    def __init__(self, max_queue=WRITE_BEHIND_MAX_QUEUE, batch_size=WRITE_BEHIND_BATCH_SIZE, flush_interval_ms=WRITE_BEHIND_FLUSH_MS):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_queue (int): Maximum number of buffered records (default: PREDICTION_WRITE_BEHIND_MAX_QUEUE or 10000)
+            batch_size (int): Flush size (default: PREDICTION_WRITE_BEHIND_BATCH_SIZE or 500)
+            flush_interval_ms (float): Flush interval in milliseconds (default: PREDICTION_WRITE_BEHIND_FLUSH_MS or 200)
+        """
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._records = []
+        self._depth = 0
+        self._slots = None
+        self._flush_now = None
+        self._task = None
+        self._stopping = False
+
+    def start(self):
+        """
+        Start the background flush task on the running event loop.
+        """
+        self._slots = asyncio.Semaphore(self.max_queue)
+        self._flush_now = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop accepting records and write everything that is still buffered.
+        """
+        if self._task is None:
+            return
+
+        self._stopping = True
+        self._flush_now.set()
+        await self._task
+        self._task = None
+
+    async def put(self, record):
+        """
+        Buffer a prediction record for writing.
+
+        Waits while the buffer is full. A record whose wait ends after `stop`
+        was called is rejected, since the final flush may already be done.
+
+        Args:
+            record (tuple): Tuple of (prediction, user_id, prediction_data, created_at)
+
+        Raises:
+            RuntimeError: If the buffer is not running
+        """
+        if self._task is None or self._stopping:
+            raise RuntimeError("Prediction write buffer is not running")
+
+        await self._slots.acquire()
+        if self._stopping:
+            self._slots.release()
+            raise RuntimeError("Prediction write buffer is not running")
+
+        self._records.append(record)
+        self._depth += 1
+        queue_depth_gauge.set(self._depth)
+        if len(self._records) >= self.batch_size:
+            self._flush_now.set()
+
+    async def _run(self):
+        """
+        Flush the buffered records until the buffer is stopped.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+
+            while self._records:
+                batch = self._records[:self.batch_size]
+                del self._records[:self.batch_size]
+                await self._flush(batch)
+                for _ in batch:
+                    self._slots.release()
+                self._depth -= len(batch)
+                queue_depth_gauge.set(self._depth)
+
+            if self._stopping:
+                return
+
+    async def _flush(self, batch):
+        """
+        Write one batch of records, retrying failed writes.
+
+        When the last attempt fails too, the batch is split up so that only
+        the records that can't be written are dropped (see `_write_split`).
+
+        Args:
+            batch (list[tuple]): The records to write
+        """
+        for attempt in range(1, FLUSH_ATTEMPTS + 1):
+            start = time.perf_counter()
+            try:
+                await prediction_repository.insert_prediction_records(batch)
+            except Exception as e:
+                logger.exception("Writing %d prediction records failed (attempt %d/%d)", len(batch), attempt, FLUSH_ATTEMPTS)
+                if attempt < FLUSH_ATTEMPTS:
+                    await asyncio.sleep(self.flush_interval * attempt)
+                    continue
+                error = e
+            else:
+                flush_latency_histogram.observe((time.perf_counter() - start) * 1000)
+                flushed_counter.inc(len(batch))
+                return
+
+        flushed_counter.inc(await self._write_split(batch, error))
+
+    async def _write_split(self, records, error):
+        """
+        Write records whose batch insert failed, dropping only the records that fail on their own.
+
+        Writes each half of the records in its own transaction and splits
+        the halves that fail again, so a record that can never be written
+        (e.g. of a user deleted in the meantime, or with a value out of the
+        column's range) costs a few extra inserts instead of its whole
+        batch. Every dropped record is logged with the error of its insert.
+
+        Args:
+            records (list[tuple]): The records to write
+            error (Exception): The error of writing them together
+
+        Returns:
+            int: Number of records written
+        """
+        if len(records) == 1:
+            _, user_id, prediction_data, created_at = records[0]
+            logger.error("Dropping prediction record %r of user %s created at %s: %s", prediction_data.title, user_id, created_at, error)
+            dropped_counter.inc()
+            return 0
+
+        written = 0
+        middle = len(records) // 2
+        for half in (records[:middle], records[middle:]):
+            try:
+                await prediction_repository.insert_prediction_records(half)
+                written += len(half)
+            except Exception as e:
+                written += await self._write_split(half, e)
+        return written
+
+prediction_write_buffer = PredictionWriteBuffer()
@@ -0,0 +1,207 @@
+from collections import OrderedDict
+from types import MappingProxyType
+from core import metrics
+import os
+import time
+
+USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "10000"))
+ROLE_VERSION_TTL = float(os.environ.get("ROLE_VERSION_TTL_SECONDS", "5"))
+
+hits_counter = metrics.counter("user_cache_hits", "User lookups served from the user cache")
+misses_counter = metrics.counter("user_cache_misses", "User lookups that had to query the database")
+hit_ratio_gauge = metrics.gauge("user_cache_hit_ratio", "Share of user lookups served from the user cache")
+
+class UserCache:
+    """
+    Process-wide cache of users with their role, keyed by user ID.
+
+    Nearly every service call starts with loading the calling user and their
+    role, so the result of that lookup is kept for `ttl` seconds. Writes that
+    go through `user_repository` invalidate the affected entry right away;
+    the TTL bounds how long other worker processes can see stale data.
+    The least recently used entries are dropped once `max_size` users are
+    cached.
+
+    Users are kept as read-only rows, so callers build their own instances
+    and changing one doesn't change the cache. A lookup that misses takes
+    the `generation` before it queries the database and passes it to
+    `store`, which drops the row if the user was invalidated in between,
+    since the row may predate the write that invalidated it.
+
+    Attributes:
+        ttl (float): Number of seconds an entry is served before it's loaded again
+        max_size (int): Maximum number of cached users
+    """
+    def __init__(self, ttl=USER_CACHE_TTL, max_size=USER_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl (float): Entry lifetime in seconds (default: USER_CACHE_TTL_SECONDS or 30)
+            max_size (int): Maximum number of cached users (default: USER_CACHE_SIZE or 10000)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._invalidated = {}
+        self._untracked_before = 0
+
+    def get(self, user_id: int):
+        """
+        Get a cached user.
+
+        Args:
+            user_id (int): The user ID
+
+        Returns:
+            Mapping|None: The read-only user row with the `role_name` of their role,
+                          None if it isn't cached or expired
+        """
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            row, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(user_id)
+                self._count(hit=True)
+                return row
+            del self._entries[user_id]
+
+        self._count(hit=False)
+        return None
+
+    def generation(self):
+        """
+        Get the current invalidation generation, to be passed to `store` after a database read.
+
+        Returns:
+            int: The number of invalidations so far
+        """
+        return self._generation
+
+    def store(self, row: dict, generation: int = None):
+        """
+        Cache a user row loaded from the database.
+
+        Args:
+            row (dict): Columns of the users table plus the `role_name` of the user's role
+            generation (int|None): `generation()` before the row was read, None for a row
+                                   written by the caller itself
+        """
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        user_id = row["id"]
+        if generation is not None and (generation < self._untracked_before or self._invalidated.get(user_id, 0) > generation):
+            return
+
+        self._entries[user_id] = (MappingProxyType(dict(row)), time.monotonic() + self.ttl)
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        """
+        Drop a user from the cache and keep reads in flight from caching them again.
+
+        The generation of the last invalidation is remembered for up to
+        `max_size` users. Beyond that they are forgotten, and reads that
+        started before are then not cached for any user.
+
+        Args:
+            user_id (int): The user ID
+        """
+        self._entries.pop(user_id, None)
+        if len(self._invalidated) >= max(1, self.max_size):
+            self._invalidated.clear()
+            self._untracked_before = self._generation
+        self._generation += 1
+        self._invalidated[user_id] = self._generation
+
+    def clear(self):
+        """
+        Drop all cached users.
+        """
+        self._entries.clear()
+        self._invalidated.clear()
+        self._generation += 1
+        self._untracked_before = self._generation
+
+    def _count(self, hit: bool):
+        """
+        Update the hit and miss counters.
+
+        Args:
+            hit (bool): Whether the lookup was served from the cache
+        """
+        if hit:
+            hits_counter.inc()
+        else:
+            misses_counter.inc()
+        hit_ratio_gauge.set(hits_counter.value / (hits_counter.value + misses_counter.value))
+
+user_cache = UserCache()
+
+class RoleVersionCache:
+    """
+    Process-wide cache of the role versions of users.
+
+    Role claims in access tokens are trusted only while the role version in
+    the token matches the current one. Versions are kept for `ttl` seconds,
+    so admin checks of an active user query the database at most once per
+    interval. `user_repository.update_user_role` drops the entry right away,
+    other worker processes see the change within `ttl` seconds.
+
+    Attributes:
+        ttl (float): Number of seconds a version is served before it's loaded again
+    """
+    def __init__(self, ttl=ROLE_VERSION_TTL):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl (float): Entry lifetime in seconds (default: ROLE_VERSION_TTL_SECONDS or 5)
+        """
+        self.ttl = ttl
+        self._entries = {}
+
+    def get(self, user_id: int):
+        """
+        Get the cached role version of a user.
+
+        Args:
+            user_id (int): The user ID
+
+        Returns:
+            int|None: The role version, None if it isn't cached or expired
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or time.monotonic() >= entry[1]:
+            return None
+        return entry[0]
+
+    def store(self, user_id: int, role_version: int):
+        """
+        Cache the role version of a user.
+
+        The cache is emptied when it already holds USER_CACHE_SIZE users.
+
+        Args:
+            user_id (int): The user ID
+            role_version (int): The current role version
+        """
+        if self.ttl > 0:
+            if len(self._entries) >= USER_CACHE_SIZE:
+                self._entries.clear()
+            self._entries[user_id] = (role_version, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id: int):
+        """
+        Drop the role version of a user from the cache.
+
+        Args:
+            user_id (int): The user ID
+        """
+        self._entries.pop(user_id, None)
+
+role_version_cache = RoleVersionCache()
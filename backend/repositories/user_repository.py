@@ -1,5 +1,8 @@
 from models import user_model, role_model
 from schemas import user_schema
+from repositories.user_cache import user_cache, role_version_cache
+from tortoise.expressions import F
+from tortoise import Tortoise
 
 async def get_user_by_username(username: str):
     """
@@ -16,21 +19,35 @@ async def get_user_by_username(username: str):
     except:
         return None
 
-async def get_user_by_id(user_id: int):
+async def get_user_by_id(user_id: int, use_cache: bool = True):
     """
     Retrieve a user by their ID.
     
+    Users are served from the shared user cache when possible and stored
+    in it after loading them from the database, unless they were
+    invalidated while the query ran. Every call returns its own instance.
+    
     Args:
         user_id (int): The user ID to search for
+        use_cache (bool): Whether a cached user may be returned, False to always
+                          read the current user from the database (default: True)
         
     Returns:
         User|None: User object with role information if found, None otherwise
     """
+    row = user_cache.get(user_id) if use_cache else None
+    if row is not None:
+        return _user_from_row(row)
+
+    generation = user_cache.generation()
     try:
-        return await user_model.User.all().select_related("role").get(id=user_id)
+        user = await user_model.User.all().select_related("role").get(id=user_id)
     except:
         return None
 
+    user_cache.store(_user_row(user), generation)
+    return user
+
 async def create_user(username: str, first_name: str, last_name: str, password_hash: str):
     """
     Create a new user with default 'user' role.
@@ -50,22 +67,81 @@ async def create_user(username: str, first_name: str, last_name: str, password_h
 
 async def delete_user(user_id: int):
     """
-    Delete a user by their ID.
+    Delete a user by their ID and drop them from the user cache.
     
     Args:
         user_id (int): The ID of the user to delete
     """
     await user_model.User.filter(id=user_id).delete()
+    user_cache.invalidate(user_id)
+    role_version_cache.invalidate(user_id)
+
+def _user_row(user: user_model.User):
+    """
+    Get the row of a user with its role, the inverse of `_user_from_row`.
+    
+    Args:
+        user (User): User object with role information
+        
+    Returns:
+        dict: Columns of the users table plus the `role_name` of the user's role
+    """
+    row = {column: getattr(user, field) for field, column in user_model.User._meta.fields_db_projection.items()}
+    row["role_name"] = user.role.role_name if user.role_id is not None else None
+    return row
+
+def _user_from_row(row: dict):
+    """
+    Build a user with its role from a row returned by a raw query or the user cache.
+    
+    Args:
+        row (dict): Columns of the users table plus the `role_name` of the user's role
+        
+    Returns:
+        User: User object with role information
+    """
+    row = dict(row)
+    role_name = row.pop("role_name")
+    user = user_model.User._init_from_db(**row)
+    user.role = role_model.Role._init_from_db(id=user.role_id, role_name=role_name) if user.role_id is not None else None
+    return user
 
 async def update_user(user_id: int, user_data: user_schema.UserUpdate):
     """
-    Update user information.
+    Update user information and return the updated user.
+    
+    On PostgreSQL the update and the read of the updated user with its role
+    are a single `UPDATE ... RETURNING` statement. Other databases update
+    and then read the user back. The updated user replaces the cached one.
     
     Args:
         user_id (int): The ID of the user to update
         user_data (user_schema.UserUpdate): The updated user data
+        
+    Returns:
+        User|None: The updated user object with role information, None if the user does not exist
     """
-    await user_model.User.filter(id=user_id).update(**user_data.dict(exclude_unset=True))
+    fields = user_data.dict(exclude_unset=True)
+    if not fields:
+        return await get_user_by_id(user_id)
+
+    connection = Tortoise.get_connection("default")
+    if connection.capabilities.dialect == "postgres":
+        assignments = ", ".join(f'"{name}" = ${i}' for i, name in enumerate(fields, start=1))
+        rows = await connection.execute_query_dict(
+            f'WITH "updated" AS (UPDATE "users" SET {assignments} WHERE "id" = ${len(fields) + 1} RETURNING *) '
+            'SELECT "updated".*, "roles"."role_name" FROM "updated" LEFT JOIN "roles" ON "roles"."id" = "updated"."role_id"',
+            [*fields.values(), user_id],
+        )
+        user = _user_from_row(rows[0]) if rows else None
+    else:
+        await user_model.User.filter(id=user_id).update(**fields)
+        user = await user_model.User.all().select_related("role").get_or_none(id=user_id)
+
+    user_cache.invalidate(user_id)
+    if user is not None:
+        user_cache.store(_user_row(user))
+    return user
 
 async def get_all_users():
     """
@@ -78,15 +154,61 @@ async def get_all_users():
 
 async def update_user_role(user_id: int, role_id: int):
     """
-    Update a user's role.
+    Update a user's role and return the updated user.
+    
+    The role version of the user is incremented, so role claims in tokens
+    issued before the change are no longer trusted. On PostgreSQL the role
+    lookup, the update and the read of the updated user are a single
+    `UPDATE ... RETURNING` statement. Other databases run them one by one.
+    The updated user replaces the cached one.
     
     Args:
         user_id (int): The ID of the user to update
         role_id (int): The ID of the new role to assign
         
     Returns:
-        User: The updated user object
+        User|None: The updated user object with role information, None if the user or role does not exist
+    """
+    connection = Tortoise.get_connection("default")
+    if connection.capabilities.dialect == "postgres":
+        rows = await connection.execute_query_dict(
+            'WITH "role" AS (SELECT "id", "role_name" FROM "roles" WHERE "id" = $1), '
+            '"updated" AS (UPDATE "users" SET "role_id" = "role"."id", "role_version" = "users"."role_version" + 1 '
+            'FROM "role" WHERE "users"."id" = $2 RETURNING "users".*) '
+            'SELECT "updated".*, "role"."role_name" FROM "updated" CROSS JOIN "role"',
+            [role_id, user_id],
+        )
+        user = _user_from_row(rows[0]) if rows else None
+    else:
+        role = await role_model.Role.get_or_none(id=role_id)
+        user = None
+        if role is not None and await user_model.User.filter(id=user_id).update(role=role, role_version=F("role_version") + 1):
+            user = await user_model.User.all().select_related("role").get(id=user_id)
+
+    user_cache.invalidate(user_id)
+    role_version_cache.invalidate(user_id)
+    if user is not None:
+        user_cache.store(_user_row(user))
+        role_version_cache.store(user.id, user.role_version)
+    return user
+
+async def get_role_version(user_id: int):
+    """
+    Retrieve the current role version of a user.
+    
+    Versions are served from the role version cache when possible.
+    
+    Args:
+        user_id (int): The user ID
+        
+    Returns:
+        int|None: The role version if the user exists, None otherwise
     """
-    role = await role_model.Role.get(id=role_id)
-    await user_model.User.filter(id=user_id).update(role=role)
-    return await user_model.User.get(id=user_id)
+    role_version = role_version_cache.get(user_id)
+    if role_version is not None:
+        return role_version
+
+    role_version = await user_model.User.filter(id=user_id).first().values_list("role_version", flat=True)
+    if role_version is not None:
+        role_version_cache.store(user_id, role_version)
+    return role_version
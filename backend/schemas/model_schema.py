@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+from ML.array_blob import decode_array
+from typing_extensions import Optional
+from datetime import datetime
 
 class HyperParamsOut(BaseModel):
     """
@@ -6,12 +9,16 @@ class HyperParamsOut(BaseModel):
     
     Attributes:
         id (int): Hyperparameters record's unique identifier
-        epochs (int): Number of training epochs
+        epochs (int): Number of training epochs, the iteration limit of the "newton" and "lbfgs" solvers
         learning_rate (float): Learning rate used for training
+        solver (str): Training algorithm, "gd", "newton" or "lbfgs"
+        tolerance (float): Stopping tolerance of the "newton" and "lbfgs" solvers
     """
     id: int
     epochs: int
     learning_rate: float
+    solver: str
+    tolerance: float
 
 class ParamsOut(BaseModel):
     """
@@ -32,6 +39,22 @@ class ParamsOut(BaseModel):
     x_mean: list[float]
     x_std: list[float]
 
+    @field_validator("weights", "x_mean", "x_std", mode="before")
+    @classmethod
+    def decode_blob(cls, value):
+        """
+        Decode arrays stored as binary blobs into lists.
+
+        Args:
+            value: The stored value
+
+        Returns:
+            list: The array values as (nested) lists
+        """
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return decode_array(value).tolist()
+        return value
+
 class TestTrainSplitOut(BaseModel):
     """
     Schema for train/test split configuration output.
@@ -45,6 +68,32 @@ class TestTrainSplitOut(BaseModel):
     testing: float
     training: float
 
+class RocCurveOut(BaseModel):
+    """
+    Schema for a ROC curve output.
+    
+    Attributes:
+        fpr (list[float]): False positive rates, starting at 0
+        tpr (list[float]): True positive rates, starting at 0
+        thresholds (list[Optional[float]]): Probability threshold of every point, None for the starting point
+    """
+    fpr: list[float]
+    tpr: list[float]
+    thresholds: list[Optional[float]]
+
+class PrCurveOut(BaseModel):
+    """
+    Schema for a precision-recall curve output.
+    
+    Attributes:
+        precision (list[float]): Precision at every threshold
+        recall (list[float]): Recall at every threshold
+        thresholds (list[float]): Probability thresholds, in descending order
+    """
+    precision: list[float]
+    recall: list[float]
+    thresholds: list[float]
+
 class ModelMetricsOut(BaseModel):
     """
     Schema for model performance metrics output.
@@ -58,6 +107,10 @@ class ModelMetricsOut(BaseModel):
         f1_score (float): Model F1-score
         recall (float): Model recall score
         confusion_matrix (list[list]): Confusion matrix as nested list
+        roc_auc (float): Area under the ROC curve
+        average_precision (float): Area under the precision-recall curve
+        roc_curve (Optional[RocCurveOut]): ROC curve, None for models evaluated before curves were stored
+        pr_curve (Optional[PrCurveOut]): Precision-recall curve, None for models evaluated before curves were stored
     """
     id: int
     accuracy: float
@@ -65,6 +118,10 @@ class ModelMetricsOut(BaseModel):
     f1_score: float
     recall: float
     confusion_matrix: list[list]
+    roc_auc: float
+    average_precision: float
+    roc_curve: Optional[RocCurveOut] = None
+    pr_curve: Optional[PrCurveOut] = None
 
 class ModelOut(BaseModel):
     """
@@ -79,9 +136,49 @@ class ModelOut(BaseModel):
         test_train_split (TestTrainSplitOut): Train/test split configuration
         params (ParamsOut): Trained model parameters
         model_metrics (ModelMetricsOut): Model performance metrics
+        solver (str): Training algorithm the model was trained with
+        iterations (int): Number of training iterations, mini-batch steps for streaming training
+        converged (bool): Whether training stopped on a tolerance before the iteration limit
+        training_seconds (float): Wall time of the training
+        epochs (int): Number of passes over the training rows
     """
     id: int
     hyper_params: HyperParamsOut
     test_train_split: TestTrainSplitOut
     params: ParamsOut
     model_metrics: ModelMetricsOut
+    solver: str
+    iterations: int
+    converged: bool
+    training_seconds: float
+    epochs: int
+
+class ModelVersionOut(ModelOut):
+    """
+    Schema for a model version in the model registry.
+    
+    Attributes:
+        active (bool): Whether this version is used for predictions
+    """
+    active: bool
+
+class TrainingJobOut(BaseModel):
+    """
+    Schema for training job output.
+    
+    Attributes:
+        id (int): Training job's unique identifier
+        status (str): Current state of the job (queued, running, done or failed)
+        error (Optional[str]): Error message if the job failed
+        created_at (datetime): Timestamp when the job was created
+        started_at (Optional[datetime]): Timestamp when training started
+        finished_at (Optional[datetime]): Timestamp when the job finished or failed
+        trained_model_id (Optional[int]): ID of the model published by the job
+    """
+    id: int
+    status: str
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    trained_model_id: Optional[int] = None
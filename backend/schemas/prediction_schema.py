@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing_extensions import Optional
 from schemas import user_schema
 from datetime import datetime
 
@@ -92,3 +93,48 @@ class PredictionOut(BaseModel):
     title: str
     prediction_inputs: PredictionInputsOut
     user: user_schema.UserOut
+
+class PredictionItemOut(BaseModel):
+    """
+    Schema for a prediction in a page of predictions.
+    
+    Only the fields requested with the `fields` projection are present.
+    
+    Attributes:
+        id (Optional[int]): Prediction record's unique identifier
+        prediction (Optional[bool]): Prediction result (True for approved, False for rejected)
+        created_at (Optional[datetime]): Timestamp when prediction was created
+        title (Optional[str]): Descriptive title for the prediction
+        prediction_inputs (Optional[PredictionInputsOut]): Input data used for the prediction
+    """
+    id: Optional[int] = None
+    prediction: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    title: Optional[str] = None
+    prediction_inputs: Optional[PredictionInputsOut] = None
+
+class PredictionPageOut(BaseModel):
+    """
+    Schema for one page of a user's predictions.
+    
+    Attributes:
+        user (user_schema.UserOut): User who made the predictions
+        items (list[PredictionItemOut]): Predictions on the page, newest first
+        next_cursor (Optional[str]): Cursor of the next page, None on the last page
+    """
+    user: user_schema.UserOut
+    items: list[PredictionItemOut]
+    next_cursor: Optional[str] = None
+
+class PredictionDecisionOut(BaseModel):
+    """
+    Schema for a prediction decision whose record is written in the background.
+    
+    Attributes:
+        prediction (bool): Prediction result (True for approved, False for rejected)
+        created_at (datetime): Timestamp when prediction was made
+        title (str): Descriptive title for the prediction
+    """
+    prediction: bool
+    created_at: datetime
+    title: str
@@ -1,13 +1,25 @@
 from fastapi.exceptions import HTTPException
 from repositories import user_repository
 from core.security import create_access_token
+from core import passwords
 from schemas import auth_schema
-import bcrypt
+
+def _busy():
+    """
+    Build the error returned when the password hashing queue is full.
+
+    Returns:
+        HTTPException: 503 asking the client to retry later
+    """
+    return HTTPException(status_code=503, detail="Server is busy, try again later", headers={"Retry-After": "1"})
 
 async def login_user(login_data: auth_schema.Login):
     """
     Authenticate a user and return a JWT token.
     
+    The token carries the user's role and role version, so admin checks
+    can trust it without loading the user while the role is unchanged.
+    
     Args:
         login_data (auth_schema.Login): User login credentials containing username and password
         
@@ -15,7 +27,7 @@ async def login_user(login_data: auth_schema.Login):
         dict: Dictionary containing the JWT access token
         
     Raises:
-        HTTPException: 400 if credentials are invalid or empty
+        HTTPException: 400 if credentials are invalid or empty, 503 if password checks are overloaded
     """
     if not login_data.password.strip():
         raise HTTPException(status_code=400, detail="Password can't be empty")
@@ -27,10 +39,19 @@ async def login_user(login_data: auth_schema.Login):
     if user == None:
         raise HTTPException(status_code=400, detail="Wrong username or password")
 
-    if not bcrypt.checkpw(login_data.password.encode("utf-8"), user.password_hash.encode("utf-8")):
+    try:
+        password_matches = await passwords.check_password(login_data.password, user.password_hash)
+    except passwords.PasswordQueueFull:
+        raise _busy()
+
+    if not password_matches:
         raise HTTPException(status_code=400, detail="Wrong username or password")
 
-    token = create_access_token({"id": user.id})
+    token_data = {"id": user.id}
+    if user.role is not None:
+        token_data.update({"role": user.role.role_name, "rv": user.role_version})
+
+    token = create_access_token(token_data)
     return {"token": token}
 
 async def register_user(user_data: auth_schema.UserCreate):
@@ -45,7 +66,7 @@ async def register_user(user_data: auth_schema.UserCreate):
         User: The newly created user object
         
     Raises:
-        HTTPException: 400 if validation fails or username already exists
+        HTTPException: 400 if validation fails or username already exists, 503 if password hashing is overloaded
     """
     if not user_data.username.strip():
         raise HTTPException(status_code=400, detail="Username can't be empty")
@@ -60,8 +81,10 @@ async def register_user(user_data: auth_schema.UserCreate):
     if existing_user != None:
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    salt = bcrypt.gensalt(rounds=12)
-    hashed_password = bcrypt.hashpw(user_data.password.encode('utf-8'), salt)
+    try:
+        hashed_password = await passwords.hash_password(user_data.password)
+    except passwords.PasswordQueueFull:
+        raise _busy()
 
-    new_user = await user_repository.create_user(username=user_data.username.strip(), first_name=user_data.first_name.strip(), last_name=user_data.last_name.strip(), password_hash=hashed_password.decode("utf-8"))
+    new_user = await user_repository.create_user(username=user_data.username.strip(), first_name=user_data.first_name.strip(), last_name=user_data.last_name.strip(), password_hash=hashed_password)
     return new_user
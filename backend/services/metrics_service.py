@@ -0,0 +1,20 @@
+from services import user_service
+from core import metrics
+from core.security import RoleClaim
+
+async def get_metrics(user_id: int, role_claim: RoleClaim = None):
+    """
+    Get the current values of the runtime metrics of this worker (admin operation).
+
+    Args:
+        user_id (int): The ID of the admin user performing the operation
+        role_claim (RoleClaim): The role claim of the admin's access token
+
+    Returns:
+        dict: Snapshots of all registered metrics keyed by name
+
+    Raises:
+        HTTPException: 404 if user does not exist, 403 if not admin
+    """
+    await user_service.check_admin(user_id, role_claim)
+    return metrics.snapshot()
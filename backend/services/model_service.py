@@ -1,9 +1,32 @@
 from fastapi.exceptions import HTTPException
 from repositories import models_repository
+from services import user_service
+from core.security import RoleClaim
+from ML import load_prediction_logistic_regression
+from ML.compiled_prediction import CompiledLoanPrediction
+from ML.model_cache import model_cache
+from ML.array_blob import decode_array
 
-async def get_model():
+async def get_models():
     """
-    Retrieve the current machine learning model information.
+    Retrieve all machine learning model versions.
+
+    Returns:
+        list[Model]: Complete information of every model version including
+                     hyperparameters, training/test split configuration,
+                     model parameters, performance metrics and whether
+                     the version is the active one
+    """
+    models = await models_repository.get_models()
+    active_model = await models_repository.get_active_model()
+    for model in models:
+        model.active = active_model is not None and model.id == active_model.id
+
+    return models
+
+async def get_active_model():
+    """
+    Retrieve the machine learning model version used for predictions.
 
     Returns:
         Model: Complete model information including hyperparameters,
@@ -13,8 +36,91 @@ async def get_model():
     Raises:
         HTTPException: 404 if model does not exist
     """
-    model = await models_repository.get_model()
+    model = await models_repository.get_active_model()
+    if not model:
+        raise HTTPException(status_code=404, detail="Model does not exist")
+
+    return model
+
+async def promote_model(user_id: int, model_id: int, role_claim: RoleClaim = None):
+    """
+    Make a model version the one used for predictions (admin operation).
+
+    Args:
+        user_id (int): The ID of the admin user performing the operation
+        model_id (int): The ID of the model version to promote
+        role_claim (RoleClaim): The role claim of the admin's access token
+
+    Returns:
+        Model: The promoted model
+
+    Raises:
+        HTTPException: 404 if user or model does not exist, 403 if not admin
+    """
+    await user_service.check_admin(user_id, role_claim)
+
+    model = await models_repository.get_model(model_id)
     if not model:
         raise HTTPException(status_code=404, detail="Model does not exist")
 
+    await models_repository.promote_model(model.id)
+    return model
+
+async def rollback_model(user_id: int, role_claim: RoleClaim = None):
+    """
+    Make the previously active model version the one used for predictions again (admin operation).
+
+    Args:
+        user_id (int): The ID of the admin user performing the operation
+        role_claim (RoleClaim): The role claim of the admin's access token
+
+    Returns:
+        Model: The model that is active after the rollback
+
+    Raises:
+        HTTPException: 404 if user or previous model does not exist, 403 if not admin
+    """
+    await user_service.check_admin(user_id, role_claim)
+
+    if not await models_repository.rollback_model():
+        raise HTTPException(status_code=404, detail="Previous model does not exist")
+
+    return await get_active_model()
+
+async def get_loaded_model():
+    """
+    Get the trained model ready for prediction.
+
+    Returns the model from the process-wide cache and only goes to the
+    database when the cache is empty or its version check interval has
+    passed. The parameters are reloaded only if the active model changed.
+
+    Returns:
+        CompiledLoanPrediction: Compiled model ready for prediction
+
+    Raises:
+        HTTPException: 404 if no model was promoted yet
+    """
+    if model_cache.is_fresh():
+        return model_cache.model
+
+    async with model_cache.lock:
+        if model_cache.is_fresh():
+            return model_cache.model
+
+        version = await models_repository.get_active_version()
+        if version is None:
+            raise HTTPException(status_code=404, detail="Model does not exist")
+
+        if model_cache.model is not None and model_cache.version == version:
+            model_cache.touch()
+            return model_cache.model
+
+        registry = await models_repository.get_registry()
+        params = registry.active_model.params
+        model = load_prediction_logistic_regression.LoanPrediction.from_params(decode_array(params.weights), params.bias, decode_array(params.x_mean), decode_array(params.x_std))
+        model = CompiledLoanPrediction.from_model(model)
+        model.version = registry.version
+        model_cache.store(model, registry.version)
+
     return model
@@ -1,13 +1,59 @@
 from fastapi.exceptions import HTTPException
-from repositories import models_repository, prediction_repository, user_repository
+from repositories import prediction_repository, user_repository
+from repositories.prediction_write_buffer import prediction_write_buffer
+from repositories.prediction_cache import prediction_cache, PREDICTION_CACHE_ENABLED
 from schemas import prediction_schema
-from ML import load_prediction_logistic_regression
+from core.idempotency import idempotency_store, IdempotencyKeyMismatch, MAX_KEY_LENGTH
+from services import model_service
+from ML import csv_scoring
+from ML.prediction_batcher import prediction_batcher, BATCHING_ENABLED
+from tortoise import timezone
+from datetime import datetime
 import numpy as np
+import asyncio
+import base64
+import json
+import os
+
+PREDICTION_FIELDS = ["id", "prediction", "created_at", "title", "prediction_inputs"]
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = int(os.environ.get("PREDICTION_MAX_BATCH_SIZE", "1000"))
+
+def _to_features(prediction_data: prediction_schema.PredictionCreate):
+    """
+    Convert prediction input data into the model's feature vector.
+    
+    Args:
+        prediction_data (prediction_schema.PredictionCreate): Input data for the prediction
+    
+    Returns:
+        list: Feature values in the order the model was trained on
+    """
+    return [
+        prediction_data.no_of_dependents,
+        prediction_data.education,
+        prediction_data.self_employed,
+        prediction_data.income_amount,
+        prediction_data.loan_amont,
+        prediction_data.loan_amont_term,
+        prediction_data.cibil_score,
+        prediction_data.residential_assets_value,
+        prediction_data.commercial_assets_value,
+        prediction_data.luxury_assets_value,
+        prediction_data.bank_asset_value
+    ]
 
 async def make_prediction(user_id: int, prediction_data: prediction_schema.PredictionCreate):
     """
     Create a new loan approval prediction using the trained ML model.
     
+    The user and the model are loaded concurrently, and the input and
+    result records are written together by a single repository call.
+    With PREDICTION_CACHE=1, inputs already scored by the active model are
+    answered from the prediction cache and only the result record is
+    written, referencing the stored input record.
+    
     Args:
         user_id (int): The ID of the user making the prediction request
         prediction_data (prediction_schema.PredictionCreate): Input data for the prediction
@@ -16,6 +62,85 @@ async def make_prediction(user_id: int, prediction_data: prediction_schema.Predi
     Returns:
         Prediction: The prediction result with input data and approval/rejection decision
         
+    Raises:
+        HTTPException: 404 if user or model does not exist
+    """
+    user, model = await asyncio.gather(user_repository.get_user_by_id(user_id), model_service.get_loaded_model(), return_exceptions=True)
+    if isinstance(user, BaseException):
+        raise user
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User does not exist")
+
+    if isinstance(model, BaseException):
+        raise model
+
+    features = _to_features(prediction_data)
+    if PREDICTION_CACHE_ENABLED:
+        cache_key = prediction_cache.key(model.version, features)
+        cached = prediction_cache.get(cache_key)
+        if cached is not None:
+            prediction, prediction_inputs_id = cached
+            return await prediction_repository.insert_prediction_for_input(prediction, user, prediction_data, prediction_inputs_id)
+
+    if BATCHING_ENABLED:
+        prediction = await prediction_batcher.predict(model, features)
+    else:
+        prediction = model.predict_one(features)
+
+    prediction_out = await prediction_repository.insert_prediction_with_input(prediction, user, prediction_data)
+    if PREDICTION_CACHE_ENABLED:
+        prediction_cache.store(cache_key, prediction_out.prediction, prediction_out.prediction_inputs.pk)
+    return prediction_out
+
+async def make_prediction_idempotent(user_id: int, prediction_data: prediction_schema.PredictionCreate, idempotency_key: str):
+    """
+    Create a loan approval prediction at most once per idempotency key.
+
+    The first request with a key makes the prediction. Retries with the
+    same key within IDEMPOTENCY_TTL_SECONDS get the same prediction record
+    back, and retries arriving while it's still being made wait for it.
+    Keys are scoped to the user.
+
+    Args:
+        user_id (int): The ID of the user making the prediction request
+        prediction_data (prediction_schema.PredictionCreate): Input data for the prediction
+        idempotency_key (str): Client-chosen key identifying the request
+
+    Returns:
+        tuple[Prediction, bool]: The prediction and whether it was made by an earlier request
+
+    Raises:
+        HTTPException: 400 if the key is invalid, 404 if user or model does not exist,
+                       422 if the key was used for a different request
+    """
+    if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+
+    try:
+        return await idempotency_store.run(
+            (user_id, "predict", idempotency_key),
+            prediction_data.model_dump_json(),
+            lambda: make_prediction(user_id, prediction_data),
+        )
+    except IdempotencyKeyMismatch:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was used for a different request")
+
+async def make_prediction_deferred(user_id: int, prediction_data: prediction_schema.PredictionCreate):
+    """
+    Create a loan approval prediction and store its record in the background.
+    
+    The decision is returned as soon as it is made. The input and result
+    records are queued in the write-behind buffer and written with the
+    next flush.
+    
+    Args:
+        user_id (int): The ID of the user making the prediction request
+        prediction_data (prediction_schema.PredictionCreate): Input data for the prediction
+    
+    Returns:
+        dict: The prediction decision, title and creation time
+        
     Raises:
         HTTPException: 404 if user does not exist
     """
@@ -23,47 +148,167 @@ async def make_prediction(user_id: int, prediction_data: prediction_schema.Predi
     if not user:
         raise HTTPException(status_code=404, detail="User does not exist")
 
-    prediction_input = await prediction_repository.insert_prediction_input(prediction_data)
-    params = await models_repository.get_params()
+    model = await model_service.get_loaded_model()
+    prediction = bool(model.predict_one(_to_features(prediction_data)))
+    created_at = timezone.now()
 
-    model = load_prediction_logistic_regression.LoanPrediction()
-    model.X_mean = params.x_mean
-    model.X_std = params.x_std
-    model.set_bias(params.bias)
-    model.set_weights(params.weights)
+    await prediction_write_buffer.put((prediction, user.id, prediction_data, created_at))
+    return {"prediction": prediction, "created_at": created_at, "title": prediction_data.title}
 
-    X_sample = [
-        prediction_data.no_of_dependents,
-        prediction_data.education,
-        prediction_data.self_employed,
-        prediction_data.income_amount,
-        prediction_data.loan_amont,
-        prediction_data.loan_amont_term,
-        prediction_data.cibil_score,
-        prediction_data.residential_assets_value,
-        prediction_data.commercial_assets_value,
-        prediction_data.luxury_assets_value,
-        prediction_data.bank_asset_value
-    ]
+async def make_predictions_batch(user_id: int, predictions_data: list[prediction_schema.PredictionCreate]):
+    """
+    Create loan approval predictions for a batch of inputs.
+    
+    All inputs are scored with a single matrix multiplication and stored
+    with bulk inserts. At most MAX_BATCH_SIZE inputs are accepted, which
+    bounds the feature matrix, the statement size and the transaction of
+    one request.
+    
+    Args:
+        user_id (int): The ID of the user making the prediction request
+        predictions_data (list[prediction_schema.PredictionCreate]): Input data for each prediction
+    
+    Returns:
+        list[Prediction]: The prediction results in the same order as the inputs
+        
+    Raises:
+        HTTPException: 400 if the batch is empty, 413 if it has more than MAX_BATCH_SIZE inputs,
+                       404 if user does not exist
+    """
+    if not predictions_data:
+        raise HTTPException(status_code=400, detail="Predictions can't be empty")
+    if len(predictions_data) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SIZE} predictions can be made at once")
 
-    X_sample = np.array(X_sample).reshape(1, -1)
-    prediction = model.predict(X_sample)
-    prediction_out = await prediction_repository.insert_prediction(prediction[0][0], user, prediction_input, prediction_data.title)
-    return prediction_out
+    user = await user_repository.get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User does not exist")
+
+    model = await model_service.get_loaded_model()
+    predictions = model.predict_rows([_to_features(prediction_data) for prediction_data in predictions_data])
+
+    return await prediction_repository.insert_predictions_bulk(predictions, user, predictions_data)
+
+async def score_csv(user_id: int, byte_chunks):
+    """
+    Score a CSV upload in the training dataset layout.
+    
+    Reads and validates the header before any result is sent, so a wrong
+    file is rejected with a proper error status. The rows themselves are
+    scored lazily by the returned generator.
+    
+    Args:
+        user_id (int): The ID of the user making the request
+        byte_chunks: Async iterable of the uploaded CSV bytes
+    
+    Returns:
+        AsyncGenerator[str]: NDJSON lines with the prediction for every row
+        
+    Raises:
+        HTTPException: 400 if the file is empty or columns are missing, 404 if user does not exist
+    """
+    user = await user_repository.get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User does not exist")
+
+    model = await model_service.get_loaded_model()
+    records = csv_scoring.iter_records(byte_chunks)
+
+    try:
+        header = await anext(records)
+    except StopAsyncIteration:
+        raise HTTPException(status_code=400, detail="File can't be empty")
+
+    try:
+        id_index, feature_indices = csv_scoring.parse_header(header)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _score_csv_rows(model, records, id_index, feature_indices)
+
+async def _score_csv_rows(model, records, id_index, feature_indices):
+    """
+    Score CSV rows in chunks of at most `CHUNK_ROWS` rows.
+    
+    Every chunk is scored with a single matrix multiplication and its
+    results are yielded before the next chunk is read. Rows that can't be
+    parsed produce an error line instead of a prediction.
+    
+    Args:
+        model (CompiledLoanPrediction): The model used for scoring
+        records: Async iterator of CSV data records (without the header)
+        id_index (int|None): Index of the `loan_id` column
+        feature_indices (list[int]): Indices of the feature columns
+    
+    Yields:
+        str: NDJSON lines for one chunk of rows
+    """
+    row_number = 0
+    chunk = []
+
+    async for record in records:
+        row_number += 1
+        chunk.append((row_number, record))
+        if len(chunk) >= csv_scoring.CHUNK_ROWS:
+            yield _score_csv_chunk(model, chunk, id_index, feature_indices)
+            chunk = []
+
+    if chunk:
+        yield _score_csv_chunk(model, chunk, id_index, feature_indices)
+
+def _score_csv_chunk(model, chunk, id_index, feature_indices):
+    """
+    Score one chunk of CSV rows.
+    
+    Args:
+        model (CompiledLoanPrediction): The model used for scoring
+        chunk (list[tuple]): Row numbers and raw records of the chunk
+        id_index (int|None): Index of the `loan_id` column
+        feature_indices (list[int]): Indices of the feature columns
+    
+    Returns:
+        str: NDJSON lines with the results of the chunk, in row order
+    """
+    results = []
+    features = []
+    for row_number, record in chunk:
+        values = csv_scoring.parse_record(record)
+        result = {"row": row_number}
+        if id_index is not None and id_index < len(values):
+            result["loan_id"] = values[id_index].strip()
+
+        try:
+            features.append(csv_scoring.encode_row(values, feature_indices))
+        except ValueError as e:
+            result["error"] = str(e)
+
+        results.append(result)
+
+    if features:
+        predictions = iter(model.predict(np.array(features, dtype=float))[:, 0].tolist())
+        for result in results:
+            if "error" not in result:
+                result["prediction"] = bool(next(predictions))
 
-async def get_predictions(user_id: int, user_to_retrieve_id: int):
+    return "".join(json.dumps(result) + "\n" for result in results)
+
+async def get_predictions(user_id: int, user_to_retrieve_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None, fields: str | None = None):
     """
-    Get all predictions for a specific user.
+    Get one page of predictions for a specific user, newest first.
     
     Args:
         user_id (int): The ID of the user making the request
         user_to_retrieve_id (int): The ID of the user whose predictions to retrieve
+        limit (int): Maximum number of predictions on the page
+        cursor (str|None): `next_cursor` of the previous page
+        fields (str|None): Comma-separated prediction fields to return (default: all)
         
     Returns:
-        list[Prediction]: List of predictions with input data and results
+        dict: The user, the predictions on the page and the cursor of the next page
+              (None on the last page)
         
     Raises:
-        HTTPException: 404 if either user does not exist
+        HTTPException: 404 if either user does not exist, 400 if cursor or fields are invalid
     """
     user = await user_repository.get_user_by_id(user_id)
     if not user:
@@ -73,8 +318,59 @@ async def get_predictions(user_id: int, user_to_retrieve_id: int):
     if not user_to_retrieve:
         raise HTTPException(status_code=404, detail="User does not exist")
 
-    predictions = await prediction_repository.get_predictions(user_to_retrieve)
-    return predictions
+    selected_fields = PREDICTION_FIELDS
+    if fields:
+        selected_fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected_fields if field not in PREDICTION_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    predictions = await prediction_repository.get_predictions(user_to_retrieve.id, limit + 1, _decode_cursor(cursor), "prediction_inputs" in selected_fields)
+
+    next_cursor = None
+    if len(predictions) > limit:
+        predictions = predictions[:limit]
+        next_cursor = _encode_cursor(predictions[-1])
+
+    return {
+        "user": user_to_retrieve,
+        "items": [{field: getattr(prediction, field) for field in selected_fields} for prediction in predictions],
+        "next_cursor": next_cursor,
+    }
+
+def _encode_cursor(prediction):
+    """
+    Encode the position of a prediction as an opaque page cursor.
+    
+    Args:
+        prediction (Predictions): The last prediction of a page
+        
+    Returns:
+        str: The cursor
+    """
+    return base64.urlsafe_b64encode(f"{prediction.created_at.isoformat()}|{prediction.id}".encode()).decode()
+
+def _decode_cursor(cursor: str | None):
+    """
+    Decode a page cursor.
+    
+    Args:
+        cursor (str|None): The cursor returned with the previous page
+        
+    Returns:
+        tuple|None: (created_at, id) of the last prediction of the previous page
+        
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+    """
+    if not cursor:
+        return None
+
+    try:
+        created_at, prediction_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(prediction_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 async def delete_prediction(user_id: int, prediction_id: int):
     """
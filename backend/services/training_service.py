@@ -0,0 +1,197 @@
+from fastapi.exceptions import HTTPException
+from repositories import models_repository, user_repository
+from services import user_service
+from core.security import RoleClaim
+from models.models_model import TrainingJobStatus
+from ML import training
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from tortoise import timezone
+from datetime import timedelta
+import multiprocessing
+import asyncio
+import logging
+import socket
+import uuid
+import os
+
+TRAINING_WORKERS = int(os.environ.get("TRAINING_WORKERS", "1"))
+TRAINING_JOB_HEARTBEAT_SECONDS = float(os.environ.get("TRAINING_JOB_HEARTBEAT_SECONDS", "30"))
+TRAINING_JOB_LEASE_SECONDS = float(os.environ.get("TRAINING_JOB_LEASE_SECONDS", "120"))
+BOOT_ID = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_tasks = set()
+_heartbeat_task = None
+
+def _get_executor():
+    """
+    Get the process pool used for training, creating it on first use.
+
+    Returns:
+        ProcessPoolExecutor: The training process pool
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=TRAINING_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+def shutdown():
+    """
+    Shut down the training process pool without waiting for running jobs.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def _renew_and_sweep_jobs():
+    """
+    Renew the training jobs of this process and fail the ones abandoned by stopped processes.
+
+    Returns:
+        int: Number of abandoned jobs marked as failed
+    """
+    await models_repository.renew_training_jobs(BOOT_ID)
+    return await models_repository.fail_abandoned_training_jobs(timezone.now() - timedelta(seconds=TRAINING_JOB_LEASE_SECONDS))
+
+async def _heartbeat():
+    """
+    Renew and sweep training jobs every TRAINING_JOB_HEARTBEAT_SECONDS.
+    """
+    while True:
+        await asyncio.sleep(TRAINING_JOB_HEARTBEAT_SECONDS)
+        try:
+            await _renew_and_sweep_jobs()
+        except Exception:
+            logger.exception("Renewing training jobs failed")
+
+async def start_heartbeat():
+    """
+    Fail abandoned training jobs and start renewing the jobs of this process.
+
+    Every server process (e.g. every uvicorn worker) identifies its jobs by
+    its BOOT_ID and renews them regularly. A job that isn't renewed for
+    TRAINING_JOB_LEASE_SECONDS belongs to a process that stopped and is
+    marked as failed by whichever process notices first, so restarting one
+    worker doesn't touch the jobs other workers are still running.
+    """
+    global _heartbeat_task
+    await _renew_and_sweep_jobs()
+    _heartbeat_task = asyncio.create_task(_heartbeat())
+
+def stop_heartbeat():
+    """
+    Stop renewing the training jobs of this process.
+    """
+    global _heartbeat_task
+    if _heartbeat_task is not None:
+        _heartbeat_task.cancel()
+        _heartbeat_task = None
+
+async def enqueue_training(bootstrap: bool = False):
+    """
+    Create a training job and run it in the background.
+
+    Training runs in a worker process, so the event loop keeps serving
+    requests with the current model until the job publishes a new one.
+
+    Args:
+        bootstrap (bool): Whether the job trains the first model. Only one
+                          bootstrap job runs at a time, even when several
+                          server processes start on an empty database (default: False)
+
+    Returns:
+        TrainingJobs|None: The created training job, None if another bootstrap job is already queued or running
+    """
+    job = await models_repository.create_training_job(BOOT_ID, bootstrap)
+    if job is None:
+        return None
+
+    task = asyncio.create_task(_run_training_job(job.id))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+async def _run_training_job(job_id: int):
+    """
+    Train a model in the process pool and publish it.
+
+    The new model version is promoted to the active one when training succeeds.
+
+    Args:
+        job_id (int): The ID of the training job
+    """
+    try:
+        hyper_params = await models_repository.get_hyper_params()
+        test_train_split = await models_repository.get_test_train_split()
+
+        await models_repository.update_training_job(job_id, status=TrainingJobStatus.RUNNING, started_at=timezone.now())
+        result = await asyncio.get_running_loop().run_in_executor(
+            _get_executor(),
+            training.train_model,
+            training.DATASET_PATH,
+            test_train_split.training,
+            hyper_params.learning_rate,
+            hyper_params.epochs,
+            hyper_params.solver,
+            hyper_params.tolerance,
+        )
+
+        params = await models_repository.set_params(weights=result["weights"], bias=result["bias"], x_mean=result["x_mean"], x_std=result["x_std"])
+        model_metrics = await models_repository.set_model_metrics(
+            result["accuracy"], result["precision"], result["f1_score"], result["recall"], result["confusion_matrix"],
+            result["roc_auc"], result["average_precision"], result["roc_curve"], result["pr_curve"],
+        )
+        model = await models_repository.add_model(params, model_metrics, result["solver"], result["iterations"], result["converged"], result["training_seconds"], result["epochs"])
+        await models_repository.promote_model(model.id)
+
+        await models_repository.update_training_job(job_id, status=TrainingJobStatus.DONE, finished_at=timezone.now(), trained_model_id=model.id)
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            shutdown()
+        await models_repository.update_training_job(job_id, status=TrainingJobStatus.FAILED, finished_at=timezone.now(), error=repr(e))
+
+async def start_training(user_id: int, role_claim: RoleClaim = None):
+    """
+    Start retraining the model (admin operation).
+
+    Args:
+        user_id (int): The ID of the admin user starting the training
+        role_claim (RoleClaim): The role claim of the admin's access token
+
+    Returns:
+        TrainingJobs: The created training job
+
+    Raises:
+        HTTPException: 404 if user does not exist, 403 if not admin
+    """
+    await user_service.check_admin(user_id, role_claim)
+
+    return await enqueue_training()
+
+async def get_training_job(user_id: int, job_id: int):
+    """
+    Get the state of a training job.
+
+    Args:
+        user_id (int): The ID of the user making the request
+        job_id (int): The ID of the training job
+
+    Returns:
+        TrainingJobs: The training job
+
+    Raises:
+        HTTPException: 404 if user or training job does not exist
+    """
+    user = await user_repository.get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User does not exist")
+
+    job = await models_repository.get_training_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Training job does not exist")
+
+    return job
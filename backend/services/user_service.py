@@ -1,6 +1,49 @@
 from fastapi.exceptions import HTTPException
 from repositories import user_repository
 from schemas import user_schema
+from core.security import RoleClaim
+
+async def check_admin(user_id: int, role_claim: RoleClaim = None):
+    """
+    Check that a user is an admin.
+    
+    The role claim of the access token is trusted while its role version
+    matches the current role version of the user, which needs no user query.
+    Tokens without a role claim or with an outdated one fall back to loading
+    the user with their role from the database. The user cache is bypassed
+    there, since on other worker processes it may still hold the role from
+    before a change.
+    
+    Args:
+        user_id (int): The ID of the user
+        role_claim (RoleClaim): The role claim of the user's access token
+        
+    Raises:
+        HTTPException: 404 if user does not exist, 403 if not admin
+    """
+    if role_claim is not None and role_claim.role_version == await user_repository.get_role_version(user_id):
+        if role_claim.role != "admin":
+            raise HTTPException(status_code=403, detail="You don't have permissions")
+        return
+
+    user = await user_repository.get_user_by_id(user_id, use_cache=False)
+    if not user:
+        raise HTTPException(status_code=404, detail="User does not exist")
+
+    if user.role.role_name != "admin":
+        raise HTTPException(status_code=403, detail="You don't have permissions")
+
+def _non_empty(user_data: user_schema.UserUpdate):
+    """
+    Drop the empty fields of an update, so they keep their current values.
+    
+    Args:
+        user_data (user_schema.UserUpdate): The updated user data
+        
+    Returns:
+        user_schema.UserUpdate: The update with only the non-empty fields set
+    """
+    return user_schema.UserUpdate(**{name: value for name, value in user_data.dict(exclude_unset=True).items() if value})
 
 async def get_current_user(user_id: int):
     """
@@ -41,13 +84,14 @@ async def delete_current_user(user_id: int):
     await user_repository.delete_user(user.id)
     return user
 
-async def delete_user_admin(user_id: int, user_id_to_delete):
+async def delete_user_admin(user_id: int, user_id_to_delete, role_claim: RoleClaim = None):
     """
     Delete a user account (admin operation).
     
     Args:
         user_id (int): The ID of the admin user performing the operation
         user_id_to_delete (int): The ID of the user to delete
+        role_claim (RoleClaim): The role claim of the admin's access token
         
     Returns:
         User: The deleted user object
@@ -55,17 +99,12 @@ async def delete_user_admin(user_id: int, user_id_to_delete):
     Raises:
         HTTPException: 404 if user does not exist, 403 if not admin
     """
-    user = await user_repository.get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User does not exist")
+    await check_admin(user_id, role_claim)
 
     user_to_delete = await user_repository.get_user_by_id(user_id_to_delete)
     if not user_to_delete:
         raise HTTPException(status_code=404, detail="User does not exist")
 
-    if user.role.role_name != "admin":
-        raise HTTPException(status_code=403, detail="You don't have permissions")
-
     await user_repository.delete_user(user_id_to_delete)
     return user_to_delete
 
@@ -83,22 +122,13 @@ async def update_current_user(user_id: int, user_data: user_schema.UserUpdate):
     Raises:
         HTTPException: 404 if user does not exist
     """
-    user = await user_repository.get_user_by_id(user_id)
-    if not user:
+    updated_user = await user_repository.update_user(user_id, _non_empty(user_data))
+    if not updated_user:
         raise HTTPException(status_code=404, detail="User does not exist")
 
-    if not user_data.first_name:
-        user_data.first_name = user.first_name
-
-    if not user_data.last_name:
-        user_data.last_name = user.last_name
-
-    await user_repository.update_user(user.id, user_data)
-    updated_user = await user_repository.get_user_by_id(user_id)
-
     return updated_user
 
-async def update_user_admin(user_id: int, user_id_to_update: int, user_data: user_schema.UserUpdate):
+async def update_user_admin(user_id: int, user_id_to_update: int, user_data: user_schema.UserUpdate, role_claim: RoleClaim = None):
     """
     Update another user's profile information (admin operation).
     
@@ -106,6 +136,7 @@ async def update_user_admin(user_id: int, user_id_to_update: int, user_data: use
         user_id (int): The ID of the admin user performing the operation
         user_id_to_update (int): The ID of the user to update
         user_data (user_schema.UserUpdate): The updated user data
+        role_claim (RoleClaim): The role claim of the admin's access token
         
     Returns:
         User: The updated user object
@@ -113,26 +144,12 @@ async def update_user_admin(user_id: int, user_id_to_update: int, user_data: use
     Raises:
         HTTPException: 404 if user does not exist, 403 if not admin
     """
-    user = await user_repository.get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User does not exist")
+    await check_admin(user_id, role_claim)
 
-    user_to_update = await user_repository.get_user_by_id(user_id_to_update)
-    if not user_to_update:
+    updated_user = await user_repository.update_user(user_id_to_update, _non_empty(user_data))
+    if not updated_user:
         raise HTTPException(status_code=404, detail="User does not exist")
 
-    if user.role.role_name != "admin":
-        raise HTTPException(status_code=403, detail="You don't have permissions")
-
-    if not user_data.first_name:
-        user_data.first_name = user_to_update.first_name
-
-    if not user_data.last_name:
-        user_data.last_name = user_to_update.last_name
-
-    await user_repository.update_user(user_to_update.id, user_data)
-    updated_user = await user_repository.get_user_by_id(user_id_to_update)
-
     return updated_user
 
 async def get_all_users(user_id: int):
@@ -179,7 +196,7 @@ async def get_user(user_id: int, user_id_to_retrive: int):
 
     return user_to_retrive
 
-async def change_user_role(user_id: int, user_to_chage_id: int, role_id : int):
+async def change_user_role(user_id: int, user_to_chage_id: int, role_id : int, role_claim: RoleClaim = None):
     """
     Change a user's role (admin operation).
     
@@ -187,25 +204,20 @@ async def change_user_role(user_id: int, user_to_chage_id: int, role_id : int):
         user_id (int): The ID of the admin user performing the operation
         user_to_chage_id (int): The ID of the user whose role to change
         role_id (int): The ID of the new role to assign
+        role_claim (RoleClaim): The role claim of the admin's access token
         
     Returns:
         User: The user object with updated role
         
     Raises:
-        HTTPException: 404 if user does not exist, 403 if not admin
+        HTTPException: 404 if user or role does not exist, 403 if not admin
     """
-    user = await user_repository.get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User does not exist")
-
-    user_to_change = await user_repository.get_user_by_id(user_to_chage_id)
-    if not user_to_change:
-        raise HTTPException(status_code=404, detail="User does not exist")
-
-    if user.role.role_name != "admin":
-        raise HTTPException(status_code=403, detail="You don't have permissions")
+    await check_admin(user_id, role_claim)
 
-    await user_repository.update_user_role(user_to_change.id, role_id)
-    updated_user = await user_repository.get_user_by_id(user_to_chage_id)
+    updated_user = await user_repository.update_user_role(user_to_chage_id, role_id)
+    if not updated_user:
+        if not await user_repository.get_user_by_id(user_to_chage_id):
+            raise HTTPException(status_code=404, detail="User does not exist")
+        raise HTTPException(status_code=404, detail="Role does not exist")
 
     return updated_user
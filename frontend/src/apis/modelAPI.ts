@@ -4,6 +4,6 @@ import { type ModelType } from "@/types/modelTypes";
 
 export const modelAPI = {
     getModelMetrics: async () => {
-        return (await axios.get<ModelType>(`/api/models/get`, axiosConfig)).data
+        return (await axios.get<ModelType>(`/api/models/get/active`, axiosConfig)).data
     }
 }
@@ -1,16 +1,29 @@
 import axios from "axios";
 import { axiosConfig } from "./config/axiosConfig";
-import { type PredictionType, type PredictionInputType } from "@/types/predictionTypes";
+import { type PredictionType, type PredictionInputType, type PredictionPageType } from "@/types/predictionTypes";
+
+const getAllPredictionPages = async (url: string) => {
+    const predictions: PredictionType[] = []
+    let cursor: string | null = null
+
+    do {
+        const page: PredictionPageType = (await axios.get<PredictionPageType>(url, { ...axiosConfig, params: { limit: 500, cursor } })).data
+        predictions.push(...page.items.map((prediction) => ({ ...prediction, user: page.user })))
+        cursor = page.next_cursor
+    } while (cursor)
+
+    return predictions
+}
 
 export const predictionAPI = {
     createPrediction: async (predictionData: PredictionInputType, title: string) => {
         return (await axios.post<PredictionType>(`/api/predictions/predict`, { ...predictionData, title: title }, axiosConfig)).data
     },
     getCurrentUserPredictions: async () => {
-        return (await axios.get<PredictionType[]>(`/api/predictions/get/all`, axiosConfig)).data
+        return await getAllPredictionPages(`/api/predictions/get/all`)
     },
     getUserPredictions: async (userId: number) => {
-        return (await axios.get<PredictionType[]>(`/api/predictions/get/all/${userId}`, axiosConfig)).data
+        return await getAllPredictionPages(`/api/predictions/get/all/${userId}`)
     },
     getPrediction: async (predictionId: number) => {
         return (await axios.get<PredictionType>(`/api/predictions/get/${predictionId}`, axiosConfig)).data
@@ -23,3 +23,9 @@ export type PredictionType = {
     prediction_inputs: PredictionInputType,
     user: UserType
 }
+
+export type PredictionPageType = {
+    user: UserType,
+    items: Omit<PredictionType, "user">[],
+    next_cursor: string | null
+}